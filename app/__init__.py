@@ -13,8 +13,19 @@ from flask.cli import with_appcontext
 from .config import Config
 from .errors import register_error_handlers
 from .extensions import cors, db, limiter, migrate
-from .models import User
+from .hashing import calibrate_hash_method
+from .instrumentation import init_sql_instrumentation
+from .json_provider import APIJSONProvider
+from .models import (
+    User,
+    include_in_migrations,
+    install_search_index,
+    rebuild_search_index,
+)
+from .repositories import ProjectRepository, init_identity_cache
+from .response_cache import init_response_cache
 from .routes import api_bp
+from .services import IMPORT_FORMATS, import_users, iter_import_records
 
 
 def _merge_config(app: Flask, config_object: Optional[Type[Config] | Dict[str, Any]]) -> None:
@@ -38,12 +49,16 @@ def create_app(config_object: Optional[Type[Config] | Dict[str, Any]] = None) ->
     app.config.from_object(Config)
 
     _merge_config(app, config_object)
+    app.json = APIJSONProvider(app)
 
     app.config.setdefault("ENV", getattr(app, "env", "production"))
     app.logger.info(f"Starting Flask app [{app.config['ENV']}]")
 
     _ensure_secrets(app)
     register_extensions(app)
+    init_sql_instrumentation(app)
+    init_response_cache(app)
+    init_identity_cache(app)
     register_blueprints(app)
     register_error_handlers(app)
     register_cli(app)
@@ -55,7 +70,7 @@ def register_extensions(app: Flask) -> None:
     """Attach extensions to the app."""
 
     db.init_app(app)
-    migrate.init_app(app, db)
+    migrate.init_app(app, db, include_name=include_in_migrations)
     cors.init_app(
         app,
         resources={r"/*": {"origins": app.config["CORS_ALLOWED_ORIGINS"]}},
@@ -80,11 +95,27 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(api_bp)
 
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
 def _load_env_file() -> None:
     """Load environment variables from the project .env if present."""
 
-    project_root = Path(__file__).resolve().parent.parent
-    load_dotenv(project_root / ".env", override=False)
+    load_dotenv(PROJECT_ROOT / ".env", override=False)
+
+
+def _write_env_setting(path: Path, key: str, value: str) -> None:
+    """Set ``key=value`` in an env file, replacing an existing assignment."""
+
+    lines = path.read_text().splitlines() if path.exists() else []
+    assignment = f"{key}={value}"
+    for index, line in enumerate(lines):
+        if line.split("=", 1)[0].strip() == key:
+            lines[index] = assignment
+            break
+    else:
+        lines.append(assignment)
+    path.write_text("\n".join(lines) + "\n")
 
 
 def _ensure_secrets(app: Flask) -> None:
@@ -127,6 +158,123 @@ def register_cli(app: Flask) -> None:
             f"Default admin '{admin.email}' created successfully with password from configuration."
         )
 
+    @app.cli.command("calibrate-password-hash")
+    @click.option(
+        "--algorithm",
+        type=click.Choice(["scrypt", "pbkdf2"]),
+        default="scrypt",
+        show_default=True,
+        help="Hash family to benchmark.",
+    )
+    @click.option(
+        "--target-ms",
+        type=float,
+        default=250.0,
+        show_default=True,
+        help="Desired hashing latency per password on this host.",
+    )
+    @click.option(
+        "--samples",
+        type=int,
+        default=3,
+        show_default=True,
+        help="Timed runs per candidate (median is used).",
+    )
+    @click.option(
+        "--env-file",
+        type=click.Path(dir_okay=False, path_type=Path),
+        default=PROJECT_ROOT / ".env",
+        show_default=True,
+        help="Env file that receives PASSWORD_HASH_METHOD.",
+    )
+    @click.option(
+        "--write/--dry-run",
+        default=True,
+        show_default=True,
+        help="Persist the chosen method or only report it.",
+    )
+    def calibrate_password_hash(
+        algorithm: str, target_ms: float, samples: int, env_file: Path, write: bool
+    ) -> None:
+        """Benchmark hash parameters and record the ones that hit the target latency."""
+
+        method, elapsed, measured = calibrate_hash_method(
+            algorithm, target_ms=target_ms, samples=samples
+        )
+        for candidate, candidate_ms in measured:
+            print(f"{candidate:<28} {candidate_ms:8.1f} ms")
+        print(f"Selected {method} ({elapsed:.1f} ms, target {target_ms:.0f} ms).")
+
+        if write:
+            _write_env_setting(env_file, "PASSWORD_HASH_METHOD", method)
+            print(
+                f"Wrote PASSWORD_HASH_METHOD to {env_file}. Existing hashes are "
+                "upgraded on each user's next successful login."
+            )
+
+    @app.cli.command("recount-tasks")
+    @click.option(
+        "--project",
+        "project_ids",
+        type=int,
+        multiple=True,
+        help="Only recount this project (repeatable). Defaults to all projects.",
+    )
+    @with_appcontext
+    def recount_tasks(project_ids: tuple[int, ...]) -> None:
+        """Rebuild the per-project task counters from the tasks table."""
+
+        updated = ProjectRepository(db.session).recount_tasks(project_ids or None)
+        print(f"Recounted tasks for {updated} project(s).")
+
+    @app.cli.command("rebuild-search-index")
+    @with_appcontext
+    def rebuild_search_index_command() -> None:
+        """Install the FTS5 search table and triggers, then reindex everything."""
+
+        with db.engine.begin() as connection:
+            if not install_search_index(connection):
+                print("FTS5 is not available; search will use LIKE queries.")
+                return
+            indexed = rebuild_search_index(connection)
+        print(f"Indexed {indexed} projects and tasks.")
+
+    @app.cli.command("import-users")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+    @click.option(
+        "--format",
+        "fmt",
+        type=click.Choice(IMPORT_FORMATS),
+        default=None,
+        help="Input format. Defaults to csv for .csv files and ndjson otherwise.",
+    )
+    @click.option(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="Rows per transaction. Defaults to USER_IMPORT_CHUNK_SIZE.",
+    )
+    @with_appcontext
+    def import_users_command(path: Path, fmt: Optional[str], chunk_size: Optional[int]) -> None:
+        """Create users from an NDJSON or CSV file, reporting every row."""
+
+        fmt = fmt or ("csv" if path.suffix.lower() == ".csv" else "ndjson")
+        counts = {201: 0, 409: 0, 400: 0}
+        with path.open("rb") as stream:
+            records = iter_import_records(stream, fmt)
+            for result in import_users(records, chunk_size=chunk_size):
+                counts[result["status"]] += 1
+                if result["status"] == 201:
+                    print(f"row {result['row']}: created {result['email']} (id {result['id']})")
+                elif result["status"] == 409:
+                    print(f"row {result['row']}: duplicate {result['email']}")
+                else:
+                    print(f"row {result['row']}: invalid {result['messages']}")
+        print(
+            f"Imported {counts[201]} user(s); {counts[409]} duplicate(s), "
+            f"{counts[400]} invalid row(s)."
+        )
+
     @app.cli.command("seed-data")
     @click.option(
         "--users",
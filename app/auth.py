@@ -2,17 +2,25 @@
 
 from __future__ import annotations
 
+import hashlib
+import secrets
+import threading
+import time
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from functools import wraps
-from typing import Callable, TypeVar, TypedDict, cast
+from typing import Callable, Dict, Optional, TypeVar, TypedDict, cast
 
 import jwt
 from flask import current_app, g, request
 from jwt import ExpiredSignatureError, InvalidTokenError
+from sqlalchemy import select
 
+from .cache import LRUCache, app_cache
 from .errors import ForbiddenError, UnauthorizedError
 from .extensions import db
 from .models import User
+from .repositories import RefreshTokenRepository
 
 F = TypeVar("F", bound=Callable[..., object])
 MISSING_TOKEN_MSG = "Missing or invalid bearer token."
@@ -27,6 +35,172 @@ class JWTClaims(TypedDict):
     exp: int
 
 
+class VerifiedTokenCache:
+    """Bounded LRU of already-verified access tokens.
+
+    Entries are keyed by a digest of the signing-key fingerprint plus the raw
+    token and expire at the token's ``exp`` claim, so a cached token is never
+    accepted after PyJWT itself would reject it. Rotating ``JWT_SECRET_KEY`` or
+    ``JWT_ALGORITHM`` drops every entry.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._entries: LRUCache[bytes, JWTClaims] = LRUCache(maxsize, clock=time.time)
+        self._fingerprint: Optional[bytes] = None
+        self.rotations = 0
+
+    def _key(self, token: str, secret_key: str, algorithm: str) -> bytes:
+        fingerprint = hashlib.sha256(f"{algorithm}:{secret_key}".encode()).digest()
+        if fingerprint != self._fingerprint:
+            if self._fingerprint is not None:
+                self._entries.clear()
+                self.rotations += 1
+            self._fingerprint = fingerprint
+        return hashlib.sha256(fingerprint + token.encode()).digest()
+
+    def get(self, token: str, secret_key: str, algorithm: str) -> Optional[JWTClaims]:
+        """Return cached claims for ``token`` if it was verified before."""
+
+        return self._entries.get(self._key(token, secret_key, algorithm))
+
+    def put(
+        self, token: str, claims: JWTClaims, secret_key: str, algorithm: str
+    ) -> None:
+        """Remember verified ``claims`` until the token expires."""
+
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, int):
+            return
+        self._entries.set(
+            self._key(token, secret_key, algorithm), claims, expires_at=expires_at
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for the cache."""
+
+        stats = self._entries.stats()
+        stats["rotations"] = self.rotations
+        return stats
+
+
+def _get_token_cache() -> VerifiedTokenCache:
+    """Return the verified-token cache bound to the current app."""
+
+    return app_cache(
+        "verified_token_cache",
+        lambda: VerifiedTokenCache(current_app.config.get("JWT_TOKEN_CACHE_SIZE", 1024)),
+    )
+
+
+def token_cache_stats() -> Dict[str, int]:
+    """Expose verified-token cache counters for the current app."""
+
+    return _get_token_cache().stats()
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated caller as seen by the authorisation decorators."""
+
+    id: int
+    role: str
+    version: int
+
+    @property
+    def is_manager(self) -> bool:
+        return self.role == "manager"
+
+
+class PrincipalCache:
+    """Per-process cache of principals guarded by per-user version stamps.
+
+    A principal is only served while its stamp matches the current version for
+    that user. :meth:`invalidate` bumps the version, so a lookup that raced a
+    concurrent role change and cached the old role is discarded on next read.
+    The TTL bounds staleness across worker processes.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float]) -> None:
+        self._entries: LRUCache[int, Principal] = LRUCache(maxsize, ttl=ttl)
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def version(self, user_id: int) -> int:
+        """Return the current version stamp for ``user_id``."""
+
+        return self._versions.get(user_id, 0)
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        """Return the cached principal if its version is still current."""
+
+        principal = self._entries.get(user_id)
+        if principal is None or principal.version != self.version(user_id):
+            return None
+        return principal
+
+    def put(self, principal: Principal) -> None:
+        """Cache ``principal`` unless it was invalidated while loading."""
+
+        if principal.version == self.version(principal.id):
+            self._entries.set(principal.id, principal)
+
+    def invalidate(self, user_id: int) -> None:
+        """Bump the version for ``user_id`` and drop its cached principal."""
+
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        self._entries.pop(user_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for the cache."""
+
+        return self._entries.stats()
+
+
+def _get_principal_cache() -> PrincipalCache:
+    """Return the principal cache bound to the current app."""
+
+    return app_cache(
+        "principal_cache",
+        lambda: PrincipalCache(
+            current_app.config.get("PRINCIPAL_CACHE_SIZE", 4096),
+            current_app.config.get("PRINCIPAL_CACHE_TTL", 60) or None,
+        ),
+    )
+
+
+def load_principal(user_id: int) -> Optional[Principal]:
+    """Return the principal for ``user_id``, loading id and role only on a miss."""
+
+    cache = _get_principal_cache()
+    principal = cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    version = cache.version(user_id)
+    row = db.session.execute(
+        select(User.id, User.role).where(User.id == user_id)
+    ).one_or_none()
+    if row is None:
+        return None
+
+    principal = Principal(id=row.id, role=row.role, version=version)
+    cache.put(principal)
+    return principal
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Reject cached authorisation data for ``user_id`` on subsequent requests."""
+
+    _get_principal_cache().invalidate(user_id)
+
+
+def principal_cache_stats() -> Dict[str, int]:
+    """Expose principal cache counters for the current app."""
+
+    return _get_principal_cache().stats()
+
+
 def _clear_current_user() -> None:
     """Remove any previously stored user from the request context."""
 
@@ -39,7 +213,7 @@ def _get_jwt_algorithm() -> str:
     return current_app.config.get("JWT_ALGORITHM", "HS256")
 
 
-def generate_access_token(user: User) -> str:
+def generate_access_token(user: User | Principal) -> str:
     """Generate a signed JWT for the given user."""
 
     now = datetime.now(UTC)
@@ -56,6 +230,27 @@ def generate_access_token(user: User) -> str:
     return jwt.encode(payload, secret_key, algorithm=algorithm)
 
 
+def hash_refresh_token(token: str) -> str:
+    """Return the digest under which a refresh token is stored."""
+
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def generate_refresh_token(user: User | Principal) -> str:
+    """Issue and persist a revocable refresh token for the given user."""
+
+    token = secrets.token_urlsafe(32)
+    expires_in = current_app.config.get("JWT_REFRESH_TOKEN_EXPIRES", 2592000)
+    RefreshTokenRepository(db.session).create(
+        {
+            "user_id": user.id,
+            "token_hash": hash_refresh_token(token),
+            "expires_at": datetime.now(UTC) + timedelta(seconds=expires_in),
+        }
+    )
+    return token
+
+
 def decode_access_token(token: str) -> JWTClaims:
     """Decode a JWT and return its payload."""
 
@@ -65,7 +260,21 @@ def decode_access_token(token: str) -> JWTClaims:
     return cast(JWTClaims, decoded)
 
 
-def _authenticate_request(require_manager: bool = False) -> User:
+def _verify_access_token(token: str) -> JWTClaims:
+    """Decode a JWT, reusing the result of earlier verifications when possible."""
+
+    secret_key = current_app.config["JWT_SECRET_KEY"]
+    algorithm = _get_jwt_algorithm()
+    cache = _get_token_cache()
+
+    claims = cache.get(token, secret_key, algorithm)
+    if claims is None:
+        claims = decode_access_token(token)
+        cache.put(token, claims, secret_key, algorithm)
+    return claims
+
+
+def _authenticate_request(require_manager: bool = False) -> Principal:
     """Validate the bearer token on the current request."""
 
     _clear_current_user()
@@ -79,7 +288,7 @@ def _authenticate_request(require_manager: bool = False) -> User:
         raise UnauthorizedError(MISSING_TOKEN_MSG)
 
     try:
-        payload = decode_access_token(token)
+        payload = _verify_access_token(token)
     except ExpiredSignatureError as exc:  # pragma: no cover - relies on timing
         raise UnauthorizedError("Authentication token has expired.") from exc
     except InvalidTokenError as exc:
@@ -89,15 +298,15 @@ def _authenticate_request(require_manager: bool = False) -> User:
     if user_id is None:
         raise UnauthorizedError("Invalid authentication token.")
 
-    user = db.session.get(User, int(user_id))
-    if user is None:
+    principal = load_principal(int(user_id))
+    if principal is None:
         raise UnauthorizedError("User referenced by token no longer exists.")
 
-    if require_manager and user.role != "manager":
+    if require_manager and not principal.is_manager:
         raise ForbiddenError("Manager role required for this operation.")
 
-    g.current_user = user
-    return user
+    g.current_user = principal
+    return principal
 
 
 def require_auth(func: F) -> F:
@@ -123,8 +332,15 @@ def require_manager(func: F) -> F:
 
 
 __all__ = [
+    "Principal",
     "decode_access_token",
     "generate_access_token",
+    "generate_refresh_token",
+    "hash_refresh_token",
+    "invalidate_principal",
+    "load_principal",
+    "principal_cache_stats",
     "require_auth",
     "require_manager",
+    "token_cache_stats",
 ]
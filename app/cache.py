@@ -0,0 +1,129 @@
+"""In-process caching primitives shared by the API layers."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+from flask import current_app
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe, size-bounded LRU mapping with optional per-entry expiry.
+
+    Expiry times are expressed on the ``clock`` supplied at construction, which
+    defaults to :func:`time.monotonic`. A ``maxsize`` of zero disables storage
+    entirely while still counting misses, so callers never need a separate
+    "cache disabled" branch.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        *,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize must be greater than or equal to 0.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[K, Tuple[V, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: K, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` when absent/expired."""
+
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry  # type: ignore[misc]
+            if expires_at is not None and expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V, *, expires_at: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entry."""
+
+        if self.maxsize == 0:
+            return
+
+        if expires_at is None and self.ttl is not None:
+            expires_at = self._clock() + self.ttl
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: K, default: Any = None) -> Any:
+        """Remove ``key`` and return its value if present."""
+
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        return entry[0]  # type: ignore[index]
+
+    def clear(self) -> None:
+        """Drop every cached entry (counters are preserved)."""
+
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of cache counters."""
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+
+def app_cache(name: str, factory: Callable[[], T]) -> T:
+    """Return the per-application object registered under ``name``.
+
+    Objects live in ``app.extensions`` so each app created by the factory (and
+    therefore each test) gets isolated state.
+    """
+
+    extensions = current_app.extensions
+    instance = extensions.get(name)
+    if instance is None:
+        instance = extensions.setdefault(name, factory())
+    return instance
+
+
+__all__ = ["LRUCache", "app_cache"]
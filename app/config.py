@@ -2,11 +2,35 @@
 
 from __future__ import annotations
 
+import json
 import os
 import secrets
 from pathlib import Path
 
 
+def _env_flag(name: str, default: str = "false") -> bool:
+    """Interpret an environment variable as a boolean flag."""
+
+    return os.getenv(name, default).strip().lower() in {"1", "true", "yes", "on"}
+
+
+# Maximum SQL statements per request, keyed by endpoint. Read endpoints are kept
+# tight (one spare statement for a cold principal-cache lookup, plus the
+# conditional-GET stamp on listings) so N+1 regressions in the repositories
+# fail the test suite.
+DEFAULT_SQL_QUERY_BUDGETS = {
+    "api.get_project": 2,
+    "api.get_user": 2,
+    "api.list_projects": 4,
+    "api.list_tasks": 5,
+    "api.list_users": 4,
+    # Statement counts scale with the input (one UPDATE per distinct change
+    # set, a few statements per import chunk), so these are not budgeted.
+    "api.bulk_update_tasks": None,
+    "api.import_users": None,
+}
+
+
 class Config:
     """Base configuration shared by all environments."""
 
@@ -22,7 +46,11 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY") or SECRET_KEY
     JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRES", "3600"))
+    JWT_REFRESH_TOKEN_EXPIRES = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRES", "2592000"))
     JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+    JWT_TOKEN_CACHE_SIZE = int(os.getenv("JWT_TOKEN_CACHE_SIZE", "1024"))
+    PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "4096"))
+    PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
     DEFAULT_ADMIN_EMAIL = os.getenv("DEFAULT_ADMIN_EMAIL", "admin@admin.com")
     DEFAULT_ADMIN_PASSWORD = os.getenv("DEFAULT_ADMIN_PASSWORD", "admin")
     DEFAULT_ADMIN_NAME = os.getenv("DEFAULT_ADMIN_NAME", "Administrator")
@@ -38,9 +66,51 @@ class Config:
     RATELIMIT_STRATEGY = os.getenv("RATELIMIT_STRATEGY", "fixed-window")
     LOGIN_RATE_LIMIT = os.getenv("LOGIN_RATE_LIMIT", "5 per minute")
     SENSITIVE_RATE_LIMIT = os.getenv("SENSITIVE_RATE_LIMIT", "20 per minute")
+    LOGIN_BACKOFF_MAX_ENTRIES = int(os.getenv("LOGIN_BACKOFF_MAX_ENTRIES", "10000"))
+    LOGIN_BACKOFF_THRESHOLD = int(os.getenv("LOGIN_BACKOFF_THRESHOLD", "3"))
+    LOGIN_BACKOFF_BASE_SECONDS = float(os.getenv("LOGIN_BACKOFF_BASE_SECONDS", "1"))
+    LOGIN_BACKOFF_MAX_SECONDS = float(os.getenv("LOGIN_BACKOFF_MAX_SECONDS", "300"))
+    LOGIN_BACKOFF_DECAY_SECONDS = float(os.getenv("LOGIN_BACKOFF_DECAY_SECONDS", "900"))
     PAGINATION_DEFAULT_PAGE = int(os.getenv("PAGINATION_DEFAULT_PAGE", "1"))
     PAGINATION_DEFAULT_PAGE_SIZE = int(os.getenv("PAGINATION_DEFAULT_PAGE_SIZE", "20"))
     PAGINATION_MAX_PAGE_SIZE = int(os.getenv("PAGINATION_MAX_PAGE_SIZE", "100"))
+    PAGINATION_DEFAULT_TOTAL = os.getenv("PAGINATION_DEFAULT_TOTAL", "exact")
+    COUNT_CACHE_SIZE = int(os.getenv("COUNT_CACHE_SIZE", "1024"))
+    COUNT_CACHE_TTL = int(os.getenv("COUNT_CACHE_TTL", "30"))
+    TASK_BATCH_MAX_SIZE = int(os.getenv("TASK_BATCH_MAX_SIZE", "2000"))
+    TASK_BATCH_COST_UNIT = int(os.getenv("TASK_BATCH_COST_UNIT", "100"))
+    FAST_SERIALIZERS_ENABLED = _env_flag("FAST_SERIALIZERS_ENABLED", "true")
+    IDENTITY_CACHE_SIZE = int(os.getenv("IDENTITY_CACHE_SIZE", "0"))
+    IDENTITY_CACHE_TTL = int(os.getenv("IDENTITY_CACHE_TTL", "30"))
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "none")
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "30"))
+    RESPONSE_CACHE_PATH = str(
+        Path(os.getenv("RESPONSE_CACHE_PATH", "response_cache.db")).resolve()
+    )
+    CONDITIONAL_GET_ENABLED = _env_flag("CONDITIONAL_GET_ENABLED", "true")
+    DELETE_CHUNK_SIZE = int(os.getenv("DELETE_CHUNK_SIZE", "5000"))
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    USER_IMPORT_CHUNK_SIZE = int(os.getenv("USER_IMPORT_CHUNK_SIZE", "500"))
+    USER_IMPORT_HASH_EXECUTOR = os.getenv("USER_IMPORT_HASH_EXECUTOR", "process")
+    USER_IMPORT_HASH_WORKERS = int(os.getenv("USER_IMPORT_HASH_WORKERS", "0")) or None
+    USER_IMPORT_MAX_CONCURRENT = int(os.getenv("USER_IMPORT_MAX_CONCURRENT", "1"))
+    USER_IMPORT_RETRY_AFTER = int(os.getenv("USER_IMPORT_RETRY_AFTER", "5"))
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD") or None
+    PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+    PASSWORD_HASH_WORKERS = int(
+        os.getenv("PASSWORD_HASH_WORKERS", str(min(os.cpu_count() or 2, 4)))
+    )
+    PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+    PASSWORD_HASH_RETRY_AFTER = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", "1"))
+    SQL_INSTRUMENTATION_ENABLED = _env_flag("SQL_INSTRUMENTATION_ENABLED")
+    SQL_QUERY_BUDGET_DEFAULT = int(os.getenv("SQL_QUERY_BUDGET_DEFAULT", "12"))
+    SQL_QUERY_BUDGETS = {
+        **DEFAULT_SQL_QUERY_BUDGETS,
+        **json.loads(os.getenv("SQL_QUERY_BUDGETS", "{}")),
+    }
+    SQL_QUERY_BUDGET_RAISE = False
     PASSWORD_COMPLEXITY_REGEX = os.getenv(
         "PASSWORD_COMPLEXITY_REGEX",
         r"^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[\W_]).{12,}$",
@@ -74,3 +144,8 @@ class TestingConfig(Config):
     RATELIMIT_STORAGE_URI = "memory://"
     LOGIN_RATE_LIMIT = "3 per minute"
     SENSITIVE_RATE_LIMIT = "10 per minute"
+    SQL_INSTRUMENTATION_ENABLED = True
+    SQL_QUERY_BUDGET_RAISE = True
+    USER_IMPORT_HASH_EXECUTOR = "thread"
+    # Cache hits would hide the statements the query budgets are meant to catch.
+    RESPONSE_CACHE_BACKEND = "none"
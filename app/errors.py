@@ -5,12 +5,13 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
-from flask import Flask, Response, current_app, jsonify
+from flask import Flask, Response, current_app
 from flask_limiter.errors import RateLimitExceeded
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
 from .extensions import db
+from .negotiation import render
 
 
 @dataclass(frozen=True)
@@ -35,12 +36,14 @@ class APIError(Exception):
         status_code: Optional[int] = None,
         error_code: Optional[str] = None,
         details: Optional[Dict[str, Any]] = None,
+        retry_after: Optional[int] = None,
     ) -> None:
         super().__init__(message)
         self.message = message
         self.status_code = status_code or self.status_code
         self.error_code = error_code or self.error_code
         self.details = details
+        self.retry_after = retry_after
 
 
 class UnauthorizedError(APIError):
@@ -78,13 +81,30 @@ class BusinessValidationError(APIError):
     error_code = "business_validation_error"
 
 
+class TooManyRequestsError(APIError):
+    """Raised when a caller must back off before retrying."""
+
+    status_code = 429
+    error_code = "rate_limit_exceeded"
+
+
+class ServiceUnavailableError(APIError):
+    """Raised when a bounded resource is saturated and the client should retry."""
+
+    status_code = 503
+    error_code = "service_unavailable"
+
+
 def register_error_handlers(app: Flask) -> None:
     """Register application-wide error handlers."""
 
     @app.errorhandler(APIError)
     def handle_api_error(err: APIError) -> Response:
         payload = ErrorPayload(err.error_code, err.message, err.details)
-        return jsonify(_serialize_error(payload)), err.status_code
+        headers = {}
+        if err.retry_after is not None:
+            headers["Retry-After"] = str(err.retry_after)
+        return render(_serialize_error(payload), err.status_code, headers)
 
     @app.errorhandler(ValidationError)
     def handle_validation_error(err: ValidationError) -> Response:
@@ -95,7 +115,7 @@ def register_error_handlers(app: Flask) -> None:
             "Invalid request payload.",
             {"messages": err.messages},
         )
-        return jsonify(_serialize_error(payload)), 400
+        return render(_serialize_error(payload), 400)
 
     @app.errorhandler(IntegrityError)
     def handle_integrity_error(err: IntegrityError) -> Response:
@@ -108,12 +128,12 @@ def register_error_handlers(app: Flask) -> None:
         message = str(raw_message).lower()
         if "users.email" in message:
             payload = ErrorPayload("conflict", "Email is already being used.")
-            return jsonify(_serialize_error(payload)), 409
+            return render(_serialize_error(payload), 409)
 
         payload = ErrorPayload(
             "database_error", "A database integrity error occurred."
         )
-        return jsonify(_serialize_error(payload)), 400
+        return render(_serialize_error(payload), 400)
 
     @app.errorhandler(RateLimitExceeded)
     def handle_rate_limit(err: RateLimitExceeded) -> Response:
@@ -122,17 +142,25 @@ def register_error_handlers(app: Flask) -> None:
             "Too many requests, please try again later.",
             {"limit": str(err.limit)},
         )
-        return jsonify(_serialize_error(payload)), 429
+        return render(_serialize_error(payload), 429)
 
     @app.errorhandler(404)
     def handle_not_found(error) -> Response:
         payload = ErrorPayload("not_found", "Resource not found.")
-        return jsonify(_serialize_error(payload)), 404
+        return render(_serialize_error(payload), 404)
 
     @app.errorhandler(400)
     def handle_bad_request(error) -> Response:
         payload = ErrorPayload("bad_request", "Bad request.")
-        return jsonify(_serialize_error(payload)), 400
+        return render(_serialize_error(payload), 400)
+
+    @app.errorhandler(415)
+    def handle_unsupported_media_type(error) -> Response:
+        payload = ErrorPayload(
+            "unsupported_media_type",
+            getattr(error, "description", None) or "Unsupported request body type.",
+        )
+        return render(_serialize_error(payload), 415)
 
     @app.errorhandler(500)
     def handle_internal_error(error) -> Response:  # pragma: no cover - requires env
@@ -141,7 +169,7 @@ def register_error_handlers(app: Flask) -> None:
             "internal_server_error",
             "An unexpected error occurred.",
         )
-        return jsonify(_serialize_error(payload)), 500
+        return render(_serialize_error(payload), 500)
 
 
 def _serialize_error(payload: ErrorPayload) -> Dict[str, Any]:
@@ -159,6 +187,8 @@ __all__ = [
     "ConflictError",
     "ForbiddenError",
     "NotFoundError",
+    "ServiceUnavailableError",
+    "TooManyRequestsError",
     "UnauthorizedError",
     "register_error_handlers",
 ]
@@ -0,0 +1,418 @@
+"""Bounded off-thread execution of password hashing."""
+
+from __future__ import annotations
+
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import repeat
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from .cache import app_cache
+from .errors import ServiceUnavailableError
+
+R = TypeVar("R")
+
+EXECUTOR_TYPES = ("thread", "process", "inline")
+SATURATED_MSG = "Password hashing capacity exhausted, please retry shortly."
+BULK_SATURATED_MSG = "Too many imports are running, please retry shortly."
+DEFAULT_HASH_METHOD = "scrypt"
+CALIBRATION_ALGORITHMS = ("scrypt", "pbkdf2")
+
+
+def get_password_hash_method() -> str:
+    """Return the Werkzeug hash method configured for the current app."""
+
+    return current_app.config.get("PASSWORD_HASH_METHOD") or DEFAULT_HASH_METHOD
+
+
+@lru_cache(maxsize=32)
+def canonical_method(method: str) -> str:
+    """Return the fully-parameterised prefix Werkzeug writes for ``method``.
+
+    ``"scrypt"`` becomes ``"scrypt:32768:8:1"`` and so on, which is what stored
+    hashes are compared against when deciding whether to rehash.
+    """
+
+    return generate_password_hash("", method=method).split("$", 1)[0]
+
+
+def needs_rehash(password_hash: str, method: str) -> bool:
+    """Return whether ``password_hash`` was produced with different parameters."""
+
+    return password_hash.split("$", 1)[0] != canonical_method(method)
+
+
+def _timed_call(func: Callable[..., R], *args: Any) -> Tuple[R, float, float]:
+    """Run ``func`` and report when it started (wall clock) and how long it took.
+
+    Defined at module level so it can be pickled into a process pool.
+    """
+
+    started_at = time.time()
+    began = time.perf_counter()
+    result = func(*args)
+    return result, started_at, time.perf_counter() - began
+
+
+class PasswordHasher:
+    """Runs password hashing on a bounded thread or process pool.
+
+    At most ``max_workers`` hashes run concurrently and at most ``max_queue``
+    more may wait; further calls fail fast with
+    :class:`~app.errors.ServiceUnavailableError` so a login burst cannot pin
+    every request thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        executor: str = "thread",
+        max_workers: int = 2,
+        max_queue: int = 32,
+        timeout: Optional[float] = None,
+        retry_after: int = 1,
+        method: str = DEFAULT_HASH_METHOD,
+    ) -> None:
+        if executor not in EXECUTOR_TYPES:
+            raise ValueError(
+                f"executor must be one of {', '.join(EXECUTOR_TYPES)}; got '{executor}'."
+            )
+        if max_workers < 1:
+            raise ValueError("max_workers must be greater than or equal to 1.")
+
+        self.executor_type = executor
+        self.max_workers = max_workers
+        self.max_queue = max(max_queue, 0)
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.method = method
+
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._metrics: Dict[str, float] = {
+            "completed": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "queue_wait_total": 0.0,
+            "queue_wait_max": 0.0,
+            "hash_time_total": 0.0,
+            "hash_time_max": 0.0,
+        }
+
+    def hash(self, password: str) -> str:
+        """Return a salted hash for ``password``."""
+
+        return self.run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        """Return whether ``password`` matches ``password_hash``."""
+
+        return self.run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Return whether ``password_hash`` predates the configured parameters."""
+
+        return needs_rehash(password_hash, self.method)
+
+    def run(self, func: Callable[..., R], *args: Any) -> R:
+        """Execute ``func`` on the pool, enforcing the queue bound."""
+
+        if self.executor_type == "inline":
+            result, _, elapsed = _timed_call(func, *args)
+            self._record(0.0, elapsed)
+            return result
+
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self._metrics["rejected"] += 1
+                raise ServiceUnavailableError(SATURATED_MSG, retry_after=self.retry_after)
+            self._in_flight += 1
+
+        submitted_at = time.time()
+        try:
+            future = self._get_executor().submit(_timed_call, func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # A timed-out hash keeps its worker busy until it finishes, so the slot
+        # is only released once the work is really done (or cancelled).
+        future.add_done_callback(lambda _: self._release())
+        try:
+            result, started_at, elapsed = future.result(timeout=self.timeout)
+        except FutureTimeoutError as exc:
+            future.cancel()
+            with self._lock:
+                self._metrics["timeouts"] += 1
+            raise ServiceUnavailableError(
+                SATURATED_MSG, retry_after=self.retry_after
+            ) from exc
+
+        self._record(max(started_at - submitted_at, 0.0), elapsed)
+        return result
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def stats(self) -> Dict[str, float]:
+        """Return a snapshot of queue-wait and hash-time metrics."""
+
+        with self._lock:
+            snapshot = dict(self._metrics)
+            snapshot["in_flight"] = self._in_flight
+        completed = snapshot["completed"] or 1
+        snapshot["queue_wait_avg"] = snapshot["queue_wait_total"] / completed
+        snapshot["hash_time_avg"] = snapshot["hash_time_total"] / completed
+        return snapshot
+
+    def shutdown(self) -> None:
+        """Stop the underlying pool, waiting for running work to finish."""
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.executor_type == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix="password-hash",
+                        )
+        return self._executor
+
+    def _record(self, queue_wait: float, elapsed: float) -> None:
+        with self._lock:
+            metrics = self._metrics
+            metrics["completed"] += 1
+            metrics["queue_wait_total"] += queue_wait
+            metrics["queue_wait_max"] = max(metrics["queue_wait_max"], queue_wait)
+            metrics["hash_time_total"] += elapsed
+            metrics["hash_time_max"] = max(metrics["hash_time_max"], elapsed)
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Return the password hasher bound to the current app."""
+
+    def _build() -> PasswordHasher:
+        config = current_app.config
+        return PasswordHasher(
+            executor=config.get("PASSWORD_HASH_EXECUTOR", "thread"),
+            max_workers=config.get("PASSWORD_HASH_WORKERS", 2),
+            max_queue=config.get("PASSWORD_HASH_MAX_QUEUE", 32),
+            timeout=config.get("PASSWORD_HASH_TIMEOUT") or None,
+            retry_after=config.get("PASSWORD_HASH_RETRY_AFTER", 1),
+            method=get_password_hash_method(),
+        )
+
+    return app_cache("password_hasher", _build)
+
+
+def hash_password(password: str) -> str:
+    """Hash ``password`` on the bounded pool."""
+
+    return get_password_hasher().hash(password)
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """Verify ``password`` against ``password_hash`` on the bounded pool."""
+
+    return get_password_hasher().verify(password_hash, password)
+
+
+class BulkPasswordHasher:
+    """Hashes batches of passwords for bulk jobs such as user imports.
+
+    Bulk jobs get their own pool (a process pool by default, so scrypt runs on
+    every core) instead of competing with logins for the bounded request-path
+    hasher. The pool is created once and shared; at most ``max_jobs`` jobs may
+    use it at a time and further jobs fail fast with
+    :class:`~app.errors.ServiceUnavailableError`.
+    """
+
+    def __init__(
+        self,
+        *,
+        executor: str = "process",
+        max_workers: Optional[int] = None,
+        max_jobs: int = 1,
+        retry_after: int = 5,
+        method: str = DEFAULT_HASH_METHOD,
+    ) -> None:
+        if executor not in EXECUTOR_TYPES:
+            raise ValueError(
+                f"executor must be one of {', '.join(EXECUTOR_TYPES)}; got '{executor}'."
+            )
+        if max_jobs < 1:
+            raise ValueError("max_jobs must be greater than or equal to 1.")
+
+        self.executor_type = executor
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_jobs = max_jobs
+        self.retry_after = retry_after
+        self.method = method
+
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._jobs = threading.BoundedSemaphore(max_jobs)
+
+    @contextmanager
+    def job(self) -> Iterator[Callable[[Sequence[str]], List[str]]]:
+        """Hold one job slot, yielding :meth:`hash_many` while it is held."""
+
+        if not self._jobs.acquire(blocking=False):
+            raise ServiceUnavailableError(
+                BULK_SATURATED_MSG, retry_after=self.retry_after
+            )
+        try:
+            yield self.hash_many
+        finally:
+            self._jobs.release()
+
+    def hash_many(self, passwords: Sequence[str]) -> List[str]:
+        """Return a salted hash for each of ``passwords``, in order."""
+
+        if self.executor_type == "inline":
+            return [generate_password_hash(password, self.method) for password in passwords]
+        chunksize = max(len(passwords) // (self.max_workers * 4), 1)
+        return list(
+            self._get_executor().map(
+                generate_password_hash,
+                passwords,
+                repeat(self.method),
+                chunksize=chunksize,
+            )
+        )
+
+    def shutdown(self) -> None:
+        """Stop the underlying pool, waiting for running work to finish."""
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.executor_type == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix="bulk-password-hash",
+                        )
+        return self._executor
+
+
+def get_bulk_password_hasher() -> BulkPasswordHasher:
+    """Return the bulk password hasher bound to the current app."""
+
+    def _build() -> BulkPasswordHasher:
+        config = current_app.config
+        return BulkPasswordHasher(
+            executor=config.get("USER_IMPORT_HASH_EXECUTOR", "process"),
+            max_workers=config.get("USER_IMPORT_HASH_WORKERS") or None,
+            max_jobs=config.get("USER_IMPORT_MAX_CONCURRENT", 1),
+            retry_after=config.get("USER_IMPORT_RETRY_AFTER", 5),
+            method=get_password_hash_method(),
+        )
+
+    return app_cache("bulk_password_hasher", _build)
+
+
+def bulk_password_hasher() -> ContextManager[Callable[[Sequence[str]], List[str]]]:
+    """Reserve a job on the app's bulk hasher; see :meth:`BulkPasswordHasher.job`."""
+
+    return get_bulk_password_hasher().job()
+
+
+def _median_ms(method: str, samples: int) -> float:
+    timings = []
+    for _ in range(max(samples, 1)):
+        began = time.perf_counter()
+        generate_password_hash("calibration-password", method=method)
+        timings.append((time.perf_counter() - began) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_hash_method(
+    algorithm: str = "scrypt", *, target_ms: float = 250.0, samples: int = 3
+) -> Tuple[str, float, List[Tuple[str, float]]]:
+    """Benchmark hash parameters on this host and pick the costliest within target.
+
+    Returns the chosen method string, its median duration in milliseconds, and
+    every (method, milliseconds) pair that was measured.
+    """
+
+    if algorithm not in CALIBRATION_ALGORITHMS:
+        raise ValueError(
+            f"algorithm must be one of {', '.join(CALIBRATION_ALGORITHMS)}."
+        )
+
+    measured: List[Tuple[str, float]] = []
+
+    if algorithm == "scrypt":
+        chosen: Optional[Tuple[str, float]] = None
+        for log_n in range(14, 21):
+            method = f"scrypt:{2 ** log_n}:8:1"
+            elapsed = _median_ms(method, samples)
+            measured.append((method, elapsed))
+            if chosen is None or elapsed <= target_ms:
+                chosen = (method, elapsed)
+            if elapsed > target_ms:
+                break
+        return chosen[0], chosen[1], measured
+
+    probe_iterations = 100_000
+    probe = f"pbkdf2:sha256:{probe_iterations}"
+    probe_ms = _median_ms(probe, samples)
+    measured.append((probe, probe_ms))
+    per_iteration = probe_ms / probe_iterations
+    iterations = max(int(target_ms / per_iteration) // 10_000 * 10_000, 10_000)
+    method = f"pbkdf2:sha256:{iterations}"
+    elapsed = _median_ms(method, samples)
+    measured.append((method, elapsed))
+    return method, elapsed, measured
+
+
+__all__ = [
+    "BulkPasswordHasher",
+    "PasswordHasher",
+    "bulk_password_hasher",
+    "calibrate_hash_method",
+    "canonical_method",
+    "get_bulk_password_hasher",
+    "get_password_hash_method",
+    "get_password_hasher",
+    "hash_password",
+    "needs_rehash",
+    "verify_password",
+]
@@ -0,0 +1,134 @@
+"""Opt-in per-request SQL instrumentation and query budgets."""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+from flask import Flask, Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from .extensions import db
+
+_ORM_LOAD_LISTENER_REGISTERED = False
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised (under testing) when an endpoint issues more statements than budgeted."""
+
+
+@dataclass
+class RequestSQLStats:
+    """Statement counters collected for a single request."""
+
+    statements: int = 0
+    duration_ms: float = 0.0
+    rows: int = 0
+
+
+def _current_stats() -> Optional[RequestSQLStats]:
+    if not has_request_context():
+        return None
+    return g.get("sql_stats")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_instrumentation_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["sql_instrumentation_started"].pop()
+    stats = _current_stats()
+    if stats is None:
+        return
+    stats.statements += 1
+    stats.duration_ms += (time.perf_counter() - started) * 1000
+    if cursor.rowcount and cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+
+
+def _handle_error(context) -> None:
+    # Failed statements never reach after_cursor_execute; drop their start
+    # time so it does not linger on the pooled connection.
+    connection = context.connection
+    if connection is None:
+        return
+    started = connection.info.get("sql_instrumentation_started")
+    if started:
+        started.pop()
+
+
+def _on_instance_load(target: Any, context: Any) -> None:
+    stats = _current_stats()
+    if stats is not None:
+        stats.rows += 1
+
+
+def init_sql_instrumentation(app: Flask) -> None:
+    """Attach statement counters to the app's engine when enabled in config."""
+
+    global _ORM_LOAD_LISTENER_REGISTERED
+
+    if not app.config.get("SQL_INSTRUMENTATION_ENABLED", False):
+        return
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+    if not _ORM_LOAD_LISTENER_REGISTERED:
+        # SELECT rowcounts are unreliable across drivers, so hydrated ORM rows
+        # are counted instead; DML rows come from the cursor rowcount.
+        event.listen(db.Model, "load", _on_instance_load, propagate=True)
+        _ORM_LOAD_LISTENER_REGISTERED = True
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+
+
+def _start_request() -> None:
+    g.sql_stats = RequestSQLStats()
+
+
+def _finish_request(response: Response) -> Response:
+    stats: Optional[RequestSQLStats] = g.pop("sql_stats", None)
+    if stats is None:
+        return response
+
+    response.headers.add(
+        "Server-Timing",
+        f'db;dur={stats.duration_ms:.2f};desc="{stats.statements} statements, '
+        f'{stats.rows} rows"',
+    )
+
+    endpoint = request.endpoint or "<unmatched>"
+    record = {"endpoint": endpoint, "method": request.method, **asdict(stats)}
+    record["duration_ms"] = round(stats.duration_ms, 3)
+    current_app.logger.info("sql_stats %s", json.dumps(record))
+
+    _enforce_budget(endpoint, stats)
+    return response
+
+
+def _enforce_budget(endpoint: str, stats: RequestSQLStats) -> None:
+    config = current_app.config
+    budget = config.get("SQL_QUERY_BUDGETS", {}).get(
+        endpoint, config.get("SQL_QUERY_BUDGET_DEFAULT")
+    )
+    if budget is None or stats.statements <= budget:
+        return
+
+    message = (
+        f"{endpoint} issued {stats.statements} SQL statements "
+        f"(budget {budget})."
+    )
+    if config.get("SQL_QUERY_BUDGET_RAISE", False):
+        raise QueryBudgetExceeded(message)
+    current_app.logger.warning("SQL query budget exceeded: %s", message)
+
+
+__all__ = ["QueryBudgetExceeded", "RequestSQLStats", "init_sql_instrumentation"]
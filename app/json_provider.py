@@ -0,0 +1,92 @@
+"""JSON provider serialising responses with orjson when it is installed."""
+
+from __future__ import annotations
+
+import json
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+try:  # pragma: no cover - exercised only where orjson is installed
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Serialise types neither encoder handles natively.
+
+    Dates are always ISO 8601 (what orjson emits natively) so payloads do not
+    depend on which encoder is installed; everything else follows Flask.
+    """
+
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return DefaultJSONProvider.default(value)
+
+
+class APIJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, falling back to :mod:`json`.
+
+    Key sorting follows ``JSON_SORT_KEYS``. Calls passing encoder-specific
+    keyword arguments, and values orjson rejects (such as integers beyond 64
+    bits), go through the stdlib encoder instead.
+    """
+
+    default = staticmethod(_default)
+    ensure_ascii = False
+
+    def __init__(self, app: Flask) -> None:
+        super().__init__(app)
+        self.sort_keys = bool(app.config.get("JSON_SORT_KEYS", False))
+
+    @property
+    def backend(self) -> str:
+        """Name of the encoder in use: ``"orjson"`` or ``"json"``."""
+
+        return "orjson" if orjson is not None else "json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialise ``obj`` to a string."""
+
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        encoded = self._orjson_dumps(obj, indent=False)
+        return encoded.decode() if encoded is not None else super().dumps(obj)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """Deserialise JSON text or UTF-8 bytes."""
+
+        if orjson is None or kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Return a JSON response, pretty-printed under the same rules as Flask."""
+
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = self._orjson_dumps(obj, indent=indent) if orjson is not None else None
+        if body is None:
+            dump_args = {"indent": 2} if indent else {"separators": (",", ":")}
+            body = super().dumps(obj, **dump_args).encode()
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+    def _orjson_dumps(self, obj: Any, *, indent: bool) -> bytes | None:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            return None
+
+
+__all__ = ["APIJSONProvider"]
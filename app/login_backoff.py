@@ -0,0 +1,128 @@
+"""Per-account exponential backoff for failed logins."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional
+
+from flask import current_app
+
+from .cache import LRUCache, app_cache
+
+
+class _FailureRecord(NamedTuple):
+    failures: int
+    blocked_until: float
+
+
+class LoginBackoff:
+    """Tracks recent login failures per account in a bounded LRU.
+
+    The first ``threshold`` failures are free; each one after that blocks the
+    account for ``base_delay * 2 ** n`` seconds (capped at ``max_delay``).
+    Records are forgotten ``decay`` seconds after the latest failure, and the
+    LRU bound keeps a spray across many emails from growing memory.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 10000,
+        threshold: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 300.0,
+        decay: float = 900.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.threshold = max(threshold, 0)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.decay = decay
+        self._clock = clock
+        self._records: LRUCache[str, _FailureRecord] = LRUCache(maxsize, clock=clock)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {"blocked": 0, "failures": 0, "successes": 0}
+
+    @staticmethod
+    def normalize(email: str) -> str:
+        """Return the tracking key for ``email``."""
+
+        return email.strip().lower()
+
+    def retry_after(self, email: str) -> Optional[float]:
+        """Return seconds until ``email`` may try again, or ``None`` if allowed."""
+
+        record = self._records.get(self.normalize(email))
+        if record is None:
+            return None
+
+        remaining = record.blocked_until - self._clock()
+        if remaining <= 0:
+            return None
+
+        with self._lock:
+            self._counters["blocked"] += 1
+        return remaining
+
+    def record_failure(self, email: str) -> None:
+        """Register a failed attempt and extend the block if over the threshold."""
+
+        key = self.normalize(email)
+        with self._lock:
+            self._counters["failures"] += 1
+            previous = self._records.get(key)
+            failures = (previous.failures if previous else 0) + 1
+            now = self._clock()
+            blocked_until = now
+            over = failures - self.threshold
+            if over >= 0:
+                delay = min(self.base_delay * (2**over), self.max_delay)
+                blocked_until = now + delay
+            self._records.set(
+                key,
+                _FailureRecord(failures, blocked_until),
+                expires_at=max(blocked_until, now + self.decay),
+            )
+
+    def record_success(self, email: str) -> None:
+        """Forget previous failures after a successful login."""
+
+        with self._lock:
+            self._counters["successes"] += 1
+        self._records.pop(self.normalize(email))
+
+    def stats(self) -> Dict[str, int]:
+        """Return counters describing backoff activity."""
+
+        with self._lock:
+            stats = dict(self._counters)
+        stats["tracked"] = len(self._records)
+        stats["evictions"] = self._records.stats()["evictions"]
+        return stats
+
+
+def get_login_backoff() -> LoginBackoff:
+    """Return the login backoff tracker bound to the current app."""
+
+    def _build() -> LoginBackoff:
+        config = current_app.config
+        return LoginBackoff(
+            maxsize=config.get("LOGIN_BACKOFF_MAX_ENTRIES", 10000),
+            threshold=config.get("LOGIN_BACKOFF_THRESHOLD", 3),
+            base_delay=config.get("LOGIN_BACKOFF_BASE_SECONDS", 1.0),
+            max_delay=config.get("LOGIN_BACKOFF_MAX_SECONDS", 300.0),
+            decay=config.get("LOGIN_BACKOFF_DECAY_SECONDS", 900.0),
+        )
+
+    return app_cache("login_backoff", _build)
+
+
+def seconds_to_retry(remaining: float) -> int:
+    """Round a remaining block duration up to whole seconds for Retry-After."""
+
+    return max(int(math.ceil(remaining)), 1)
+
+
+__all__ = ["LoginBackoff", "get_login_backoff", "seconds_to_retry"]
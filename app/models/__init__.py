@@ -1,8 +1,29 @@
 """Database models package."""
 
 from .base import TimestampMixin
-from .project import Project
+from .project import TASK_STATUS_COUNTERS, Project
+from .refresh_token import RefreshToken
+from .search import (
+    SEARCH_TABLE,
+    include_in_migrations,
+    install_search_index,
+    rebuild_search_index,
+    search_index_exists,
+)
 from .task import Task, TaskStatus
 from .user import User
 
-__all__ = ["TimestampMixin", "User", "Project", "Task", "TaskStatus"]
+__all__ = [
+    "TASK_STATUS_COUNTERS",
+    "TimestampMixin",
+    "User",
+    "Project",
+    "RefreshToken",
+    "Task",
+    "TaskStatus",
+    "SEARCH_TABLE",
+    "include_in_migrations",
+    "install_search_index",
+    "rebuild_search_index",
+    "search_index_exists",
+]
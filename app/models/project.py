@@ -4,6 +4,15 @@ from __future__ import annotations
 
 from ..extensions import db
 from .base import TimestampMixin
+from .task import TaskStatus
+
+#: Project column holding the number of tasks in each status.
+TASK_STATUS_COUNTERS = {
+    TaskStatus.TODO: "todo_count",
+    TaskStatus.IN_PROGRESS: "in_progress_count",
+    TaskStatus.DONE: "done_count",
+    TaskStatus.CANCELED: "canceled_count",
+}
 
 
 class Project(TimestampMixin, db.Model):
@@ -14,22 +23,42 @@ class Project(TimestampMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False, index=True)
     description = db.Column(db.Text, nullable=True)
-    created_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
+    created_by = db.Column(
+        db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+
+    # Denormalised task counters maintained by TaskRepository writes and
+    # rebuilt by ``flask recount-tasks``.
+    task_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    todo_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    in_progress_count = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
+    done_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    canceled_count = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
 
     created_by_user = db.relationship(
         "User",
         back_populates="created_projects",
-        lazy="joined",
+        lazy="raise",
     )
     tasks = db.relationship(
         "Task",
         back_populates="project",
         cascade="all, delete-orphan",
-        lazy="select",
+        passive_deletes=True,
+        lazy="raise",
+    )
+
+    __table_args__ = (
+        db.Index("ix_projects_created_by_id", "created_by", "id"),
+        db.Index("ix_projects_updated_at_id", "updated_at", "id"),
     )
 
     def __repr__(self) -> str:
         return f"<Project {self.id} {self.name}>"
 
 
-__all__ = ["Project"]
+__all__ = ["TASK_STATUS_COUNTERS", "Project"]
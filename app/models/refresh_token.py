@@ -0,0 +1,35 @@
+"""Refresh token model definition."""
+
+from __future__ import annotations
+
+from ..extensions import db
+from .base import TimestampMixin
+
+
+class RefreshToken(TimestampMixin, db.Model):
+    """Long-lived, revocable credential exchanged for new access tokens.
+
+    Only a SHA-256 digest of the token is stored; the raw value is returned to
+    the client once at login.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(
+        db.Integer,
+        db.ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    token_hash = db.Column(db.String(64), nullable=False, unique=True, index=True)
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    revoked_at = db.Column(db.DateTime(timezone=True), nullable=True)
+
+    user = db.relationship("User", back_populates="refresh_tokens", lazy="raise")
+
+    def __repr__(self) -> str:
+        return f"<RefreshToken {self.id} user={self.user_id}>"
+
+
+__all__ = ["RefreshToken"]
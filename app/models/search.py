@@ -0,0 +1,162 @@
+"""SQLite FTS5 index over project and task text, kept in sync by triggers."""
+
+from __future__ import annotations
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+
+from ..extensions import db
+
+SEARCH_TABLE = "search_index"
+
+# Projects and tasks share one index; the rowid encodes both the source table
+# and its primary key so triggers can address entries without a scan.
+PROJECT_DOC_ID = "{row}.id * 2"
+TASK_DOC_ID = "{row}.id * 2 + 1"
+
+_PROJECT_VALUES = (
+    f"{PROJECT_DOC_ID}, 'project', {{row}}.id, {{row}}.id, "
+    "{row}.name, coalesce({row}.description, '')"
+)
+_TASK_VALUES = (
+    f"{TASK_DOC_ID}, 'task', {{row}}.id, {{row}}.project_id, "
+    "{row}.title, coalesce({row}.description, '')"
+)
+_COLUMNS = "rowid, kind, ref_id, project_id, title, body"
+
+_CREATE_TABLE = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+    kind UNINDEXED,
+    ref_id UNINDEXED,
+    project_id UNINDEXED,
+    title,
+    body,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+
+def _triggers(source: str, values: str, doc_id: str, text_columns: str) -> list[str]:
+    """Return insert/update/delete triggers mirroring ``source`` into the index."""
+
+    new_values = values.format(row="new")
+    old_doc_id = doc_id.format(row="old")
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {source}_search_ai AFTER INSERT ON {source}
+        BEGIN
+            INSERT INTO {SEARCH_TABLE} ({_COLUMNS}) VALUES ({new_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {source}_search_au
+        AFTER UPDATE OF {text_columns} ON {source}
+        BEGIN
+            DELETE FROM {SEARCH_TABLE} WHERE rowid = {old_doc_id};
+            INSERT INTO {SEARCH_TABLE} ({_COLUMNS}) VALUES ({new_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {source}_search_ad AFTER DELETE ON {source}
+        BEGIN
+            DELETE FROM {SEARCH_TABLE} WHERE rowid = {old_doc_id};
+        END
+        """,
+    ]
+
+
+_CREATE_TRIGGERS = _triggers(
+    "projects", _PROJECT_VALUES, PROJECT_DOC_ID, "name, description"
+) + _triggers("tasks", _TASK_VALUES, TASK_DOC_ID, "title, description, project_id")
+
+
+def fts5_available(connection: Connection) -> bool:
+    """Return whether ``connection`` is SQLite with the FTS5 module compiled in."""
+
+    if connection.dialect.name != "sqlite":
+        return False
+    return bool(
+        connection.execute(text("SELECT sqlite_compileoption_used('ENABLE_FTS5')"))
+        .scalar()
+    )
+
+
+def search_index_exists(connection: Connection) -> bool:
+    """Return whether the FTS table has been installed."""
+
+    if connection.dialect.name != "sqlite":
+        return False
+    return (
+        connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": SEARCH_TABLE},
+        ).scalar()
+        is not None
+    )
+
+
+def install_search_index(connection: Connection) -> bool:
+    """Create the FTS table and its sync triggers when FTS5 is available.
+
+    Returns ``False`` (leaving the schema untouched) when it is not, in which
+    case search falls back to ``LIKE`` queries.
+    """
+
+    if not fts5_available(connection):
+        return False
+    try:
+        connection.execute(text(_CREATE_TABLE))
+    except OperationalError:
+        return False
+    for statement in _CREATE_TRIGGERS:
+        connection.execute(text(statement))
+    return True
+
+
+def rebuild_search_index(connection: Connection) -> int:
+    """Repopulate the FTS table from projects and tasks; returns rows indexed."""
+
+    connection.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+    indexed = 0
+    for source, values in (("projects", _PROJECT_VALUES), ("tasks", _TASK_VALUES)):
+        result = connection.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} ({_COLUMNS}) "
+                f"SELECT {values.format(row=source)} FROM {source}"
+            )
+        )
+        indexed += result.rowcount
+    return indexed
+
+
+def include_in_migrations(name, type_, parent_names) -> bool:
+    """Alembic ``include_name`` hook hiding the FTS table and its shadow tables.
+
+    They are managed by :func:`install_search_index`, not by autogenerate.
+    """
+
+    return not (type_ == "table" and name.startswith(SEARCH_TABLE))
+
+
+def _after_create(target, connection: Connection, **kw) -> None:
+    install_search_index(connection)
+
+
+def _before_drop(target, connection: Connection, **kw) -> None:
+    if search_index_exists(connection):
+        connection.execute(text(f"DROP TABLE {SEARCH_TABLE}"))
+
+
+event.listen(db.metadata, "after_create", _after_create)
+event.listen(db.metadata, "before_drop", _before_drop)
+
+
+__all__ = [
+    "SEARCH_TABLE",
+    "fts5_available",
+    "include_in_migrations",
+    "install_search_index",
+    "rebuild_search_index",
+    "search_index_exists",
+]
@@ -35,19 +35,30 @@ class Task(TimestampMixin, db.Model):
     due_date = db.Column(db.Date, nullable=True)
 
     project_id = db.Column(
-        db.Integer, db.ForeignKey("projects.id"), nullable=False, index=True
+        db.Integer, db.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    assigned_to = db.Column(
+        db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"), nullable=True
     )
-    assigned_to = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
 
     project = db.relationship(
         "Project",
         back_populates="tasks",
-        lazy="joined",
+        lazy="raise",
     )
     assignee = db.relationship(
         "User",
         back_populates="assigned_tasks",
-        lazy="joined",
+        lazy="raise",
+    )
+
+    __table_args__ = (
+        # Filtered and sorted task listings within a project.
+        db.Index("ix_tasks_project_status_id", "project_id", "status", "id"),
+        db.Index("ix_tasks_project_due_date_id", "project_id", "due_date", "id"),
+        db.Index("ix_tasks_project_updated_at_id", "project_id", "updated_at", "id"),
+        # "My tasks by due date" lookups.
+        db.Index("ix_tasks_assigned_to_due_date", "assigned_to", "due_date"),
     )
 
     @validates("status")
@@ -7,6 +7,7 @@ from sqlalchemy.orm import validates
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from ..extensions import db
+from ..hashing import get_password_hash_method
 from .base import TimestampMixin
 
 
@@ -24,12 +25,21 @@ class User(TimestampMixin, db.Model):
     created_projects = db.relationship(
         "Project",
         back_populates="created_by_user",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
     assigned_tasks = db.relationship(
         "Task",
         back_populates="assignee",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
+    )
+    refresh_tokens = db.relationship(
+        "RefreshToken",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
     )
 
     __table_args__ = (
@@ -47,12 +57,18 @@ class User(TimestampMixin, db.Model):
         return value
 
     def set_password(self, password: str) -> None:
-        """Hash and store the user's password."""
+        """Hash and store the user's password using the configured method."""
 
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(
+            password, method=get_password_hash_method()
+        )
 
     def check_password(self, password: str) -> bool:
-        """Verify a plaintext password against the stored hash."""
+        """Verify a plaintext password against the stored hash.
+
+        Logins verify through :func:`app.services.auth_service` instead, which
+        also upgrades hashes made with outdated parameters.
+        """
 
         return check_password_hash(self.password_hash, password)
 
@@ -0,0 +1,95 @@
+"""Content negotiation between JSON and MessagePack.
+
+MessagePack support is optional: without the ``msgpack`` package responses are
+always JSON and MessagePack request bodies are rejected with ``415``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from flask import Response, current_app, has_request_context, request
+from werkzeug.exceptions import BadRequest, UnsupportedMediaType
+
+from .json_provider import APIJSONProvider
+
+try:  # pragma: no cover - depends on the environment
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+JSON_MIMETYPE = "application/json"
+MSGPACK_MIMETYPE = "application/msgpack"
+MSGPACK_MIMETYPES = (MSGPACK_MIMETYPE, "application/x-msgpack")
+
+
+def msgpack_available() -> bool:
+    """Return whether the ``msgpack`` package is installed."""
+
+    return msgpack is not None
+
+
+def wants_msgpack() -> bool:
+    """Return whether the current request prefers a MessagePack response.
+
+    JSON wins ties, so ``*/*`` and missing ``Accept`` headers get JSON.
+    """
+
+    if msgpack is None or not has_request_context():
+        return False
+    best = request.accept_mimetypes.best_match(
+        [JSON_MIMETYPE, *MSGPACK_MIMETYPES], default=JSON_MIMETYPE
+    )
+    return best in MSGPACK_MIMETYPES
+
+
+def packb(obj: Any) -> bytes:
+    """Encode ``obj`` as MessagePack, converting types like the JSON provider."""
+
+    return msgpack.packb(obj, default=APIJSONProvider.default, datetime=False)
+
+
+def render(
+    payload: Any, status: int = 200, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Return ``payload`` as JSON or MessagePack according to ``Accept``."""
+
+    if wants_msgpack():
+        response = current_app.response_class(packb(payload), mimetype=MSGPACK_MIMETYPE)
+    else:
+        response = current_app.json.response(payload)
+    response.status_code = status
+    response.headers.update(headers or {})
+    response.vary.add("Accept")
+    return response
+
+
+def get_request_data(*, silent: bool = False) -> Any:
+    """Parse the request body as JSON or MessagePack based on ``Content-Type``.
+
+    Drop-in for :meth:`flask.Request.get_json`: malformed bodies raise
+    ``400`` unless ``silent`` is set. MessagePack bodies raise ``415`` when the
+    package is not installed.
+    """
+
+    if request.mimetype not in MSGPACK_MIMETYPES:
+        return request.get_json(silent=silent)
+    if msgpack is None:
+        raise UnsupportedMediaType("MessagePack request bodies are not supported.")
+    try:
+        return msgpack.unpackb(request.get_data(cache=True), raw=False)
+    except (ValueError, msgpack.UnpackException) as exc:
+        if silent:
+            return None
+        raise BadRequest("Malformed MessagePack body.") from exc
+
+
+__all__ = [
+    "JSON_MIMETYPE",
+    "MSGPACK_MIMETYPE",
+    "get_request_data",
+    "msgpack_available",
+    "packb",
+    "render",
+    "wants_msgpack",
+]
@@ -1,13 +1,28 @@
 """Repository classes encapsulating persistence concerns."""
 
 from .base import BaseRepository
+from .identity_cache import IdentityCache, get_identity_cache, init_identity_cache
+from .pagination import TOTAL_EXACT, TOTAL_MODES, Cursor, decode_cursor, encode_cursor
 from .project_repository import ProjectRepository
+from .refresh_token_repository import RefreshTokenRepository
+from .search_repository import SearchRepository, search_terms
 from .task_repository import TaskRepository
 from .user_repository import UserRepository
 
 __all__ = [
     "BaseRepository",
+    "Cursor",
+    "IdentityCache",
     "ProjectRepository",
+    "RefreshTokenRepository",
+    "SearchRepository",
+    "TOTAL_EXACT",
+    "TOTAL_MODES",
     "TaskRepository",
     "UserRepository",
+    "decode_cursor",
+    "encode_cursor",
+    "get_identity_cache",
+    "init_identity_cache",
+    "search_terms",
 ]
@@ -3,44 +3,189 @@
 from __future__ import annotations
 
 import math
-from typing import Any, Dict, Generic, Iterable, Tuple, Type, TypeVar, Union
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
-from sqlalchemy import Select, func, select
+from flask import current_app
+from sqlalchemy import Column, Select, Table, delete, func, inspect, select, update
 from sqlalchemy.exc import IntegrityError, NoResultFound, SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .count_cache import get_count_cache
+from .identity_cache import IdentityCache, Snapshot, get_identity_cache, is_dirty
+from .pagination import (
+    NEXT,
+    PREV,
+    TOTAL_ESTIMATE,
+    TOTAL_EXACT,
+    TOTAL_NONE,
+    Cursor,
+    encode_cursor,
+)
 
 ModelT = TypeVar("ModelT")
 
 
 class BaseRepository(Generic[ModelT]):
-    """Generic repository implementing common CRUD operations."""
+    """Generic repository implementing common CRUD operations.
+
+    Relationships default to ``lazy="raise"``; read methods take a ``profile``
+    naming the loader options from :attr:`loading_profiles` they need. The
+    ``list`` and ``detail`` profiles load columns only, which is all the
+    schemas dump.
+
+    List methods accept ``filters`` (names from :attr:`filter_criteria`, each
+    mapping a value to a SQL criterion) and ``sort`` (a name from
+    :attr:`sortable_fields`, ``-`` prefixed for descending order); the primary
+    key breaks ties so orderings stay stable.
+
+    Writes through :meth:`create`, :meth:`update` and :meth:`delete` invalidate
+    cached list totals for the model's table and for :attr:`dependent_tables`,
+    the tables whose rows are removed or re-pointed by cascades.
+
+    :meth:`delete` is set-based: the ``ondelete`` rule declared on every
+    foreign key referencing the model (``CASCADE`` or ``SET NULL``) is applied
+    with one statement per referencing column instead of loading dependents
+    into the session.
+
+    Read methods also accept ``fields``, a sparse fieldset of column names;
+    only those columns (plus the primary key) are selected.
+
+    When ``IDENTITY_CACHE_SIZE`` is set, :meth:`get_by_id` with one of the
+    column-only :attr:`cached_profiles` is served from a committed snapshot of
+    the row, shared across requests (see :mod:`.identity_cache`).
+    """
 
     model: Type[ModelT]
     default_ordering: Iterable[Any] | None = None
+    loading_profiles: Mapping[str, Tuple[Any, ...]] = {"list": (), "detail": ()}
+    dependent_tables: Tuple[str, ...] = ()
+    filter_criteria: Mapping[str, Callable[[Any], Any]] = {}
+    sortable_fields: Tuple[str, ...] = ("id",)
+    cached_profiles: Tuple[str, ...] = ("list", "detail", "reference")
 
     def __init__(self, session: Session) -> None:
         self.session = session
         if not hasattr(self, "model"):
             raise ValueError("Repository subclasses must define a 'model' attribute.")
 
-    def get_by_id(self, entity_id: int) -> ModelT:
-        """Return an entity by its primary key."""
+    def get_by_id(
+        self,
+        entity_id: int,
+        *,
+        profile: str = "detail",
+        fields: Optional[Iterable[str]] = None,
+    ) -> ModelT:
+        """Return an entity by its primary key.
 
-        entity = self.session.get(self.model, entity_id)
+        Rows already in the session are returned from it. Otherwise, with the
+        identity cache enabled and a cached profile, a snapshot is rehydrated
+        into an attached instance without a SELECT; misses load every column
+        so the row can be snapshotted.
+        """
+
+        options = self._loader_options(profile, fields)
+        cache = get_identity_cache() if profile in self.cached_profiles else None
+        if cache is not None and not self._in_session(entity_id):
+            entity = self._get_through_cache(cache, entity_id)
+        else:
+            entity = self.session.get(self.model, entity_id, options=options)
         if entity is None:
             raise NoResultFound(
                 f"{self.model.__name__} with id '{entity_id}' was not found."
             )
         return entity
 
-    def list(self, *, page: int = 1, per_page: int = 20) -> Tuple[list[ModelT], dict]:
+    def existing_ids(self, ids: Iterable[int]) -> set[int]:
+        """Return which of ``ids`` exist, using a single ``IN`` query."""
+
+        wanted = set(ids)
+        if not wanted:
+            return set()
+        key_column = self._keyset_column()
+        stmt = select(key_column).where(key_column.in_(wanted))
+        return set(self.session.execute(stmt).scalars().all())
+
+    def list(
+        self,
+        *,
+        page: int = 1,
+        per_page: int = 20,
+        cursor: Optional[Cursor] = None,
+        total: str = TOTAL_EXACT,
+        filters: Optional[Mapping[str, Any]] = None,
+        sort: Optional[str] = None,
+        profile: str = "list",
+        fields: Optional[Iterable[str]] = None,
+    ) -> Tuple[list[ModelT], dict]:
         """Return a paginated list of entities."""
 
-        stmt = select(self.model)
-        ordering = tuple(self.default_ordering or self._derive_ordering())
-        if ordering:
-            stmt = stmt.order_by(*ordering)
-        return self._paginate(stmt, page=page, per_page=per_page)
+        stmt = select(self.model).options(*self._loader_options(profile, fields))
+        stmt = self._apply_sort(self._apply_filters(stmt, filters), sort)
+        return self._paginate(
+            stmt,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            total=total,
+            keyset=sort in (None, "id"),
+        )
+
+    def iter_rows(
+        self,
+        *criteria: Any,
+        filters: Optional[Mapping[str, Any]] = None,
+        after_id: Optional[int] = None,
+        batch_size: int = 1000,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream matching rows as column dicts in primary key order.
+
+        Rows are fetched ``batch_size`` at a time from one server-side cursor
+        and never become ORM instances, so memory stays flat however many
+        rows match. ``after_id`` resumes after the last id a caller received.
+        """
+
+        key_column = self._keyset_column()
+        columns = self.model.__table__.columns
+        if fields is not None:
+            wanted = {key_column.key, *fields}
+            columns = [column for column in columns if column.key in wanted]
+        stmt = select(*columns).where(
+            *criteria, *self._filter_clauses(filters)
+        )
+        if after_id is not None:
+            stmt = stmt.where(key_column > after_id)
+        stmt = stmt.order_by(key_column).execution_options(yield_per=batch_size)
+        for row in self.session.execute(stmt):
+            yield row._asdict()
+
+    def change_stamp(self, *criteria: Any) -> Tuple[int, Optional[datetime]]:
+        """Return ``(row count, latest updated_at)`` over matching rows.
+
+        Inserts and updates move the timestamp and deletes move the count, so
+        the pair validates cached listings without loading any rows.
+        """
+
+        stmt = select(func.count(), func.max(self.model.updated_at)).select_from(
+            self.model
+        )
+        count, last_modified = self.session.execute(stmt.where(*criteria)).one()
+        return count, last_modified
 
     def create(self, data: Union[Dict[str, Any], ModelT]) -> ModelT:
         """Create and persist a new entity."""
@@ -48,6 +193,7 @@ class BaseRepository(Generic[ModelT]):
         entity = self._coerce_entity(data)
         self.session.add(entity)
         self._commit()
+        self._invalidate_counts()
         return entity
 
     def update(self, entity: ModelT, data: Dict[str, Any]) -> ModelT:
@@ -56,14 +202,219 @@ class BaseRepository(Generic[ModelT]):
         for key, value in data.items():
             setattr(entity, key, value)
         self._commit()
+        self._invalidate_counts()
+        self._forget_identity(inspect(entity).identity)
         return entity
 
     def delete(self, entity_id: int) -> None:
-        """Delete an entity by id."""
+        """Delete an entity by id, applying foreign key ``ondelete`` rules.
 
-        entity = self.get_by_id(entity_id)
-        self.session.delete(entity)
+        Dependents are removed or detached ``DELETE_CHUNK_SIZE`` rows per
+        statement, recursing through cascades so grandchildren are handled
+        before their parents go; when a rule matches more rows than that, each
+        full chunk is committed on its own so large deletes never hold the
+        write lock for long. Small deletes run in a single transaction.
+        """
+
+        chunk_size = current_app.config.get("DELETE_CHUNK_SIZE", 5000)
+        self._delete_dependents(self.model.__table__, [entity_id], chunk_size)
+
+        key_column = self._keyset_column()
+        result = self.session.execute(
+            delete(self.model).where(key_column == entity_id)
+        )
+        if result.rowcount == 0:
+            self.session.rollback()
+            raise NoResultFound(
+                f"{self.model.__name__} with id '{entity_id}' was not found."
+            )
         self._commit()
+        self._invalidate_counts()
+        self._forget_identity((entity_id,))
+
+    def _in_session(self, entity_id: Any) -> bool:
+        """Return whether the session's identity map holds the entity."""
+
+        key = self.session.identity_key(self.model, entity_id)
+        return key in self.session.identity_map
+
+    def _get_through_cache(
+        self, cache: IdentityCache, entity_id: Any
+    ) -> Optional[ModelT]:
+        """Rehydrate a cached snapshot, or load and snapshot the committed row."""
+
+        table = self.model.__tablename__
+        identity = (entity_id,)
+        snapshot = cache.get(table, identity)
+        if snapshot is not None:
+            return self._rehydrate(snapshot)
+
+        # Read before the SELECT: a write committed after it would otherwise
+        # be undone by storing the row as it was loaded.
+        since = cache.write_count(table)
+        entity = self.session.get(self.model, entity_id)
+        if entity is not None and not is_dirty(self.session, table, identity):
+            cache.set(
+                table,
+                identity,
+                {
+                    column.key: getattr(entity, column.key)
+                    for column in self.model.__mapper__.column_attrs
+                },
+                since=since,
+            )
+        return entity
+
+    def _rehydrate(self, snapshot: Snapshot) -> ModelT:
+        """Attach an instance built from ``snapshot`` to the session, SELECT-free."""
+
+        entity = self.model.__mapper__.class_manager.new_instance()
+        for key, value in snapshot.items():
+            set_committed_value(entity, key, value)
+        make_transient_to_detached(entity)
+        return self.session.merge(entity, load=False)
+
+    def _forget_identity(self, identity: Tuple[Any, ...]) -> None:
+        """Drop the identity snapshot of a row written through the repository."""
+
+        cache = get_identity_cache()
+        if cache is not None:
+            cache.discard(self.model.__tablename__, identity)
+
+    def _delete_rules(self, table: Table) -> Tuple[Tuple[Column, str], ...]:
+        """Return ``(column, action)`` for foreign keys referencing ``table``."""
+
+        rules = []
+        for child in table.metadata.sorted_tables:
+            for foreign_key in child.foreign_keys:
+                action = (foreign_key.ondelete or "").upper()
+                if foreign_key.column.table is not table:
+                    continue
+                if action in ("CASCADE", "SET NULL"):
+                    rules.append((foreign_key.parent, action))
+        return tuple(rules)
+
+    def _delete_dependents(
+        self,
+        table: Table,
+        parents: Union[Select, list],
+        chunk_size: int,
+        path: Tuple[Table, ...] = (),
+    ) -> None:
+        """Apply every delete rule referencing the ``parents`` keys of ``table``.
+
+        Tables already on ``path`` are not entered again, so self-referencing
+        cascades stop after one level instead of recursing forever.
+        """
+
+        for column, action in self._delete_rules(table):
+            if column.table in path:
+                continue
+            while self._apply_delete_rule(
+                column, action, parents, chunk_size, (*path, table)
+            ):
+                self._commit()
+
+    def _apply_delete_rule(
+        self,
+        column: Column,
+        action: str,
+        parents: Union[Select, list],
+        chunk_size: int,
+        path: Tuple[Table, ...],
+    ) -> bool:
+        """Apply one chunk of a rule; returns whether rows may remain."""
+
+        child = column.table
+        child_key = next(iter(child.primary_key.columns))
+        chunk = (
+            select(child_key)
+            .where(column.in_(parents))
+            .order_by(child_key)
+            .limit(chunk_size)
+        )
+        if action == "CASCADE":
+            # Ordered, so the chunk stays put until deleted; its dependents go first.
+            self._delete_dependents(child, chunk, chunk_size, path)
+            stmt = delete(child)
+        else:
+            stmt = update(child).values({column.key: None})
+        result = self.session.execute(stmt.where(child_key.in_(chunk)))
+        return result.rowcount >= chunk_size
+
+    def _loader_options(
+        self, profile: Optional[str], fields: Optional[Iterable[str]] = None
+    ) -> Tuple[Any, ...]:
+        """Resolve a loading profile name to SQLAlchemy loader options.
+
+        ``fields`` adds a ``load_only`` over the named columns so the rest are
+        neither fetched nor hydrated.
+        """
+
+        options: Tuple[Any, ...] = ()
+        if profile is not None:
+            try:
+                options = tuple(self.loading_profiles[profile])
+            except KeyError as exc:
+                raise ValueError(
+                    f"Unknown loading profile '{profile}' for {type(self).__name__}."
+                ) from exc
+        if fields is not None:
+            options += (load_only(*self._field_columns(fields)),)
+        return options
+
+    def _field_columns(self, fields: Iterable[str]) -> list[Any]:
+        """Map field names to mapped column attributes, rejecting unknown ones."""
+
+        columns = self.model.__mapper__.columns
+        unknown = [name for name in fields if name not in columns]
+        if unknown:
+            raise ValueError(
+                f"Unknown fields {', '.join(unknown)} for {type(self).__name__}."
+            )
+        return [getattr(self.model, name) for name in fields]
+
+    def _apply_filters(
+        self, stmt: Select, filters: Optional[Mapping[str, Any]]
+    ) -> Select:
+        """Add a WHERE criterion for every supplied filter."""
+
+        clauses = self._filter_clauses(filters)
+        return stmt.where(*clauses) if clauses else stmt
+
+    def _filter_clauses(self, filters: Optional[Mapping[str, Any]]) -> list[Any]:
+        """Translate ``filters`` into SQL criteria via :attr:`filter_criteria`."""
+
+        clauses = []
+        for name, value in (filters or {}).items():
+            try:
+                criterion = self.filter_criteria[name]
+            except KeyError as exc:
+                raise ValueError(
+                    f"Unknown filter '{name}' for {type(self).__name__}."
+                ) from exc
+            clauses.append(criterion(value))
+        return clauses
+
+    def _apply_sort(self, stmt: Select, sort: Optional[str]) -> Select:
+        """Order ``stmt`` by ``sort`` or by the repository's default ordering."""
+
+        if sort is None:
+            ordering = tuple(self.default_ordering or self._derive_ordering())
+            return stmt.order_by(*ordering) if ordering else stmt
+
+        descending = sort.startswith("-")
+        name = sort.lstrip("-")
+        if name not in self.sortable_fields:
+            raise ValueError(f"Unknown sort field '{name}' for {type(self).__name__}.")
+
+        key_column = self._keyset_column()
+        columns = [getattr(self.model, name)]
+        if columns[0].key != key_column.key:
+            columns.append(key_column)
+        return stmt.order_by(
+            *(column.desc() if descending else column for column in columns)
+        )
 
     def _coerce_entity(self, data: Union[Dict[str, Any], ModelT]) -> ModelT:
         """Normalise payloads passed to create()."""
@@ -73,29 +424,151 @@ class BaseRepository(Generic[ModelT]):
         return self.model(**data)  # type: ignore[arg-type]
 
     def _paginate(
-        self, stmt: Select, *, page: int, per_page: int
+        self,
+        stmt: Select,
+        *,
+        page: int,
+        per_page: int,
+        cursor: Optional[Cursor] = None,
+        total: str = TOTAL_EXACT,
+        estimate: Optional[Callable[[], int]] = None,
+        keyset: bool = True,
     ) -> Tuple[list[ModelT], dict]:
-        """Execute a select statement with pagination metadata."""
+        """Execute a select statement with pagination metadata.
+
+        With a ``cursor`` the page is fetched by keyset on the repository's
+        ordering key and no count is run; otherwise classic page/offset
+        pagination is used. ``total`` selects how the offset page is counted:
+        ``exact`` runs ``COUNT(*)``, ``estimate`` reuses a recently cached count
+        and ``none`` skips counting and probes one extra row for ``has_next``.
+        Callers holding a maintained counter pass it as ``estimate``, and pass
+        ``keyset=False`` when ``stmt`` is not ordered by the keyset column.
+        """
+
+        if cursor is not None:
+            if not keyset:
+                raise ValueError("Cursor pagination requires the default ordering.")
+            return self._paginate_keyset(stmt, per_page=per_page, cursor=cursor)
+
+        offset = (page - 1) * per_page
+        if total == TOTAL_NONE:
+            rows = list(
+                self.session.execute(stmt.limit(per_page + 1).offset(offset))
+                .scalars()
+                .all()
+            )
+            items = rows[:per_page]
+            meta = {
+                "page": page,
+                "per_page": per_page,
+                "has_next": len(rows) > per_page,
+                "has_prev": page > 1,
+            }
+        else:
+            if total == TOTAL_ESTIMATE and estimate is not None:
+                count = estimate()
+            else:
+                count = self._count(stmt, estimate=total == TOTAL_ESTIMATE)
+            items = list(
+                self.session.execute(stmt.limit(per_page).offset(offset))
+                .scalars()
+                .all()
+            )
+            pages = math.ceil(count / per_page) if per_page else 0
+            meta = {
+                "page": page,
+                "per_page": per_page,
+                "total": count,
+                "pages": pages,
+                "has_next": page < pages,
+                "has_prev": page > 1 and count > 0,
+            }
+            if total == TOTAL_ESTIMATE:
+                meta["total_estimated"] = True
+
+        if keyset:
+            meta.update(
+                self._cursor_meta(
+                    items, has_next=meta["has_next"], has_prev=meta["has_prev"]
+                )
+            )
+        return items, meta
+
+    def _count(self, stmt: Select, *, estimate: bool = False) -> int:
+        """Count the rows ``stmt`` matches, from the count cache if ``estimate``."""
 
         count_subquery = stmt.order_by(None).subquery()
         total_stmt = select(func.count()).select_from(count_subquery)
-        total = self.session.execute(total_stmt).scalar_one()
-        offset = (page - 1) * per_page
+        if not estimate:
+            return self.session.execute(total_stmt).scalar_one()
 
-        items = (
-            self.session.execute(stmt.limit(per_page).offset(offset)).scalars().all()
-        )
+        compiled = total_stmt.compile()
+        key = (str(compiled), tuple(sorted(compiled.params.items())))
+        table = self.model.__tablename__
+        cache = get_count_cache()
+        count = cache.get(table, key)
+        if count is None:
+            count = self.session.execute(total_stmt).scalar_one()
+            cache.set(table, key, count)
+        return count
+
+    def _invalidate_counts(self) -> None:
+        """Drop cached totals for the tables a write may have changed."""
+
+        cache = get_count_cache()
+        for table in (self.model.__tablename__, *self.dependent_tables):
+            cache.invalidate(table)
 
-        pages = math.ceil(total / per_page) if per_page else 0
-        meta = {
-            "page": page,
-            "per_page": per_page,
-            "total": total,
-            "pages": pages,
-            "has_next": page < pages,
-            "has_prev": page > 1 and total > 0,
+    def _paginate_keyset(
+        self, stmt: Select, *, per_page: int, cursor: Cursor
+    ) -> Tuple[list[ModelT], dict]:
+        """Fetch the page after/before ``cursor`` using a range scan on the key."""
+
+        key_column = self._keyset_column()
+        boundary = cursor.key[0]
+        stmt = stmt.order_by(None)
+        if cursor.direction == PREV:
+            stmt = stmt.where(key_column < boundary).order_by(key_column.desc())
+        else:
+            stmt = stmt.where(key_column > boundary).order_by(key_column)
+
+        rows = list(self.session.execute(stmt.limit(per_page + 1)).scalars().all())
+        has_more = len(rows) > per_page
+        items = rows[:per_page]
+        if cursor.direction == PREV:
+            items.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, True
+
+        meta = {"per_page": per_page, "has_next": has_next, "has_prev": has_prev}
+        meta.update(self._cursor_meta(items, has_next=has_next, has_prev=has_prev))
+        return items, meta
+
+    def _cursor_meta(
+        self, items: list[ModelT], *, has_next: bool, has_prev: bool
+    ) -> Dict[str, Optional[str]]:
+        """Return opaque cursors pointing past either end of ``items``."""
+
+        if not items:
+            return {"next_cursor": None, "prev_cursor": None}
+
+        key_name = self._keyset_column().key
+        first, last = getattr(items[0], key_name), getattr(items[-1], key_name)
+        return {
+            "next_cursor": encode_cursor(Cursor((last,), NEXT)) if has_next else None,
+            "prev_cursor": encode_cursor(Cursor((first,), PREV)) if has_prev else None,
         }
-        return list(items), meta
+
+    def _keyset_column(self) -> Any:
+        """Return the unique, ordered column keyset pagination pages on."""
+
+        ordering = tuple(self.default_ordering or self._derive_ordering())
+        if not ordering:
+            raise ValueError(
+                f"{type(self).__name__} has no ordering key for keyset pagination."
+            )
+        return ordering[0]
 
     def _derive_ordering(self) -> Tuple[Any, ...]:
         """Attempt to derive a sensible default ordering for list()."""
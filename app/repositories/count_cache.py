@@ -0,0 +1,61 @@
+"""Short-lived cache of list totals, invalidated by repository writes."""
+
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from typing import Dict, Hashable, Optional
+
+from flask import current_app
+
+from ..cache import LRUCache, app_cache
+
+
+class CountCache:
+    """Caches ``COUNT(*)`` results per table for a short TTL.
+
+    Each table has a generation number that is part of every key; writes bump
+    the generation so stale totals are never served, and the orphaned entries
+    simply age out of the LRU.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 30.0) -> None:
+        self._entries: LRUCache[Hashable, int] = LRUCache(maxsize, ttl=ttl)
+        self._generations: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def get(self, table: str, key: Hashable) -> Optional[int]:
+        """Return a cached total for ``key`` on ``table`` if still valid."""
+
+        return self._entries.get((table, self._generations[table], key))
+
+    def set(self, table: str, key: Hashable, total: int) -> None:
+        """Remember ``total`` for ``key`` on ``table``."""
+
+        self._entries.set((table, self._generations[table], key), total)
+
+    def invalidate(self, table: str) -> None:
+        """Discard every cached total for ``table``."""
+
+        with self._lock:
+            self._generations[table] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for the cache."""
+
+        return self._entries.stats()
+
+
+def get_count_cache() -> CountCache:
+    """Return the count cache bound to the current app."""
+
+    return app_cache(
+        "count_cache",
+        lambda: CountCache(
+            current_app.config.get("COUNT_CACHE_SIZE", 1024),
+            current_app.config.get("COUNT_CACHE_TTL", 30) or None,
+        ),
+    )
+
+
+__all__ = ["CountCache", "get_count_cache"]
@@ -0,0 +1,178 @@
+"""Cross-request cache of committed row snapshots for ``get_by_id``."""
+
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, Mapping, Optional, Set, Tuple
+
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from ..cache import LRUCache, app_cache
+
+_DIRTY_KEYS = "identity_cache_keys"
+_DIRTY_TABLES = "identity_cache_tables"
+_SESSION_LISTENERS_REGISTERED = False
+
+Snapshot = Mapping[str, Any]
+
+
+class IdentityCache:
+    """LRU of column snapshots keyed by table and primary key identity.
+
+    Snapshots are read-only mappings of every column value as committed.
+    Single rows are discarded when flushed; bulk ``UPDATE``/``DELETE``
+    statements bump their table's generation (part of every key) instead, as
+    the rows they touch are unknown. Both also advance the table's
+    :meth:`write_count`, so a snapshot loaded before a concurrent write is not
+    stored after that write dropped it. The TTL bounds staleness from writes
+    made by other processes.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float]) -> None:
+        self._entries: LRUCache[Hashable, Snapshot] = LRUCache(maxsize, ttl=ttl)
+        self._generations: Dict[str, int] = defaultdict(int)
+        self._writes: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def get(self, table: str, identity: Tuple[Any, ...]) -> Optional[Snapshot]:
+        """Return the snapshot of ``identity`` in ``table`` if cached."""
+
+        return self._entries.get((table, self._generations[table], identity))
+
+    def write_count(self, table: str) -> int:
+        """Return a counter that advances whenever ``table`` snapshots are dropped."""
+
+        return self._writes[table]
+
+    def set(
+        self,
+        table: str,
+        identity: Tuple[Any, ...],
+        values: Dict[str, Any],
+        *,
+        since: Optional[int] = None,
+    ) -> bool:
+        """Remember committed column ``values`` for ``identity`` in ``table``.
+
+        ``since`` is the :meth:`write_count` read before ``values`` were
+        loaded; if a snapshot of the table was dropped in the meantime the
+        values may predate that write and are not stored. Returns whether
+        they were.
+        """
+
+        with self._lock:
+            if since is not None and self._writes[table] != since:
+                return False
+            self._entries.set(
+                (table, self._generations[table], identity), MappingProxyType(values)
+            )
+            return True
+
+    def discard(self, table: str, identity: Tuple[Any, ...]) -> None:
+        """Forget the snapshot of one row."""
+
+        with self._lock:
+            self._writes[table] += 1
+            self._entries.pop((table, self._generations[table], identity))
+
+    def invalidate(self, table: str) -> None:
+        """Forget every snapshot of ``table``."""
+
+        with self._lock:
+            self._generations[table] += 1
+            self._writes[table] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for the cache."""
+
+        return self._entries.stats()
+
+
+def get_identity_cache() -> Optional[IdentityCache]:
+    """Return the identity cache bound to the current app, or ``None`` if off."""
+
+    maxsize = current_app.config.get("IDENTITY_CACHE_SIZE", 0)
+    if not maxsize:
+        return None
+    return app_cache(
+        "identity_cache",
+        lambda: IdentityCache(
+            maxsize, current_app.config.get("IDENTITY_CACHE_TTL", 30) or None
+        ),
+    )
+
+
+def is_dirty(session: Session, table: str, identity: Tuple[Any, ...]) -> bool:
+    """Return whether the session's transaction has written the row.
+
+    Such rows may hold uncommitted values and must not be snapshotted.
+    """
+
+    return table in session.info.get(_DIRTY_TABLES, ()) or (
+        (table, identity) in session.info.get(_DIRTY_KEYS, ())
+    )
+
+
+def _forget(session: Session, keys: Set[Tuple[str, Any]], tables: Set[str]) -> None:
+    if not has_app_context():
+        return
+    cache = get_identity_cache()
+    if cache is None:
+        return
+    for table, identity in keys:
+        cache.discard(table, identity)
+    for table in tables:
+        cache.invalidate(table)
+
+
+def _record_flush(session: Session, flush_context: object) -> None:
+    keys = session.info.setdefault(_DIRTY_KEYS, set())
+    flushed = set()
+    for instance in (*session.dirty, *session.deleted):
+        state = inspect(instance)
+        if state.identity is not None:
+            flushed.add((state.mapper.local_table.name, state.identity))
+    keys.update(flushed)
+    _forget(session, flushed, set())
+
+
+def _record_statement(state: ORMExecuteState) -> None:
+    if state.is_update or state.is_delete:
+        table = state.statement.table.name
+        state.session.info.setdefault(_DIRTY_TABLES, set()).add(table)
+        _forget(state.session, set(), {table})
+
+
+def _forget_committed(session: Session) -> None:
+    # Other requests may have cached the old row between flush and commit.
+    _forget(
+        session,
+        session.info.pop(_DIRTY_KEYS, set()),
+        session.info.pop(_DIRTY_TABLES, set()),
+    )
+
+
+def _discard_dirty(session: Session) -> None:
+    session.info.pop(_DIRTY_KEYS, None)
+    session.info.pop(_DIRTY_TABLES, None)
+
+
+def init_identity_cache(app: Flask) -> None:
+    """Start invalidating identity snapshots on flushes and bulk statements."""
+
+    global _SESSION_LISTENERS_REGISTERED
+
+    if _SESSION_LISTENERS_REGISTERED:
+        return
+    event.listen(Session, "after_flush", _record_flush)
+    event.listen(Session, "do_orm_execute", _record_statement)
+    event.listen(Session, "after_commit", _forget_committed)
+    event.listen(Session, "after_rollback", _discard_dirty)
+    _SESSION_LISTENERS_REGISTERED = True
+
+
+__all__ = ["IdentityCache", "get_identity_cache", "init_identity_cache", "is_dirty"]
@@ -0,0 +1,74 @@
+"""Opaque cursors and total-count modes for pagination."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Tuple
+
+NEXT = "next"
+PREV = "prev"
+
+TOTAL_EXACT = "exact"
+TOTAL_ESTIMATE = "estimate"
+TOTAL_NONE = "none"
+TOTAL_MODES = (TOTAL_EXACT, TOTAL_ESTIMATE, TOTAL_NONE)
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Position in a keyset-ordered listing.
+
+    ``key`` holds the ordering-key values of the boundary row; ``direction``
+    says whether the page continues after it (``next``) or before it (``prev``).
+    """
+
+    key: Tuple[Any, ...]
+    direction: str = NEXT
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Serialise a cursor into an opaque URL-safe token."""
+
+    raw = json.dumps({"k": list(cursor.key), "d": cursor.direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Parse a token produced by :func:`encode_cursor`.
+
+    Raises ``ValueError`` for anything that is not a well-formed cursor.
+    """
+
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Malformed cursor.") from exc
+
+    if not isinstance(data, dict):
+        raise ValueError("Malformed cursor.")
+    key, direction = data.get("k"), data.get("d")
+    if direction not in (NEXT, PREV) or not isinstance(key, list) or not key:
+        raise ValueError("Malformed cursor.")
+    if not all(
+        isinstance(value, (int, float, str)) and not isinstance(value, bool)
+        for value in key
+    ):
+        raise ValueError("Malformed cursor.")
+    return Cursor(key=tuple(key), direction=direction)
+
+
+__all__ = [
+    "Cursor",
+    "NEXT",
+    "PREV",
+    "TOTAL_ESTIMATE",
+    "TOTAL_EXACT",
+    "TOTAL_MODES",
+    "TOTAL_NONE",
+    "decode_cursor",
+    "encode_cursor",
+]
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
-from sqlalchemy import select
+from typing import Iterable, Optional
 
-from ..models import Project
+from sqlalchemy import Update, func, select, update
+from sqlalchemy.orm import joinedload, load_only, selectinload
+
+from ..models import TASK_STATUS_COUNTERS, Project, Task
 from .base import BaseRepository
+from .pagination import TOTAL_EXACT, Cursor
 
 
 class ProjectRepository(BaseRepository[Project]):
@@ -13,16 +17,74 @@ class ProjectRepository(BaseRepository[Project]):
 
     model = Project
     default_ordering = (Project.id,)
+    dependent_tables = ("tasks",)
+    filter_criteria = {
+        "created_by": lambda value: Project.created_by == value,
+        "updated_since": lambda value: Project.updated_at >= value,
+    }
+    sortable_fields = ("id", "name", "updated_at")
+    loading_profiles = {
+        **BaseRepository.loading_profiles,
+        "reference": (load_only(Project.id),),
+        "with_creator": (joinedload(Project.created_by_user),),
+        "with_tasks": (selectinload(Project.tasks),),
+    }
 
-    def list_by_creator(self, created_by: int, *, page: int, per_page: int):
+    def list_by_creator(
+        self,
+        created_by: int,
+        *,
+        page: int,
+        per_page: int,
+        cursor: Optional[Cursor] = None,
+        total: str = TOTAL_EXACT,
+        profile: str = "list",
+    ):
         """Return projects filtered by creator."""
 
         stmt = (
             select(Project)
+            .options(*self._loader_options(profile))
             .where(Project.created_by == created_by)
             .order_by(Project.id)
         )
-        return self._paginate(stmt, page=page, per_page=per_page)
+        return self._paginate(
+            stmt, page=page, per_page=per_page, cursor=cursor, total=total
+        )
+
+    def recount_tasks(self, project_ids: Optional[Iterable[int]] = None) -> int:
+        """Rebuild the denormalised task counters in one set-based UPDATE.
+
+        Only the given projects are recounted when ``project_ids`` is supplied.
+        Returns the number of projects updated.
+        """
+
+        result = self.session.execute(
+            recount_tasks_statement(project_ids),
+            execution_options={"synchronize_session": False},
+        )
+        self._commit()
+        return result.rowcount
+
+
+def recount_tasks_statement(project_ids: Optional[Iterable[int]] = None) -> Update:
+    """Return an UPDATE recomputing project task counters from the tasks table."""
+
+    def _task_count(*criteria):
+        return (
+            select(func.count(Task.id))
+            .where(Task.project_id == Project.id, *criteria)
+            .scalar_subquery()
+        )
+
+    values = {"task_count": _task_count()}
+    for status, column in TASK_STATUS_COUNTERS.items():
+        values[column] = _task_count(Task.status == status)
+
+    stmt = update(Project).values(**values)
+    if project_ids is not None:
+        stmt = stmt.where(Project.id.in_(list(project_ids)))
+    return stmt
 
 
-__all__ = ["ProjectRepository"]
+__all__ = ["ProjectRepository", "recount_tasks_statement"]
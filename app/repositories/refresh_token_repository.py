@@ -0,0 +1,61 @@
+"""Refresh token repository implementation."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select, update
+
+from ..models import RefreshToken
+from .base import BaseRepository
+
+
+class RefreshTokenRepository(BaseRepository[RefreshToken]):
+    """Persistence logic for RefreshToken entities."""
+
+    model = RefreshToken
+    default_ordering = (RefreshToken.id,)
+
+    def get_active_user_id(self, token_hash: str, now: datetime) -> Optional[int]:
+        """Return the owner of an unexpired, unrevoked token via the hash index."""
+
+        stmt = select(RefreshToken.user_id).where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > now,
+        )
+        return self.session.execute(stmt).scalar_one_or_none()
+
+    def revoke(self, token_hash: str, now: datetime) -> bool:
+        """Revoke a single token, returning whether it was active."""
+
+        stmt = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked_at.is_(None),
+            )
+            .values(revoked_at=now)
+        )
+        result = self.session.execute(stmt)
+        self._commit()
+        return bool(result.rowcount)
+
+    def revoke_for_user(self, user_id: int, now: datetime) -> int:
+        """Revoke every active token belonging to ``user_id``."""
+
+        stmt = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.user_id == user_id,
+                RefreshToken.revoked_at.is_(None),
+            )
+            .values(revoked_at=now)
+        )
+        result = self.session.execute(stmt)
+        self._commit()
+        return result.rowcount
+
+
+__all__ = ["RefreshTokenRepository"]
@@ -0,0 +1,173 @@
+"""Full-text search over projects and tasks."""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, Integer, String, and_, column, literal, or_, select
+from sqlalchemy import func, text, tuple_, union_all
+from sqlalchemy.orm import Session
+
+from ..cache import app_cache
+from ..models import SEARCH_TABLE, Project, Task, search_index_exists
+from .pagination import NEXT, PREV, Cursor, encode_cursor
+
+SNIPPET_OPEN = "["
+SNIPPET_CLOSE = "]"
+SNIPPET_TOKENS = 16
+FALLBACK_SNIPPET_CHARS = 120
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(query: str) -> List[str]:
+    """Split a free-text query into word terms, dropping FTS operators."""
+
+    return _TERM_PATTERN.findall(query)
+
+
+class SearchRepository:
+    """Ranks projects and tasks matching a query.
+
+    Uses the ``search_index`` FTS5 table (bm25-ranked, with snippets) when it
+    is installed and falls back to ``LIKE`` scans otherwise. Both backends
+    produce the same columns so pagination is shared: results are keyset
+    paginated on ``(rank, doc_id)``.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    @property
+    def backend(self) -> str:
+        """Return ``"fts5"`` or ``"like"`` depending on the installed schema."""
+
+        return app_cache(
+            "search_backend",
+            lambda: "fts5" if search_index_exists(self.session.connection()) else "like",
+        )
+
+    def search(
+        self, query: str, *, per_page: int, cursor: Optional[Cursor] = None
+    ) -> Tuple[List[Dict[str, Any]], dict]:
+        """Return one page of hits for ``query`` with cursor metadata."""
+
+        terms = search_terms(query)
+        backend = self.backend
+        meta: Dict[str, Any] = {"per_page": per_page, "backend": backend}
+        if not terms:
+            meta.update(
+                has_next=False, has_prev=False, next_cursor=None, prev_cursor=None
+            )
+            return [], meta
+
+        hits = (
+            self._fts_hits(terms) if backend == "fts5" else self._like_hits(terms)
+        ).subquery("hits")
+        key = tuple_(hits.c.rank, hits.c.doc_id)
+        stmt = select(hits)
+        if cursor is not None and cursor.direction == PREV:
+            stmt = stmt.where(key < tuple_(*cursor.key)).order_by(
+                hits.c.rank.desc(), hits.c.doc_id.desc()
+            )
+        else:
+            if cursor is not None:
+                stmt = stmt.where(key > tuple_(*cursor.key))
+            stmt = stmt.order_by(hits.c.rank, hits.c.doc_id)
+
+        rows = self.session.execute(stmt.limit(per_page + 1)).mappings().all()
+        has_more = len(rows) > per_page
+        rows = list(rows[:per_page])
+        if cursor is not None and cursor.direction == PREV:
+            rows.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, cursor is not None
+
+        meta.update(has_next=has_next, has_prev=has_prev)
+        meta["next_cursor"] = (
+            encode_cursor(Cursor((rows[-1]["rank"], rows[-1]["doc_id"]), NEXT))
+            if rows and has_next
+            else None
+        )
+        meta["prev_cursor"] = (
+            encode_cursor(Cursor((rows[0]["rank"], rows[0]["doc_id"]), PREV))
+            if rows and has_prev
+            else None
+        )
+        return [dict(row) for row in rows], meta
+
+    def _fts_hits(self, terms: List[str]):
+        """Select bm25-ranked matches from the FTS table (title weighted 10x)."""
+
+        match = " ".join(f'"{term}"' for term in terms[:-1])
+        match = f'{match} "{terms[-1]}"*'.strip()
+        return (
+            text(
+                f"""
+                SELECT rowid AS doc_id, kind, ref_id, project_id, title,
+                       snippet({SEARCH_TABLE}, -1, :open, :close, '…', :tokens)
+                           AS snippet,
+                       bm25({SEARCH_TABLE}, 0, 0, 0, 10.0, 1.0) AS rank
+                FROM {SEARCH_TABLE}
+                WHERE {SEARCH_TABLE} MATCH :match
+                """
+            )
+            .bindparams(
+                match=match,
+                open=SNIPPET_OPEN,
+                close=SNIPPET_CLOSE,
+                tokens=SNIPPET_TOKENS,
+            )
+            .columns(
+                column("doc_id", Integer),
+                column("kind", String),
+                column("ref_id", Integer),
+                column("project_id", Integer),
+                column("title", String),
+                column("snippet", String),
+                column("rank", Float),
+            )
+        )
+
+    def _like_hits(self, terms: List[str]):
+        """Select unranked substring matches when FTS5 is unavailable."""
+
+        def _matches(title, body):
+            return and_(
+                *(
+                    or_(
+                        title.icontains(term, autoescape=True),
+                        body.icontains(term, autoescape=True),
+                    )
+                    for term in terms
+                )
+            )
+
+        def _snippet(title, body):
+            return func.substr(
+                func.coalesce(body, title), 1, FALLBACK_SNIPPET_CHARS
+            )
+
+        projects = select(
+            (Project.id * 2).label("doc_id"),
+            literal("project").label("kind"),
+            Project.id.label("ref_id"),
+            Project.id.label("project_id"),
+            Project.name.label("title"),
+            _snippet(Project.name, Project.description).label("snippet"),
+            literal(0.0).label("rank"),
+        ).where(_matches(Project.name, Project.description))
+        tasks = select(
+            (Task.id * 2 + 1).label("doc_id"),
+            literal("task").label("kind"),
+            Task.id.label("ref_id"),
+            Task.project_id.label("project_id"),
+            Task.title.label("title"),
+            _snippet(Task.title, Task.description).label("snippet"),
+            literal(0.0).label("rank"),
+        ).where(_matches(Task.title, Task.description))
+        return union_all(projects, tasks)
+
+
+__all__ = ["SearchRepository", "search_terms"]
@@ -2,11 +2,31 @@
 
 from __future__ import annotations
 
-from sqlalchemy import select
+from collections import Counter
+from datetime import UTC, datetime
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import joinedload
 
-from ..models import Task
+from ..models import TASK_STATUS_COUNTERS, Project, Task, TaskStatus
 from .base import BaseRepository
+from .pagination import TOTAL_EXACT, Cursor
+from .project_repository import recount_tasks_statement
 
 
 class TaskRepository(BaseRepository[Task]):
@@ -14,23 +34,278 @@ class TaskRepository(BaseRepository[Task]):
 
     model = Task
     default_ordering = (Task.id,)
+    dependent_tables = ("projects",)
+    filter_criteria = {
+        "status": lambda value: Task.status == value,
+        "assigned_to": lambda value: Task.assigned_to == value,
+        "due_before": lambda value: Task.due_date < value,
+        "due_after": lambda value: Task.due_date > value,
+        "updated_since": lambda value: Task.updated_at >= value,
+    }
+    sortable_fields = ("id", "due_date", "updated_at")
+    loading_profiles = {
+        **BaseRepository.loading_profiles,
+        "with_assignee": (joinedload(Task.assignee),),
+        "with_project": (joinedload(Task.project),),
+    }
+
+    def create(self, data: Union[Dict[str, Any], Task]) -> Task:
+        """Persist a task and count it against its project."""
+
+        task = self._coerce_entity(data)
+        self._shift_counters(task.project_id, None, task.status or TaskStatus.TODO)
+        return super().create(task)
+
+    def create_many(
+        self, project_id: int, rows: Sequence[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Insert tasks for one project with a single executemany and commit.
+
+        Counters move by the batch's per-status totals in one UPDATE. The
+        inserted rows come back via ``RETURNING`` as column dicts, in input
+        order, so serialising them needs no further queries.
+        """
+
+        if not rows:
+            return []
+
+        params = [{**row, "project_id": project_id} for row in rows]
+        statuses = Counter(row.get("status") or TaskStatus.TODO for row in params)
+        deltas = {"task_count": len(params)}
+        deltas.update(
+            {TASK_STATUS_COUNTERS[status]: n for status, n in statuses.items()}
+        )
+        self._adjust_counters(project_id, deltas)
+
+        # sort_by_parameter_order would make SQLite fall back to one INSERT per
+        # row; ids are assigned in VALUES order, so sorting by id restores it.
+        result = self.session.execute(
+            insert(Task).returning(*Task.__table__.columns), params
+        )
+        created = sorted((dict(row._mapping) for row in result), key=lambda t: t["id"])
+        self._commit()
+        self._invalidate_counts()
+        return created
+
+    def update_by_ids(
+        self,
+        project_id: int,
+        changesets: Sequence[Tuple[Mapping[str, Any], Collection[int]]],
+    ) -> List[int]:
+        """Apply each change set to its task ids with one UPDATE per change set.
+
+        Everything runs in one transaction: if any id does not belong to the
+        project nothing is changed and :class:`NoResultFound` is raised.
+        Returns the updated ids.
+        """
+
+        updated: List[int] = []
+        requested: set[int] = set()
+        for changes, ids in changesets:
+            requested.update(ids)
+            updated.extend(
+                self._bulk_update(project_id, changes, Task.id.in_(list(ids)))
+            )
+
+        missing = requested.difference(updated)
+        if missing:
+            self.session.rollback()
+            raise NoResultFound(
+                f"Tasks {sorted(missing)} not found for project '{project_id}'."
+            )
+        self._finish_bulk_update(project_id)
+        return sorted(set(updated))
+
+    def update_matching(
+        self,
+        project_id: int,
+        changes: Mapping[str, Any],
+        filters: Mapping[str, Any],
+    ) -> List[int]:
+        """Apply ``changes`` to every project task matching ``filters``."""
+
+        updated = self._bulk_update(
+            project_id, changes, *self._filter_clauses(filters)
+        )
+        self._finish_bulk_update(project_id)
+        return sorted(updated)
+
+    def _bulk_update(
+        self, project_id: int, changes: Mapping[str, Any], *criteria: Any
+    ) -> List[int]:
+        """Run a set-based UPDATE stamping ``updated_at``; returns affected ids."""
+
+        stmt = (
+            update(Task)
+            .where(Task.project_id == project_id, *criteria)
+            .values({**changes, "updated_at": datetime.now(UTC)})
+            .returning(Task.id)
+        )
+        result = self.session.execute(
+            stmt, execution_options={"synchronize_session": False}
+        )
+        return list(result.scalars().all())
+
+    def _finish_bulk_update(self, project_id: int) -> None:
+        """Recount the project's status counters and commit the bulk update."""
+
+        self.session.execute(
+            recount_tasks_statement([project_id]),
+            execution_options={"synchronize_session": False},
+        )
+        self._commit()
+        self._invalidate_counts()
+
+    def update(self, task: Task, data: Dict[str, Any]) -> Task:
+        """Update a task, moving it between its project's status counters."""
+
+        status = data.get("status", task.status)
+        if status != task.status:
+            self._shift_counters(task.project_id, task.status, status)
+        return super().update(task, data)
+
+    def delete(self, entity_id: int) -> None:
+        """Delete a task and uncount it from its project."""
+
+        # Read uncached: a stale identity snapshot would uncount the wrong status.
+        row = self.session.execute(
+            select(Task.project_id, Task.status).where(Task.id == entity_id)
+        ).one_or_none()
+        if row is None:
+            raise NoResultFound(f"Task with id '{entity_id}' was not found.")
+        self._shift_counters(row.project_id, row.status, None)
+        super().delete(entity_id)
+
+    def _shift_counters(
+        self, project_id: int, old_status: Optional[str], new_status: Optional[str]
+    ) -> None:
+        """Move one task between status counters in the surrounding transaction.
+
+        ``None`` on either side means the task is being added or removed, which
+        also adjusts ``task_count``. The statement runs before the caller's
+        commit so counters and tasks change atomically.
+        """
+
+        deltas: Dict[str, int] = {}
+        if old_status is None:
+            deltas["task_count"] = 1
+        else:
+            deltas[TASK_STATUS_COUNTERS[old_status]] = -1
+        if new_status is None:
+            deltas["task_count"] = -1
+        else:
+            deltas[TASK_STATUS_COUNTERS[new_status]] = 1
+        self._adjust_counters(project_id, deltas)
+
+    def _adjust_counters(self, project_id: int, deltas: Mapping[str, int]) -> None:
+        """Add ``deltas`` to the named project counter columns."""
+
+        values = {
+            column: getattr(Project, column) + delta for column, delta in deltas.items()
+        }
+        self.session.execute(
+            update(Project).where(Project.id == project_id).values(**values),
+            execution_options={"synchronize_session": False},
+        )
+
+    def project_change_stamp(
+        self, project_id: int
+    ) -> Optional[Tuple[int, Optional[datetime]]]:
+        """Return the :meth:`change_stamp` of a project's tasks.
+
+        The project's own ``updated_at`` counts too: its counters move with
+        every task write, so task deletes also advance the timestamp. Returns
+        ``None`` when the project does not exist.
+        """
+
+        stmt = (
+            select(func.count(Task.id), func.max(Task.updated_at), Project.updated_at)
+            .select_from(Project)
+            .outerjoin(Task, Task.project_id == Project.id)
+            .where(Project.id == project_id)
+            .group_by(Project.id)
+        )
+        row = self.session.execute(stmt).one_or_none()
+        if row is None:
+            return None
+        count, tasks_modified, project_modified = row
+        return count, max(filter(None, (tasks_modified, project_modified)))
 
     def list_by_project(
-        self, project_id: int, *, page: int, per_page: int
+        self,
+        project_id: int,
+        *,
+        page: int,
+        per_page: int,
+        cursor: Optional[Cursor] = None,
+        total: str = TOTAL_EXACT,
+        filters: Optional[Mapping[str, Any]] = None,
+        sort: Optional[str] = None,
+        profile: str = "list",
+        fields: Optional[Iterable[str]] = None,
     ):
-        """Return tasks for a project."""
+        """Return tasks for a project.
+
+        ``total="estimate"`` reads the project's maintained counters when the
+        listing is unfiltered or filtered by status alone.
+        """
 
         stmt = (
             select(Task)
+            .options(*self._loader_options(profile, fields))
             .where(Task.project_id == project_id)
-            .order_by(Task.id)
         )
-        return self._paginate(stmt, page=page, per_page=per_page)
+        stmt = self._apply_sort(self._apply_filters(stmt, filters), sort)
+        return self._paginate(
+            stmt,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            total=total,
+            estimate=self._counter_estimate(project_id, filters or {}),
+            keyset=sort in (None, "id"),
+        )
+
+    def iter_by_project(
+        self,
+        project_id: int,
+        *,
+        filters: Optional[Mapping[str, Any]] = None,
+        after_id: Optional[int] = None,
+        batch_size: int = 1000,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream a project's tasks as column dicts in id order."""
+
+        return self.iter_rows(
+            Task.project_id == project_id,
+            filters=filters,
+            after_id=after_id,
+            batch_size=batch_size,
+            fields=fields,
+        )
+
+    def _counter_estimate(
+        self, project_id: int, filters: Mapping[str, Any]
+    ) -> Optional[Callable[[], int]]:
+        """Return a reader for the project counter matching ``filters``, if any."""
+
+        if not filters:
+            column = Project.task_count
+        elif set(filters) == {"status"}:
+            column = getattr(Project, TASK_STATUS_COUNTERS[filters["status"]])
+        else:
+            return None
+
+        stmt = select(column).where(Project.id == project_id)
+        return lambda: self.session.execute(stmt).scalar_one()
 
-    def get_by_project_and_id(self, project_id: int, task_id: int) -> Task:
+    def get_by_project_and_id(
+        self, project_id: int, task_id: int, *, profile: str = "detail"
+    ) -> Task:
         """Return a task ensuring it belongs to the given project."""
 
-        stmt = select(Task).where(
+        stmt = select(Task).options(*self._loader_options(profile)).where(
             Task.id == task_id,
             Task.project_id == project_id,
         )
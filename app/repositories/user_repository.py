@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Dict, Iterable, Mapping, Sequence
 
-from sqlalchemy import select
-from sqlalchemy.exc import NoResultFound
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError, NoResultFound
+from sqlalchemy.orm import load_only, selectinload
 
 from ..models import User
 from .base import BaseRepository
@@ -16,15 +17,57 @@ class UserRepository(BaseRepository[User]):
 
     model = User
     default_ordering = (User.id,)
+    dependent_tables = ("projects", "tasks", "refresh_tokens")
+    loading_profiles = {
+        **BaseRepository.loading_profiles,
+        "reference": (load_only(User.id),),
+        "credentials": (load_only(User.id, User.role, User.password_hash),),
+        "with_projects": (selectinload(User.created_projects),),
+        "with_tasks": (selectinload(User.assigned_tasks),),
+    }
 
-    def get_by_email(self, email: str) -> User:
+    def get_by_email(self, email: str, *, profile: str = "detail") -> User:
         """Return a user matching the supplied email address."""
 
-        stmt = select(User).where(User.email == email)
+        stmt = select(User).options(*self._loader_options(profile)).where(
+            User.email == email
+        )
         user = self.session.execute(stmt).scalar_one_or_none()
         if user is None:
             raise NoResultFound(f"User with email '{email}' was not found.")
         return user
 
+    def existing_emails(self, emails: Iterable[str]) -> set[str]:
+        """Return which of ``emails`` are already registered (one ``IN`` query)."""
+
+        wanted = set(emails)
+        if not wanted:
+            return set()
+        stmt = select(User.email).where(User.email.in_(wanted))
+        return set(self.session.execute(stmt).scalars().all())
+
+    def create_many(self, rows: Sequence[Mapping[str, Any]]) -> Dict[str, int]:
+        """Insert users with one executemany in a single transaction.
+
+        ``rows`` must already carry ``password_hash``. Returns new ids keyed by
+        email; an :class:`IntegrityError` rolls the whole chunk back.
+        """
+
+        if not rows:
+            return {}
+        try:
+            result = self.session.execute(
+                insert(User).returning(User.email, User.id), list(rows)
+            )
+            created = {email: user_id for email, user_id in result}
+        except IntegrityError:
+            # Rows inserted before the failing one must not ride along with
+            # the next commit.
+            self.session.rollback()
+            raise
+        self._commit()
+        self._invalidate_counts()
+        return created
+
 
 __all__ = ["UserRepository"]
@@ -0,0 +1,279 @@
+"""Versioned cache of rendered GET responses.
+
+Entries are keyed by the caller (see :func:`app.routes.common.cached_response`)
+together with the current version of every table the response reads. Session
+events record which tables each transaction writes and bump their versions
+once it commits, so a cached response is never served after a change to its
+tables; superseded entries are simply never looked up again and age out.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple, Union
+
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from .cache import LRUCache, app_cache
+
+RESPONSE_CACHE_BACKENDS = ("memory", "sqlite", "none")
+
+_PENDING_TABLES = "response_cache_tables"
+_SESSION_LISTENERS_REGISTERED = False
+
+
+class CachedResponse(NamedTuple):
+    """A rendered response body with the headers needed to replay it."""
+
+    status: int
+    mimetype: str
+    headers: Tuple[Tuple[str, str], ...]
+    body: bytes
+
+
+class MemoryResponseCache:
+    """Per-process LRU of responses with in-memory table versions.
+
+    Each worker process keeps its own entries and versions, so writes made
+    through another worker only become visible here once entries expire.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float]) -> None:
+        self._entries: LRUCache[str, CachedResponse] = LRUCache(maxsize, ttl=ttl)
+        self._versions: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the response stored under ``key``, if still valid."""
+
+        return self._entries.get(key)
+
+    def set(self, key: str, response: CachedResponse) -> None:
+        """Store ``response`` under ``key``."""
+
+        self._entries.set(key, response)
+
+    def versions(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        """Return the current version of each table in ``tables``."""
+
+        return tuple(self._versions[table] for table in tables)
+
+    def bump(self, tables: Iterable[str]) -> None:
+        """Advance the version of every table in ``tables``."""
+
+        with self._lock:
+            for table in tables:
+                self._versions[table] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for the cache."""
+
+        return self._entries.stats()
+
+
+class SQLiteResponseCache:
+    """Responses and table versions kept in an SQLite file shared by workers.
+
+    Every worker process on the host sees the same entries and versions, so a
+    write through one worker invalidates cached responses for all of them.
+    When more than ``maxsize`` entries are stored the oldest are dropped.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            status INTEGER NOT NULL,
+            mimetype TEXT NOT NULL,
+            headers TEXT NOT NULL,
+            body BLOB NOT NULL,
+            expires_at REAL
+        );
+        CREATE TABLE IF NOT EXISTS versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        );
+    """
+
+    def __init__(
+        self, path: Union[str, Path], maxsize: int, ttl: Optional[float]
+    ) -> None:
+        self.path = str(path)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._connect().executescript(self._SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections are per thread and never cross a fork.
+        if getattr(self._local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the response stored under ``key``, if still valid."""
+
+        row = (
+            self._connect()
+            .execute(
+                "SELECT status, mimetype, headers, body FROM responses "
+                "WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        status, mimetype, headers, body = row
+        return CachedResponse(
+            status, mimetype, tuple(map(tuple, json.loads(headers))), body
+        )
+
+    def set(self, key: str, response: CachedResponse) -> None:
+        """Store ``response`` under ``key``, dropping expired and excess entries."""
+
+        if self.maxsize == 0:
+            return
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        connection = self._connect()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.status,
+                    response.mimetype,
+                    json.dumps(response.headers),
+                    response.body,
+                    expires_at,
+                ),
+            )
+            connection.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            connection.execute(
+                "DELETE FROM responses WHERE rowid IN ("
+                "SELECT rowid FROM responses ORDER BY rowid DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+
+    def versions(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        """Return the current version of each table in ``tables``."""
+
+        tables = tuple(tables)
+        placeholders = ", ".join("?" * len(tables))
+        stored = dict(
+            self._connect().execute(
+                f"SELECT name, version FROM versions WHERE name IN ({placeholders})",
+                tables,
+            )
+        )
+        return tuple(stored.get(table, 0) for table in tables)
+
+    def bump(self, tables: Iterable[str]) -> None:
+        """Advance the version of every table in ``tables``."""
+
+        connection = self._connect()
+        with connection:
+            connection.executemany(
+                "INSERT INTO versions (name, version) VALUES (?, 1) "
+                "ON CONFLICT (name) DO UPDATE SET version = version + 1",
+                [(table,) for table in tables],
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the number of stored entries."""
+
+        (size,) = self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "size": size}
+
+
+ResponseCache = Union[MemoryResponseCache, SQLiteResponseCache]
+
+
+def _create_response_cache() -> ResponseCache:
+    config = current_app.config
+    maxsize = config.get("RESPONSE_CACHE_SIZE", 1024)
+    ttl = config.get("RESPONSE_CACHE_TTL", 30) or None
+    if config["RESPONSE_CACHE_BACKEND"] == "sqlite":
+        return SQLiteResponseCache(config["RESPONSE_CACHE_PATH"], maxsize, ttl)
+    return MemoryResponseCache(maxsize, ttl)
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the response cache bound to the current app, or ``None`` if off."""
+
+    if current_app.config.get("RESPONSE_CACHE_BACKEND", "none") == "none":
+        return None
+    return app_cache("response_cache", _create_response_cache)
+
+
+def _record_flush(session: Session, flush_context: object) -> None:
+    tables = session.info.setdefault(_PENDING_TABLES, set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        tables.update(table.name for table in inspect(instance).mapper.tables)
+
+
+def _record_statement(state: ORMExecuteState) -> None:
+    # Bulk and set-based writes bypass the flush, so their target is recorded
+    # here.
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info.setdefault(_PENDING_TABLES, set()).add(
+            state.statement.table.name
+        )
+
+
+def _bump_committed(session: Session) -> None:
+    tables = session.info.pop(_PENDING_TABLES, None)
+    if not tables or not has_app_context():
+        return
+    cache = get_response_cache()
+    if cache is not None:
+        cache.bump(sorted(tables))
+
+
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_TABLES, None)
+
+
+def init_response_cache(app: Flask) -> None:
+    """Validate the backend setting and start tracking committed writes."""
+
+    global _SESSION_LISTENERS_REGISTERED
+
+    backend = app.config.get("RESPONSE_CACHE_BACKEND", "none")
+    if backend not in RESPONSE_CACHE_BACKENDS:
+        choices = ", ".join(RESPONSE_CACHE_BACKENDS)
+        raise ValueError(f"RESPONSE_CACHE_BACKEND must be one of {choices}.")
+    if _SESSION_LISTENERS_REGISTERED:
+        return
+
+    event.listen(Session, "after_flush", _record_flush)
+    event.listen(Session, "do_orm_execute", _record_statement)
+    event.listen(Session, "after_commit", _bump_committed)
+    event.listen(Session, "after_rollback", _discard_pending)
+    _SESSION_LISTENERS_REGISTERED = True
+
+
+__all__ = [
+    "RESPONSE_CACHE_BACKENDS",
+    "CachedResponse",
+    "MemoryResponseCache",
+    "SQLiteResponseCache",
+    "get_response_cache",
+    "init_response_cache",
+]
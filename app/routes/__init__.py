@@ -12,7 +12,7 @@ api_bp = Blueprint("api", __name__)
 def _load_route_modules() -> None:
     """Import modules so their routes register with the blueprint."""
 
-    for module in ("auth_routes", "projects", "tasks", "users"):
+    for module in ("auth_routes", "projects", "search", "tasks", "users"):
         import_module(f"{__name__}.{module}")
 
 
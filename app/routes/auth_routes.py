@@ -6,7 +6,12 @@ from flask import Response, current_app, request
 
 from ..extensions import limiter
 from ..errors import ForbiddenError
-from ..services import authenticate_user_and_issue_token
+from ..negotiation import get_request_data
+from ..services import (
+    issue_tokens_for_login,
+    refresh_access_token,
+    revoke_refresh_token,
+)
 from . import api_bp
 from .common import json_response
 
@@ -36,8 +41,48 @@ def login() -> Response:
         response = current_app.make_default_options_response()
         return response
 
-    token = authenticate_user_and_issue_token()
-    return json_response({"access_token": token, "token_type": "Bearer"})
+    tokens = issue_tokens_for_login()
+    return json_response(
+        {
+            "access_token": tokens["access_token"],
+            "token_type": "Bearer",
+            "expires_in": current_app.config["JWT_ACCESS_TOKEN_EXPIRES"],
+            "refresh_token": tokens["refresh_token"],
+        }
+    )
 
 
-__all__ = ["login"]
+@api_bp.route("/auth/refresh", methods=["POST", "OPTIONS"])
+@limiter.limit(lambda: current_app.config["SENSITIVE_RATE_LIMIT"], methods=["POST"])
+def refresh() -> Response:
+    """Exchange a refresh token for a new access token without re-sending the password."""
+
+    if not _is_origin_allowed():
+        raise ForbiddenError("Origin not allowed.")
+
+    if request.method == "OPTIONS":
+        return current_app.make_default_options_response()
+
+    token = refresh_access_token(get_request_data(silent=True) or {})
+    return json_response(
+        {
+            "access_token": token,
+            "token_type": "Bearer",
+            "expires_in": current_app.config["JWT_ACCESS_TOKEN_EXPIRES"],
+        }
+    )
+
+
+@api_bp.route("/auth/revoke", methods=["POST"])
+@limiter.limit(lambda: current_app.config["SENSITIVE_RATE_LIMIT"])
+def revoke() -> Response:
+    """Revoke a refresh token (e.g. on logout)."""
+
+    if not _is_origin_allowed():
+        raise ForbiddenError("Origin not allowed.")
+
+    revoke_refresh_token(get_request_data(silent=True) or {})
+    return json_response({"message": "Refresh token revoked."})
+
+
+__all__ = ["login", "refresh", "revoke"]
@@ -2,13 +2,58 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
+import csv
+import hashlib
+import io
+from datetime import datetime
+from functools import lru_cache, wraps
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+from urllib.parse import urlencode
 
-from flask import Response, current_app, jsonify, request
+from flask import Response, current_app, g, request, stream_with_context
+from marshmallow import Schema
+from werkzeug.http import is_resource_modified, quote_etag
 
 from ..errors import BusinessValidationError
+from ..negotiation import (
+    MSGPACK_MIMETYPE,
+    msgpack_available,
+    packb,
+    render,
+    wants_msgpack,
+)
+from ..response_cache import CachedResponse, get_response_cache
+from ..repositories import TOTAL_EXACT, TOTAL_MODES, Cursor, decode_cursor
 from . import api_bp
 
+EXPORT_MIMETYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "msgpack": MSGPACK_MIMETYPE,
+}
+
+F = TypeVar("F", bound=Callable[..., Response])
+ChangeStamp = Tuple[int, Optional[datetime]]
+
+
+class PaginationParams(NamedTuple):
+    """Parsed pagination query arguments."""
+
+    page: int
+    per_page: int
+    cursor: Optional[Cursor] = None
+    total: str = TOTAL_EXACT
+
 
 @api_bp.route("/health", methods=["GET"])
 def health() -> Response:
@@ -18,18 +63,177 @@ def health() -> Response:
 
 
 def json_response(
-    payload: Dict[str, Any], status: int = 200, meta: Dict[str, Any] | None = None
+    payload: Dict[str, Any],
+    status: int = 200,
+    meta: Dict[str, Any] | None = None,
+    headers: Dict[str, str] | None = None,
 ) -> Response:
-    """Return a consistently formatted JSON response."""
+    """Return a consistently formatted response, JSON or MessagePack per ``Accept``."""
 
     response_payload = dict(payload)
     if meta:
         response_payload["meta"] = meta
-    return jsonify(response_payload), status
+    return render(response_payload, status, headers)
+
+
+def paginated_response(data: Any, meta: Dict[str, Any]) -> Response:
+    """Return a list response with RFC 8288 ``Link`` navigation headers."""
+
+    headers = {}
+    links = _pagination_links(meta)
+    if links:
+        headers["Link"] = links
+    return json_response({"data": data}, meta=meta, headers=headers)
+
+
+def _page_url(**overrides: Any) -> str:
+    """Return the current URL with selected query arguments replaced."""
+
+    args = request.args.to_dict(flat=False)
+    for key, value in overrides.items():
+        args.pop(key, None)
+        if value is not None:
+            args[key] = [str(value)]
+    query = urlencode(args, doseq=True)
+    return f"{request.base_url}?{query}" if query else request.base_url
+
+
+def _pagination_links(meta: Dict[str, Any]) -> str:
+    """Build a ``Link`` header value from pagination metadata."""
+
+    links: Dict[str, str] = {}
+    if "page" in meta:
+        page = meta["page"]
+        links["first"] = _page_url(page=1, cursor=None)
+        if meta.get("has_prev"):
+            links["prev"] = _page_url(page=page - 1, cursor=None)
+        if meta.get("has_next"):
+            links["next"] = _page_url(page=page + 1, cursor=None)
+        if meta.get("pages"):
+            links["last"] = _page_url(page=meta["pages"], cursor=None)
+    else:
+        if meta.get("prev_cursor"):
+            links["prev"] = _page_url(cursor=meta["prev_cursor"], page=None)
+        if meta.get("next_cursor"):
+            links["next"] = _page_url(cursor=meta["next_cursor"], page=None)
+
+    return ", ".join(f'<{url}>; rel="{rel}"' for rel, url in links.items())
+
 
+def conditional_get(
+    stamp: Callable[..., Optional[ChangeStamp]],
+) -> Callable[[F], F]:
+    """Answer ``If-None-Match`` before the view runs.
 
-def get_pagination_params() -> tuple[int, int]:
-    """Parse pagination parameters from the query string."""
+    ``stamp`` receives the view's URL arguments and returns ``(count,
+    last_modified)`` for the rows behind the response, or ``None`` to skip
+    validation (the view then reports the error). The strong ETag hashes the
+    stamp with the full URL and the negotiated media type, so matching
+    requests get ``304`` without the list query or serialisation running.
+    No ``Last-Modified`` is sent: deleting a row leaves the latest
+    ``updated_at`` unchanged, so ``If-Modified-Since`` would keep answering
+    ``304`` for a listing that lost rows. Only the count-aware ETag validates.
+    The stamp is left on ``g.change_stamp`` for :func:`cached_response`.
+    """
+
+    def decorator(view: F) -> F:
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> Response:
+            if not current_app.config["CONDITIONAL_GET_ENABLED"]:
+                return view(*args, **kwargs)
+            validator = stamp(**kwargs)
+            if validator is None:
+                return view(*args, **kwargs)
+
+            count, last_modified = validator
+            representation = "msgpack" if wants_msgpack() else "json"
+            key = f"{count}|{last_modified}|{representation}|{request.full_path}"
+            etag = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+            if is_resource_modified(request.environ, etag=quote_etag(etag)):
+                g.change_stamp = validator
+                response = view(*args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            else:
+                response = current_app.response_class(status=304)
+            response.set_etag(etag)
+            response.vary.add("Accept")
+            return response
+
+        return cast(F, wrapper)
+
+    return decorator
+
+
+def cached_response(*tables: str) -> Callable[[F], F]:
+    """Serve repeated GETs from the response cache until ``tables`` change.
+
+    Keys combine the endpoint, its URL arguments, the query string (sorted by
+    name), the caller's role, the negotiated media type, the version of each
+    table in ``tables`` and the change stamp :func:`conditional_get` built
+    its ETag from. Versions are read before the view runs, so a write racing
+    the view files its result under versions already retired; keying by the
+    stamp means a body is never replayed with a newer ETag when a version bump
+    is missed (a write through another worker, or between a commit and its
+    bump). Only ``200`` responses are stored.
+    """
+
+    def decorator(view: F) -> F:
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> Response:
+            cache = get_response_cache()
+            if cache is None:
+                return view(*args, **kwargs)
+
+            principal = g.get("current_user")
+            key = repr(
+                (
+                    request.endpoint,
+                    sorted(kwargs.items()),
+                    sorted(request.args.lists()),
+                    principal.role if principal is not None else None,
+                    "msgpack" if wants_msgpack() else "json",
+                    cache.versions(tables),
+                    g.get("change_stamp"),
+                )
+            )
+            key = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+            cached = cache.get(key)
+            if cached is not None:
+                return current_app.response_class(
+                    cached.body,
+                    status=cached.status,
+                    headers=list(cached.headers),
+                    mimetype=cached.mimetype,
+                )
+
+            response = view(*args, **kwargs)
+            if response.status_code == 200 and not response.is_streamed:
+                headers = tuple(
+                    (name, value)
+                    for name, value in response.headers
+                    if name not in ("Content-Type", "Content-Length")
+                )
+                cache.set(
+                    key,
+                    CachedResponse(
+                        200, response.mimetype, headers, response.get_data()
+                    ),
+                )
+            return response
+
+        return cast(F, wrapper)
+
+    return decorator
+
+
+def get_pagination_params() -> PaginationParams:
+    """Parse pagination parameters from the query string.
+
+    ``cursor`` switches the listing to keyset pagination; it cannot be combined
+    with ``page``. ``total`` (``exact``, ``estimate`` or ``none``) controls how
+    offset pages are counted.
+    """
 
     page_default = current_app.config["PAGINATION_DEFAULT_PAGE"]
     page_size_default = current_app.config["PAGINATION_DEFAULT_PAGE_SIZE"]
@@ -52,7 +256,155 @@ def get_pagination_params() -> tuple[int, int]:
             f"per_page must be less than or equal to {max_per_page}."
         )
 
-    return page, per_page
+    cursor = None
+    raw_cursor = request.args.get("cursor")
+    if raw_cursor:
+        if "page" in request.args:
+            raise BusinessValidationError("Use either page or cursor, not both.")
+        try:
+            cursor = decode_cursor(raw_cursor)
+        except ValueError as exc:
+            raise BusinessValidationError("Invalid pagination cursor.") from exc
+
+    total = request.args.get("total", current_app.config["PAGINATION_DEFAULT_TOTAL"])
+    if total not in TOTAL_MODES:
+        raise BusinessValidationError(
+            f"total must be one of {', '.join(TOTAL_MODES)}."
+        )
+
+    return PaginationParams(page, per_page, cursor, total)
+
+
+def get_list_filters(
+    schema: Schema, pagination: PaginationParams
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Load filter and sort arguments for a list endpoint.
+
+    Returns the validated filters and the requested sort. Cursors encode the
+    primary key, so they can only be combined with the default ``id`` order.
+    """
+
+    filters = schema.load(request.args)
+    sort = filters.pop("sort", None)
+    if pagination.cursor is not None and sort not in (None, "id"):
+        raise BusinessValidationError("Cursor pagination only supports sort=id.")
+    return filters, sort
+
+
+def get_fields(schema: Schema) -> Optional[Tuple[str, ...]]:
+    """Parse ``?fields=a,b`` into a sparse fieldset valid for ``schema``.
+
+    Returns ``None`` when the argument is absent, meaning every field.
+    """
+
+    raw = request.args.get("fields")
+    if raw is None:
+        return None
+    names = tuple(
+        dict.fromkeys(name.strip() for name in raw.split(",") if name.strip())
+    )
+    if not names:
+        raise BusinessValidationError("fields must name at least one field.")
+    unknown = [name for name in names if name not in schema.dump_fields]
+    if unknown:
+        raise BusinessValidationError(
+            f"Unknown fields: {', '.join(unknown)}. "
+            f"Available: {', '.join(schema.dump_fields)}."
+        )
+    return names
+
+
+def sparse_schema(schema: Schema, fields: Optional[Tuple[str, ...]]) -> Schema:
+    """Return ``schema`` restricted to ``fields`` (or unchanged for ``None``)."""
+
+    if fields is None:
+        return schema
+    return _restricted_schema(type(schema), fields, schema.many)
+
+
+@lru_cache(maxsize=256)
+def _restricted_schema(
+    schema_class: type[Schema], fields: Tuple[str, ...], many: bool
+) -> Schema:
+    # Building a schema is costly, so each (schema, fieldset) pair is built once.
+    return schema_class(only=fields, many=many)
+
+
+def get_export_params(schema: Schema) -> Tuple[str, Dict[str, Any], Optional[int]]:
+    """Load ``(format, filters, after_id)`` for an export endpoint.
+
+    ``?format=`` wins over the ``Accept`` header; NDJSON is the default.
+    MessagePack is only offered when the ``msgpack`` package is installed.
+    """
+
+    args = schema.load(request.args)
+    formats = [
+        name for name in EXPORT_MIMETYPES if name != "msgpack" or msgpack_available()
+    ]
+    fmt = args.pop("format", None)
+    if fmt is None:
+        by_mimetype = {EXPORT_MIMETYPES[name]: name for name in formats}
+        best = request.accept_mimetypes.best_match(list(by_mimetype))
+        fmt = by_mimetype.get(best, "ndjson")
+    elif fmt not in formats:
+        raise BusinessValidationError(f"Export format '{fmt}' is not available.")
+    return fmt, args, args.pop("after_id", None)
+
+
+def export_response(
+    rows: Iterable[Dict[str, Any]], schema: Schema, *, fmt: str, filename: str
+) -> Response:
+    """Stream ``rows`` dumped through ``schema`` as NDJSON, CSV or MessagePack.
+
+    MessagePack output is a plain sequence of maps, one per row, readable with
+    ``msgpack.Unpacker``.
+
+    Output is flushed every ``EXPORT_BATCH_SIZE`` rows, so neither the rows nor
+    the body are ever held in memory as a whole. Rows are written in id order;
+    clients resume an interrupted download with ``?after_id=<last id>``.
+    """
+
+    flush_every = current_app.config["EXPORT_BATCH_SIZE"]
+
+    def generate():
+        buffer = io.BytesIO() if fmt == "msgpack" else io.StringIO()
+        if fmt == "csv":
+            writer = csv.DictWriter(buffer, fieldnames=list(schema.dump_fields))
+            writer.writeheader()
+            write = writer.writerow
+        elif fmt == "msgpack":
+            write = lambda data: buffer.write(packb(data))  # noqa: E731
+        else:
+            dumps = current_app.json.dumps
+            write = lambda data: buffer.write(dumps(data) + "\n")  # noqa: E731
+
+        for count, row in enumerate(rows, start=1):
+            write(schema.dump(row))
+            if count % flush_every == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
 
 
-__all__ = ["get_pagination_params", "json_response"]
+__all__ = [
+    "EXPORT_MIMETYPES",
+    "ChangeStamp",
+    "PaginationParams",
+    "cached_response",
+    "conditional_get",
+    "export_response",
+    "get_export_params",
+    "get_fields",
+    "get_list_filters",
+    "get_pagination_params",
+    "json_response",
+    "paginated_response",
+    "sparse_schema",
+]
@@ -2,23 +2,39 @@
 
 from __future__ import annotations
 
-from flask import Response, current_app, request
+from flask import Response, current_app
 
 from ..auth import require_auth, require_manager
 from ..extensions import limiter
-from ..schemas import ProjectSchema
+from ..negotiation import get_request_data
+from ..schemas import ProjectExportQuerySchema, ProjectQuerySchema, ProjectSchema
 from ..services import (
     create_project as create_project_service,
     delete_project as delete_project_service,
+    export_projects as export_projects_service,
     get_project as get_project_service,
     list_projects as list_projects_service,
+    project_list_stamp,
     update_project as update_project_service,
 )
 from . import api_bp
-from .common import get_pagination_params, json_response
+from .common import (
+    cached_response,
+    conditional_get,
+    export_response,
+    get_export_params,
+    get_fields,
+    get_list_filters,
+    get_pagination_params,
+    json_response,
+    paginated_response,
+    sparse_schema,
+)
 
 project_schema = ProjectSchema()
 projects_schema = ProjectSchema(many=True)
+project_query_schema = ProjectQuerySchema()
+project_export_query_schema = ProjectExportQuerySchema()
 
 
 @api_bp.route("/projects", methods=["POST"])
@@ -27,28 +43,51 @@ projects_schema = ProjectSchema(many=True)
 def create_project() -> Response:
     """Create a new project."""
 
-    data = project_schema.load(request.get_json() or {})
+    data = project_schema.load(get_request_data() or {})
     project = create_project_service(data)
     return json_response({"data": project_schema.dump(project)}, 201)
 
 
 @api_bp.route("/projects", methods=["GET"])
 @require_auth
+@conditional_get(project_list_stamp)
+@cached_response("projects")
 def list_projects() -> Response:
-    """Return all projects with pagination."""
+    """Return projects with pagination, filtering and sorting."""
+
+    pagination = get_pagination_params()
+    filters, sort = get_list_filters(project_query_schema, pagination)
+    fields = get_fields(projects_schema)
+    projects, meta = list_projects_service(
+        **pagination._asdict(), filters=filters, sort=sort, fields=fields
+    )
+    return paginated_response(
+        sparse_schema(projects_schema, fields).dump(projects), meta
+    )
+
 
-    page, per_page = get_pagination_params()
-    projects, meta = list_projects_service(page=page, per_page=per_page)
-    return json_response({"data": projects_schema.dump(projects)}, meta=meta)
+@api_bp.route("/projects/export", methods=["GET"])
+@require_auth
+def export_projects() -> Response:
+    """Stream every matching project as NDJSON or CSV, in id order."""
+
+    fmt, filters, after_id = get_export_params(project_export_query_schema)
+    fields = get_fields(project_schema)
+    rows = export_projects_service(filters=filters, after_id=after_id, fields=fields)
+    return export_response(
+        rows, sparse_schema(project_schema, fields), fmt=fmt, filename="projects"
+    )
 
 
 @api_bp.route("/projects/<int:project_id>", methods=["GET"])
 @require_auth
+@cached_response("projects")
 def get_project(project_id: int) -> Response:
     """Fetch a single project."""
 
-    project = get_project_service(project_id)
-    return json_response({"data": project_schema.dump(project)})
+    fields = get_fields(project_schema)
+    project = get_project_service(project_id, fields=fields)
+    return json_response({"data": sparse_schema(project_schema, fields).dump(project)})
 
 
 @api_bp.route("/projects/<int:project_id>", methods=["PUT"])
@@ -57,7 +96,7 @@ def get_project(project_id: int) -> Response:
 def update_project(project_id: int) -> Response:
     """Update an existing project."""
 
-    payload = request.get_json() or {}
+    payload = get_request_data() or {}
     data = project_schema.load(payload, partial=True)
     project = update_project_service(project_id, payload, data)
     return json_response({"data": project_schema.dump(project)})
@@ -76,6 +115,7 @@ def delete_project(project_id: int) -> Response:
 __all__ = [
     "create_project",
     "delete_project",
+    "export_projects",
     "get_project",
     "list_projects",
     "update_project",
@@ -0,0 +1,28 @@
+"""Search API routes."""
+
+from __future__ import annotations
+
+from flask import Response, request
+
+from ..auth import require_auth
+from ..schemas import SearchResultSchema
+from ..services import search as search_service
+from . import api_bp
+from .common import get_pagination_params, paginated_response
+
+search_results_schema = SearchResultSchema(many=True)
+
+
+@api_bp.route("/search", methods=["GET"])
+@require_auth
+def search() -> Response:
+    """Full-text search across projects and tasks."""
+
+    pagination = get_pagination_params()
+    results, meta = search_service(
+        request.args.get("q"), per_page=pagination.per_page, cursor=pagination.cursor
+    )
+    return paginated_response(search_results_schema.dump(results), meta)
+
+
+__all__ = ["search"]
@@ -2,21 +2,45 @@
 
 from __future__ import annotations
 
-from flask import Response, current_app, request
+import math
+from typing import Any, Dict, List, Tuple
+
+from flask import Response, current_app
+from marshmallow import RAISE, ValidationError
 
 from ..auth import require_auth, require_manager
+from ..errors import BusinessValidationError
 from ..extensions import limiter
-from ..schemas import TaskSchema
+from ..negotiation import get_request_data
+from ..schemas import TaskExportQuerySchema, TaskQuerySchema, TaskSchema
 from ..services import (
     create_task as create_task_service,
+    bulk_update_tasks as bulk_update_tasks_service,
+    create_tasks_batch as create_tasks_batch_service,
+    export_tasks as export_tasks_service,
     list_tasks as list_tasks_service,
+    task_list_stamp,
     update_task as update_task_service,
+    update_tasks_matching as update_tasks_matching_service,
 )
 from . import api_bp
-from .common import get_pagination_params, json_response
+from .common import (
+    cached_response,
+    conditional_get,
+    export_response,
+    get_export_params,
+    get_fields,
+    get_list_filters,
+    get_pagination_params,
+    json_response,
+    paginated_response,
+    sparse_schema,
+)
 
 task_schema = TaskSchema()
 tasks_schema = TaskSchema(many=True)
+task_query_schema = TaskQuerySchema()
+task_export_query_schema = TaskExportQuerySchema()
 
 
 @api_bp.route("/projects/<int:project_id>/tasks", methods=["POST"])
@@ -25,20 +49,172 @@ tasks_schema = TaskSchema(many=True)
 def create_task(project_id: int) -> Response:
     """Create a task within a project."""
 
-    payload = request.get_json() or {}
+    payload = get_request_data() or {}
     data = task_schema.load(payload)
     task = create_task_service(project_id, data)
     return json_response({"data": task_schema.dump(task)}, 201)
 
 
+def _batch_payload() -> Any:
+    """Return the task array of a batch body (a list or ``{"tasks": [...]}``).
+
+    Anything else is returned as found, for the caller to reject.
+    """
+
+    payload = get_request_data(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get("tasks")
+    return payload
+
+
+def _batch_items() -> List[Any]:
+    """Return the validated, size-checked task array of a batch body."""
+
+    payload = _batch_payload()
+    if not isinstance(payload, list) or not payload:
+        raise BusinessValidationError("Request body must be a non-empty array of tasks.")
+
+    max_size = current_app.config["TASK_BATCH_MAX_SIZE"]
+    if len(payload) > max_size:
+        raise BusinessValidationError(
+            f"A batch may contain at most {max_size} tasks."
+        )
+    return payload
+
+
+def _batch_cost() -> int:
+    """Rate-limit cost of a batch: one unit per started ``TASK_BATCH_COST_UNIT`` items."""
+
+    payload = _batch_payload()
+    size = len(payload) if isinstance(payload, list) else 0
+    return max(1, math.ceil(size / current_app.config["TASK_BATCH_COST_UNIT"]))
+
+
+@api_bp.route("/projects/<int:project_id>/tasks/batch", methods=["POST"])
+@require_manager
+@limiter.limit(lambda: current_app.config["SENSITIVE_RATE_LIMIT"], cost=_batch_cost)
+def create_tasks_batch(project_id: int) -> Response:
+    """Create many tasks within a project in one transaction.
+
+    Responds ``201`` when every item was created and ``207`` with per-item
+    errors otherwise; valid items are created either way.
+    """
+
+    items = _batch_items()
+    try:
+        valid, invalid = tasks_schema.load(items), {}
+    except ValidationError as err:
+        valid, invalid = err.valid_data, err.messages
+
+    results = create_tasks_batch_service(
+        project_id,
+        {index: data for index, data in enumerate(valid) if index not in invalid},
+        invalid,
+    )
+    for result in results:
+        if "task" in result:
+            result["data"] = task_schema.dump(result.pop("task"))
+
+    created = sum(1 for result in results if result["status"] == 201)
+    meta = {"created": created, "failed": len(results) - created}
+    return json_response({"data": results}, 201 if not meta["failed"] else 207, meta)
+
+
+def _bulk_item_changes(items: Any) -> List[Tuple[int, Dict, Dict]]:
+    """Validate ``[{"id": ..., "changes": {...}}]`` items against TaskSchema."""
+
+    max_size = current_app.config["TASK_BATCH_MAX_SIZE"]
+    if not isinstance(items, list) or not items:
+        raise BusinessValidationError("'items' must be a non-empty array.")
+    if len(items) > max_size:
+        raise BusinessValidationError(f"A bulk update may contain at most {max_size} items.")
+
+    parsed, errors = [], {}
+    for index, item in enumerate(items):
+        if (
+            not isinstance(item, dict)
+            or not isinstance(item.get("id"), int)
+            or not isinstance(item.get("changes"), dict)
+        ):
+            errors[index] = {"_schema": ["Expected an object with 'id' and 'changes'."]}
+            continue
+        try:
+            data = task_schema.load(item["changes"], partial=True)
+        except ValidationError as err:
+            errors[index] = err.messages
+            continue
+        parsed.append((item["id"], item["changes"], data))
+
+    if errors:
+        raise ValidationError(errors)
+    return parsed
+
+
+@api_bp.route("/projects/<int:project_id>/tasks", methods=["PATCH"])
+@require_manager
+@limiter.limit(lambda: current_app.config["SENSITIVE_RATE_LIMIT"], cost=_batch_cost)
+def bulk_update_tasks(project_id: int) -> Response:
+    """Update many tasks of a project in one transaction.
+
+    The body is either ``{"items": [{"id": 1, "changes": {...}}, ...]}`` or
+    ``{"filter": {...}, "changes": {...}}`` using the task list filters.
+    """
+
+    body = get_request_data(silent=True)
+    if not isinstance(body, dict):
+        raise BusinessValidationError("Request body must be a JSON object.")
+
+    if "items" in body:
+        updated = bulk_update_tasks_service(
+            project_id, _bulk_item_changes(body["items"])
+        )
+    elif isinstance(body.get("changes"), dict) and isinstance(body.get("filter"), dict):
+        filters = task_query_schema.load(body["filter"], unknown=RAISE)
+        filters.pop("sort", None)
+        changes = task_schema.load(body["changes"], partial=True)
+        updated = update_tasks_matching_service(
+            project_id, filters, body["changes"], changes
+        )
+    else:
+        raise BusinessValidationError(
+            "Provide either 'items' or both 'filter' and 'changes'."
+        )
+
+    return json_response({"data": {"ids": updated}}, meta={"updated": len(updated)})
+
+
 @api_bp.route("/projects/<int:project_id>/tasks", methods=["GET"])
 @require_auth
+@conditional_get(task_list_stamp)
+@cached_response("projects", "tasks")
 def list_tasks(project_id: int) -> Response:
     """List tasks for a project."""
 
-    page, per_page = get_pagination_params()
-    tasks, meta = list_tasks_service(project_id, page=page, per_page=per_page)
-    return json_response({"data": tasks_schema.dump(tasks)}, meta=meta)
+    pagination = get_pagination_params()
+    filters, sort = get_list_filters(task_query_schema, pagination)
+    fields = get_fields(tasks_schema)
+    tasks, meta = list_tasks_service(
+        project_id, **pagination._asdict(), filters=filters, sort=sort, fields=fields
+    )
+    return paginated_response(sparse_schema(tasks_schema, fields).dump(tasks), meta)
+
+
+@api_bp.route("/projects/<int:project_id>/tasks/export", methods=["GET"])
+@require_auth
+def export_tasks(project_id: int) -> Response:
+    """Stream a project's matching tasks as NDJSON or CSV, in id order."""
+
+    fmt, filters, after_id = get_export_params(task_export_query_schema)
+    fields = get_fields(task_schema)
+    rows = export_tasks_service(
+        project_id, filters=filters, after_id=after_id, fields=fields
+    )
+    return export_response(
+        rows,
+        sparse_schema(task_schema, fields),
+        fmt=fmt,
+        filename=f"project-{project_id}-tasks",
+    )
 
 
 @api_bp.route("/projects/<int:project_id>/tasks/<int:task_id>", methods=["PUT"])
@@ -47,10 +223,17 @@ def list_tasks(project_id: int) -> Response:
 def update_task(project_id: int, task_id: int) -> Response:
     """Update an existing task within a project."""
 
-    payload = request.get_json() or {}
+    payload = get_request_data() or {}
     data = task_schema.load(payload, partial=True)
     task = update_task_service(project_id, task_id, payload, data)
     return json_response({"data": task_schema.dump(task)})
 
 
-__all__ = ["create_task", "list_tasks", "update_task"]
+__all__ = [
+    "bulk_update_tasks",
+    "create_task",
+    "create_tasks_batch",
+    "export_tasks",
+    "list_tasks",
+    "update_task",
+]
@@ -5,17 +5,31 @@ from __future__ import annotations
 from flask import Response, current_app, request
 
 from ..auth import require_auth, require_manager
+from ..errors import BusinessValidationError
 from ..extensions import limiter
+from ..negotiation import get_request_data
 from ..schemas import UserSchema
 from ..services import (
+    IMPORT_FORMATS,
     create_user as create_user_service,
     delete_user as delete_user_service,
     get_user as get_user_service,
+    import_users as import_users_service,
+    iter_import_records,
     list_users as list_users_service,
     update_user as update_user_service,
+    user_list_stamp,
 )
 from . import api_bp
-from .common import get_pagination_params, json_response
+from .common import (
+    cached_response,
+    conditional_get,
+    get_fields,
+    get_pagination_params,
+    json_response,
+    paginated_response,
+    sparse_schema,
+)
 
 user_schema = UserSchema()
 users_schema = UserSchema(many=True)
@@ -27,28 +41,66 @@ users_schema = UserSchema(many=True)
 def create_user() -> Response:
     """Create a new user."""
 
-    data = user_schema.load(request.get_json() or {})
+    data = user_schema.load(get_request_data() or {})
     user = create_user_service(data)
     return json_response({"data": user_schema.dump(user)}, 201)
 
 
+def _import_format() -> str:
+    """Pick the import format from ``?format=`` or the request Content-Type."""
+
+    fmt = request.args.get("format")
+    if fmt is None:
+        fmt = "csv" if request.mimetype == "text/csv" else "ndjson"
+    if fmt not in IMPORT_FORMATS:
+        raise BusinessValidationError(
+            f"Import format must be one of {', '.join(IMPORT_FORMATS)}."
+        )
+    return fmt
+
+
+@api_bp.route("/users/import", methods=["POST"])
+@require_manager
+@limiter.limit(lambda: current_app.config["SENSITIVE_RATE_LIMIT"])
+def import_users() -> Response:
+    """Create users from an NDJSON or CSV body, streamed in chunks.
+
+    Responds ``201`` when every row was created and ``207`` with per-row
+    results otherwise; invalid and duplicate rows never abort the import.
+    """
+
+    records = iter_import_records(request.stream, _import_format())
+    results = list(import_users_service(records))
+    meta = {"created": 0, "duplicates": 0, "invalid": 0}
+    for result in results:
+        key = {201: "created", 409: "duplicates"}.get(result["status"], "invalid")
+        meta[key] += 1
+    status = 201 if meta["created"] == len(results) else 207
+    return json_response({"data": results}, status, meta)
+
+
 @api_bp.route("/users", methods=["GET"])
 @require_auth
+@conditional_get(user_list_stamp)
+@cached_response("users")
 def list_users() -> Response:
     """Return paginated users."""
 
-    page, per_page = get_pagination_params()
-    users, meta = list_users_service(page=page, per_page=per_page)
-    return json_response({"data": users_schema.dump(users)}, meta=meta)
+    pagination = get_pagination_params()
+    fields = get_fields(users_schema)
+    users, meta = list_users_service(**pagination._asdict(), fields=fields)
+    return paginated_response(sparse_schema(users_schema, fields).dump(users), meta)
 
 
 @api_bp.route("/users/<int:user_id>", methods=["GET"])
 @require_auth
+@cached_response("users")
 def get_user(user_id: int) -> Response:
     """Fetch a single user."""
 
-    user = get_user_service(user_id)
-    return json_response({"data": user_schema.dump(user)})
+    fields = get_fields(user_schema)
+    user = get_user_service(user_id, fields=fields)
+    return json_response({"data": sparse_schema(user_schema, fields).dump(user)})
 
 
 @api_bp.route("/users/<int:user_id>", methods=["PUT"])
@@ -57,7 +109,7 @@ def get_user(user_id: int) -> Response:
 def update_user(user_id: int) -> Response:
     """Update an existing user."""
 
-    payload = request.get_json() or {}
+    payload = get_request_data() or {}
     data = user_schema.load(payload, partial=True)
     user = update_user_service(user_id, payload, data)
     return json_response({"data": user_schema.dump(user)})
@@ -77,6 +129,7 @@ __all__ = [
     "create_user",
     "delete_user",
     "get_user",
+    "import_users",
     "list_users",
     "update_user",
 ]
@@ -2,7 +2,26 @@
 
 from .base import BaseSchema
 from .project import ProjectSchema
+from .query import (
+    EXPORT_FORMATS,
+    ProjectExportQuerySchema,
+    ProjectQuerySchema,
+    TaskExportQuerySchema,
+    TaskQuerySchema,
+)
+from .search import SearchResultSchema
 from .task import TaskSchema
 from .user import UserSchema
 
-__all__ = ["BaseSchema", "UserSchema", "ProjectSchema", "TaskSchema"]
+__all__ = [
+    "EXPORT_FORMATS",
+    "BaseSchema",
+    "UserSchema",
+    "ProjectSchema",
+    "ProjectExportQuerySchema",
+    "ProjectQuerySchema",
+    "SearchResultSchema",
+    "TaskSchema",
+    "TaskExportQuerySchema",
+    "TaskQuerySchema",
+]
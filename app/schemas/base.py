@@ -1,13 +1,44 @@
 """Common schema helpers."""
 
+from flask import current_app, has_app_context
 from marshmallow import EXCLUDE, Schema
 
+from .compiler import compile_schema
+
+_NOT_COMPILED = object()
+
 
 class BaseSchema(Schema):
-    """Common schema configuration."""
+    """Common schema configuration.
+
+    With ``FAST_SERIALIZERS_ENABLED`` set, :meth:`dump` uses a serializer
+    compiled from the schema's fields on first use instead of marshmallow's
+    field-by-field machinery; the output is identical.
+    """
 
     class Meta:
         unknown = EXCLUDE
 
+    def dump(self, obj, *, many=None):
+        """Serialize ``obj``, through the compiled fast path when enabled."""
+
+        many = self.many if many is None else bool(many)
+        serializer = self._fast_serializer() if obj is not None else None
+        if serializer is None:
+            return super().dump(obj, many=many)
+        if many:
+            return [serializer(item) for item in obj]
+        return serializer(obj)
+
+    def _fast_serializer(self):
+        if not has_app_context() or not current_app.config.get(
+            "FAST_SERIALIZERS_ENABLED", False
+        ):
+            return None
+        compiled = self.__dict__.get("_compiled_serializer", _NOT_COMPILED)
+        if compiled is _NOT_COMPILED:
+            compiled = self._compiled_serializer = compile_schema(self)
+        return compiled
+
 
 __all__ = ["BaseSchema"]
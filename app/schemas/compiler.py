@@ -0,0 +1,117 @@
+"""Compile marshmallow schemas into specialised row-to-dict functions.
+
+The compiled function reproduces :meth:`marshmallow.Schema.dump` for a single
+object: same keys, same order, same values, same handling of missing
+attributes. It only supports plain field types whose serialisation is a
+simple conversion; anything else (hooks, nested or method fields, custom
+accessors, non-ISO formats) makes :func:`compile_schema` return ``None`` so the
+caller falls back to marshmallow.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from marshmallow import Schema, fields, missing
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from marshmallow.utils import ensure_text_type
+
+Serializer = Callable[[Any], Dict[str, Any]]
+_Spec = Tuple[str, str, Optional[Callable[[Any], Any]], Any]
+
+_ISO_FORMATS = (None, "iso", "iso8601")
+
+
+@lru_cache(maxsize=4096)
+def _cached_isoformat(value, offset) -> str:
+    # ``offset`` is part of the key because aware datetimes that are equal in
+    # UTC but carry different offsets hash alike yet format differently.
+    return value.isoformat()
+
+
+def _format_datetime(value) -> str:
+    return _cached_isoformat(value, value.utcoffset())
+
+
+def _format_date(value) -> str:
+    return value.isoformat()
+
+
+def _format_text(value) -> str:
+    return value if type(value) is str else ensure_text_type(value)
+
+
+def _converter(field: fields.Field) -> Any:
+    """Return the conversion applied to non-null values of ``field``.
+
+    ``missing`` marks a field the compiler cannot reproduce.
+    """
+
+    field_type = type(field)
+    if field_type is fields.Integer:
+        return missing if field.as_string else int
+    if field_type is fields.Float:
+        return missing if field.as_string else float
+    if field_type in (fields.String, fields.Email):
+        return _format_text
+    if field_type in (fields.DateTime, fields.AwareDateTime):
+        return _format_datetime if field.format in _ISO_FORMATS else missing
+    if field_type is fields.Date:
+        return _format_date if field.format in _ISO_FORMATS else missing
+    return missing
+
+
+def _field_specs(schema: Schema) -> Optional[Tuple[_Spec, ...]]:
+    specs = []
+    for name, field in schema.dump_fields.items():
+        attribute = field.attribute or name
+        convert = _converter(field)
+        if convert is missing or "." in attribute:
+            return None
+        key = field.data_key if field.data_key is not None else name
+        specs.append((key, attribute, convert, field.dump_default))
+    return tuple(specs)
+
+
+def compile_schema(schema: Schema) -> Optional[Serializer]:
+    """Return a function dumping one object exactly like ``schema.dump``.
+
+    Returns ``None`` when the schema uses features the compiler does not
+    reproduce.
+    """
+
+    if schema._hooks[PRE_DUMP] or schema._hooks[POST_DUMP]:
+        return None
+    if type(schema).get_attribute is not Schema.get_attribute:
+        return None
+    specs = _field_specs(schema)
+    if specs is None:
+        return None
+
+    def serialize(obj: Any) -> Dict[str, Any]:
+        # Mirrors marshmallow.utils.get_value: item access first for objects
+        # supporting it, attribute access otherwise.
+        subscriptable = hasattr(obj, "__getitem__")
+        result: Dict[str, Any] = {}
+        for key, attribute, convert, default in specs:
+            if subscriptable:
+                try:
+                    value = obj[attribute]
+                except (KeyError, IndexError, TypeError, AttributeError):
+                    value = getattr(obj, attribute, missing)
+            else:
+                value = getattr(obj, attribute, missing)
+            if value is missing:
+                value = default() if callable(default) else default
+                if value is missing:
+                    continue
+            if value is not None and convert is not None:
+                value = convert(value)
+            result[key] = value
+        return result
+
+    return serialize
+
+
+__all__ = ["Serializer", "compile_schema"]
@@ -12,6 +12,11 @@ class ProjectSchema(BaseSchema):
     name = fields.Str(required=True, validate=validate.Length(min=1, max=120))
     description = fields.Str(allow_none=True)
     created_by = fields.Int(dump_only=True)
+    task_count = fields.Int(dump_only=True)
+    todo_count = fields.Int(dump_only=True)
+    in_progress_count = fields.Int(dump_only=True)
+    done_count = fields.Int(dump_only=True)
+    canceled_count = fields.Int(dump_only=True)
     created_at = fields.DateTime(dump_only=True)
     updated_at = fields.DateTime(dump_only=True)
 
@@ -0,0 +1,93 @@
+"""Schemas for list-endpoint filter and sort query arguments."""
+
+from __future__ import annotations
+
+from datetime import UTC
+
+from marshmallow import fields, post_load, validate
+
+from ..models import TaskStatus
+from .base import BaseSchema
+
+EXPORT_FORMATS = ("ndjson", "csv", "msgpack")
+
+
+def _sort_choices(*names: str) -> list[str]:
+    """Return ascending and ``-``-prefixed descending variants of ``names``."""
+
+    return [variant for name in names for variant in (name, f"-{name}")]
+
+
+class ListQuerySchema(BaseSchema):
+    """Shared filters for list endpoints.
+
+    Only declared fields are accepted; anything else in the query string (such
+    as pagination arguments) is ignored. Subclasses restrict ``sort`` to the
+    orderings their indexes serve.
+    """
+
+    updated_since = fields.AwareDateTime(default_timezone=UTC)
+    sort = fields.Str(validate=validate.OneOf(_sort_choices("id")))
+
+    @post_load
+    def normalize_timestamps(self, data, **kwargs):
+        """Compare timestamps in UTC, matching how they are stored."""
+
+        if data.get("updated_since") is not None:
+            data["updated_since"] = data["updated_since"].astimezone(UTC)
+        return data
+
+
+class ProjectQuerySchema(ListQuerySchema):
+    """Filters accepted by ``GET /projects``."""
+
+    created_by = fields.Int()
+    sort = fields.Str(validate=validate.OneOf(_sort_choices("id", "name", "updated_at")))
+
+
+class TaskQuerySchema(ListQuerySchema):
+    """Filters accepted by ``GET /projects/<id>/tasks``."""
+
+    status = fields.Str(validate=validate.OneOf(TaskStatus.ALL))
+    assigned_to = fields.Int()
+    due_before = fields.Date()
+    due_after = fields.Date()
+    sort = fields.Str(
+        validate=validate.OneOf(_sort_choices("id", "due_date", "updated_at"))
+    )
+
+
+class ExportQuerySchema(BaseSchema):
+    """Format and resume arguments for export endpoints.
+
+    Exports always stream in primary key order, so ``after_id`` (the last id a
+    client received) is enough to resume an interrupted download.
+    """
+
+    format = fields.Str(validate=validate.OneOf(EXPORT_FORMATS))
+    after_id = fields.Int(validate=validate.Range(min=0))
+
+
+class ProjectExportQuerySchema(ExportQuerySchema, ProjectQuerySchema):
+    """Arguments accepted by ``GET /projects/export``."""
+
+    class Meta(BaseSchema.Meta):
+        exclude = ("sort",)
+
+
+class TaskExportQuerySchema(ExportQuerySchema, TaskQuerySchema):
+    """Arguments accepted by ``GET /projects/<id>/tasks/export``."""
+
+    class Meta(BaseSchema.Meta):
+        exclude = ("sort",)
+
+
+__all__ = [
+    "EXPORT_FORMATS",
+    "ExportQuerySchema",
+    "ListQuerySchema",
+    "ProjectExportQuerySchema",
+    "ProjectQuerySchema",
+    "TaskExportQuerySchema",
+    "TaskQuerySchema",
+]
@@ -0,0 +1,19 @@
+"""Schema for search results."""
+
+from marshmallow import fields
+
+from .base import BaseSchema
+
+
+class SearchResultSchema(BaseSchema):
+    """Serialises rows returned by :class:`~app.repositories.SearchRepository`."""
+
+    type = fields.Str(attribute="kind", dump_only=True)
+    id = fields.Int(attribute="ref_id", dump_only=True)
+    project_id = fields.Int(dump_only=True)
+    title = fields.Str(dump_only=True)
+    snippet = fields.Str(dump_only=True)
+    rank = fields.Float(dump_only=True)
+
+
+__all__ = ["SearchResultSchema"]
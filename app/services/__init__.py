@@ -1,29 +1,71 @@
 """Service layer modules bundle domain logic away from Flask routes."""
 
-from .auth_service import authenticate_user_and_issue_token
+from .auth_service import (
+    authenticate_user_and_issue_token,
+    issue_tokens_for_login,
+    refresh_access_token,
+    revoke_refresh_token,
+)
 from .project_service import (
     create_project,
     delete_project,
+    export_projects,
     get_project,
     list_projects,
+    project_list_stamp,
     update_project,
 )
-from .task_service import create_task, list_tasks, update_task
-from .user_service import create_user, delete_user, get_user, list_users, update_user
+from .search_service import search
+from .task_service import (
+    bulk_update_tasks,
+    create_task,
+    create_tasks_batch,
+    export_tasks,
+    list_tasks,
+    task_list_stamp,
+    update_task,
+    update_tasks_matching,
+)
+from .user_service import (
+    IMPORT_FORMATS,
+    create_user,
+    delete_user,
+    get_user,
+    import_users,
+    iter_import_records,
+    list_users,
+    update_user,
+    user_list_stamp,
+)
 
 __all__ = [
     "authenticate_user_and_issue_token",
+    "issue_tokens_for_login",
+    "refresh_access_token",
+    "revoke_refresh_token",
     "create_project",
     "delete_project",
+    "export_projects",
     "get_project",
     "list_projects",
+    "project_list_stamp",
     "update_project",
+    "search",
     "create_task",
+    "create_tasks_batch",
+    "export_tasks",
     "list_tasks",
+    "task_list_stamp",
     "update_task",
+    "bulk_update_tasks",
+    "update_tasks_matching",
+    "IMPORT_FORMATS",
     "create_user",
     "delete_user",
     "get_user",
+    "import_users",
+    "iter_import_records",
     "list_users",
     "update_user",
+    "user_list_stamp",
 ]
@@ -2,15 +2,24 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from datetime import UTC, datetime
+from typing import Any, Dict, Optional
 
 from flask import Request, request
 from sqlalchemy.exc import NoResultFound
 
-from ..errors import UnauthorizedError
-from ..auth import generate_access_token
+from ..errors import TooManyRequestsError, UnauthorizedError
+from ..auth import (
+    generate_access_token,
+    generate_refresh_token,
+    hash_refresh_token,
+    load_principal,
+)
 from ..extensions import db
-from ..repositories import UserRepository
+from ..hashing import get_password_hasher
+from ..login_backoff import get_login_backoff, seconds_to_retry
+from ..models import User
+from ..repositories import RefreshTokenRepository, UserRepository
 
 
 def _get_authorization(request_obj: Optional[Request] = None):
@@ -20,23 +29,90 @@ def _get_authorization(request_obj: Optional[Request] = None):
     return req.authorization
 
 
-def authenticate_user_and_issue_token() -> str:
-    """Validate HTTP basic credentials and issue an access token."""
+def _get_refresh_token(payload: Dict[str, Any]) -> str:
+    """Extract the refresh token from a JSON payload."""
+
+    token = payload.get("refresh_token")
+    if not isinstance(token, str) or not token.strip():
+        raise UnauthorizedError("Refresh token required.")
+    return token.strip()
+
+
+def _authenticate_basic_credentials() -> User:
+    """Validate HTTP basic credentials and return the matching user."""
 
     auth = _get_authorization()
     if not auth or not auth.username or not auth.password:
         raise UnauthorizedError("Credentials required.")
 
+    backoff = get_login_backoff()
+    remaining = backoff.retry_after(auth.username)
+    if remaining is not None:
+        raise TooManyRequestsError(
+            "Too many failed login attempts, please try again later.",
+            retry_after=seconds_to_retry(remaining),
+        )
+
     repo = UserRepository(db.session)
     try:
-        user = repo.get_by_email(auth.username)
+        user = repo.get_by_email(auth.username, profile="credentials")
     except NoResultFound as exc:
+        backoff.record_failure(auth.username)
         raise UnauthorizedError("Invalid email or password.") from exc
 
-    if not user.check_password(auth.password):
+    hasher = get_password_hasher()
+    if not hasher.verify(user.password_hash, auth.password):
+        backoff.record_failure(auth.username)
         raise UnauthorizedError("Invalid email or password.")
 
-    return generate_access_token(user)
+    backoff.record_success(auth.username)
+    if hasher.needs_rehash(user.password_hash):
+        repo.update(user, {"password_hash": hasher.hash(auth.password)})
+    return user
+
+
+def authenticate_user_and_issue_token() -> str:
+    """Validate HTTP basic credentials and issue an access token."""
+
+    return generate_access_token(_authenticate_basic_credentials())
+
+
+def issue_tokens_for_login() -> Dict[str, str]:
+    """Validate HTTP basic credentials and issue access and refresh tokens."""
+
+    user = _authenticate_basic_credentials()
+    return {
+        "access_token": generate_access_token(user),
+        "refresh_token": generate_refresh_token(user),
+    }
+
+
+def refresh_access_token(payload: Dict[str, Any]) -> str:
+    """Exchange a valid refresh token for a new access token without hashing."""
+
+    token_hash = hash_refresh_token(_get_refresh_token(payload))
+    repo = RefreshTokenRepository(db.session)
+    user_id = repo.get_active_user_id(token_hash, datetime.now(UTC))
+    if user_id is None:
+        raise UnauthorizedError("Invalid or expired refresh token.")
+
+    principal = load_principal(user_id)
+    if principal is None:
+        raise UnauthorizedError("User referenced by token no longer exists.")
+
+    return generate_access_token(principal)
+
+
+def revoke_refresh_token(payload: Dict[str, Any]) -> None:
+    """Revoke a refresh token so it can no longer be exchanged."""
+
+    token_hash = hash_refresh_token(_get_refresh_token(payload))
+    RefreshTokenRepository(db.session).revoke(token_hash, datetime.now(UTC))
 
 
-__all__ = ["authenticate_user_and_issue_token"]
+__all__ = [
+    "authenticate_user_and_issue_token",
+    "issue_tokens_for_login",
+    "refresh_access_token",
+    "revoke_refresh_token",
+]
@@ -2,15 +2,16 @@
 
 from __future__ import annotations
 
-from typing import Dict, Tuple
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
 
-from flask import g
+from flask import current_app, g
 from sqlalchemy.exc import NoResultFound
 
 from ..errors import BusinessValidationError, NotFoundError
 from ..extensions import db
 from ..models import Project
-from ..repositories import ProjectRepository
+from ..repositories import TOTAL_EXACT, Cursor, ProjectRepository
 from .validators import ensure_immutable_fields_not_modified
 
 
@@ -30,20 +31,60 @@ def create_project(data: Dict) -> Project:
     return repo.create(payload)
 
 
-def list_projects(*, page: int, per_page: int) -> Tuple[list[Project], dict]:
-    """Return a paginated list of projects."""
+def list_projects(
+    *,
+    page: int,
+    per_page: int,
+    cursor: Optional[Cursor] = None,
+    total: str = TOTAL_EXACT,
+    filters: Optional[Dict[str, Any]] = None,
+    sort: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[list[Project], dict]:
+    """Return a paginated, optionally filtered and sorted list of projects."""
 
     repo = ProjectRepository(db.session)
-    items, meta = repo.list(page=page, per_page=per_page)
+    items, meta = repo.list(
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        total=total,
+        filters=filters,
+        sort=sort,
+        profile="list",
+        fields=fields,
+    )
     return list(items), meta
 
 
-def get_project(project_id: int) -> Project:
+def project_list_stamp() -> Tuple[int, Optional[datetime]]:
+    """Return the change stamp validating cached project listings."""
+
+    return ProjectRepository(db.session).change_stamp()
+
+
+def export_projects(
+    *,
+    filters: Optional[Dict[str, Any]] = None,
+    after_id: Optional[int] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Return a row iterator over projects for streaming exports."""
+
+    return ProjectRepository(db.session).iter_rows(
+        filters=filters,
+        after_id=after_id,
+        batch_size=current_app.config["EXPORT_BATCH_SIZE"],
+        fields=fields,
+    )
+
+
+def get_project(project_id: int, *, fields: Optional[Sequence[str]] = None) -> Project:
     """Fetch a project or raise a 404 error."""
 
     repo = ProjectRepository(db.session)
     try:
-        return repo.get_by_id(project_id)
+        return repo.get_by_id(project_id, profile="detail", fields=fields)
     except NoResultFound as exc:
         raise NotFoundError("Project not found.") from exc
 
@@ -53,7 +94,7 @@ def update_project(project_id: int, payload: Dict, data: Dict) -> Project:
 
     repo = ProjectRepository(db.session)
     try:
-        project = repo.get_by_id(project_id)
+        project = repo.get_by_id(project_id, profile="detail")
     except NoResultFound as exc:
         raise NotFoundError("Project not found.") from exc
 
@@ -75,7 +116,9 @@ def delete_project(project_id: int) -> None:
 __all__ = [
     "create_project",
     "delete_project",
+    "export_projects",
     "get_project",
     "list_projects",
+    "project_list_stamp",
     "update_project",
 ]
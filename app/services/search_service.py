@@ -0,0 +1,41 @@
+"""Business logic for full-text search."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..errors import BusinessValidationError
+from ..extensions import db
+from ..repositories import Cursor, SearchRepository, search_terms
+
+
+def _is_search_key(key: Tuple[Any, ...]) -> bool:
+    """Return whether ``key`` is a ``(rank, doc_id)`` search position."""
+
+    if len(key) != 2:
+        return False
+    rank, doc_id = key
+    return (
+        isinstance(rank, (int, float))
+        and not isinstance(rank, bool)
+        and isinstance(doc_id, int)
+        and not isinstance(doc_id, bool)
+    )
+
+
+def search(
+    query: Optional[str], *, per_page: int, cursor: Optional[Cursor] = None
+) -> Tuple[List[Dict[str, Any]], dict]:
+    """Search project and task text, best matches first."""
+
+    if not query or not search_terms(query):
+        raise BusinessValidationError("Query parameter 'q' must contain a search term.")
+    if cursor is not None and not _is_search_key(tuple(cursor.key)):
+        # Cursors from other listings decode fine but carry a different key.
+        raise BusinessValidationError("Invalid pagination cursor.")
+
+    repo = SearchRepository(db.session)
+    return repo.search(query, per_page=per_page, cursor=cursor)
+
+
+__all__ = ["search"]
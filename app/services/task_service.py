@@ -2,15 +2,32 @@
 
 from __future__ import annotations
 
-from datetime import date
-from typing import Dict, Tuple
-
+from datetime import date, datetime
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from flask import current_app
 from sqlalchemy.exc import NoResultFound
 
 from ..errors import BusinessValidationError, NotFoundError
 from ..extensions import db
 from ..models import Task
-from ..repositories import ProjectRepository, TaskRepository, UserRepository
+from ..repositories import (
+    TOTAL_EXACT,
+    Cursor,
+    ProjectRepository,
+    TaskRepository,
+    UserRepository,
+)
 from .validators import ensure_immutable_fields_not_modified
 
 IMMUTABLE_FIELDS = {"id", "created_at", "updated_at", "project_id"}
@@ -30,7 +47,7 @@ def _ensure_assignee_exists(user_repo: UserRepository, assignee_id: int | None)
     if assignee_id is None:
         return
     try:
-        user_repo.get_by_id(assignee_id)
+        user_repo.get_by_id(assignee_id, profile="reference")
     except NoResultFound as exc:
         raise NotFoundError(f"User with ID {assignee_id} does not exist.") from exc
 
@@ -43,7 +60,7 @@ def create_task(project_id: int, data: Dict) -> Task:
     user_repo = UserRepository(db.session)
 
     try:
-        project = project_repo.get_by_id(project_id)
+        project = project_repo.get_by_id(project_id, profile="reference")
     except NoResultFound as exc:
         raise NotFoundError(f"Project with ID {project_id} does not exist.") from exc
 
@@ -56,21 +73,206 @@ def create_task(project_id: int, data: Dict) -> Task:
     return task_repo.create(payload)
 
 
-def list_tasks(project_id: int, *, page: int, per_page: int) -> Tuple[list[Task], dict]:
-    """List tasks for a project with pagination."""
+def create_tasks_batch(
+    project_id: int, valid: Mapping[int, Dict], invalid: Mapping[int, Any]
+) -> List[Dict[str, Any]]:
+    """Create many tasks for a project in one transaction.
+
+    ``valid`` maps input positions to loaded payloads and ``invalid`` maps
+    positions to schema errors. Assignees are checked with one ``IN`` query;
+    items referencing unknown users are reported instead of inserted. Returns
+    one result per input position, in order.
+    """
+
+    project_repo = ProjectRepository(db.session)
+    task_repo = TaskRepository(db.session)
+    user_repo = UserRepository(db.session)
+
+    try:
+        project_repo.get_by_id(project_id, profile="reference")
+    except NoResultFound as exc:
+        raise NotFoundError(f"Project with ID {project_id} does not exist.") from exc
+
+    known_users = user_repo.existing_ids(
+        data["assigned_to"]
+        for data in valid.values()
+        if data.get("assigned_to") is not None
+    )
+
+    results: Dict[int, Dict[str, Any]] = {
+        index: {
+            "index": index,
+            "status": 400,
+            "error": "validation_error",
+            "messages": messages,
+        }
+        for index, messages in invalid.items()
+    }
+    accepted: List[int] = []
+    for index, data in valid.items():
+        assignee_id = data.get("assigned_to")
+        if assignee_id is not None and assignee_id not in known_users:
+            results[index] = {
+                "index": index,
+                "status": 404,
+                "error": "not_found",
+                "message": f"User with ID {assignee_id} does not exist.",
+            }
+        else:
+            accepted.append(index)
+
+    created = task_repo.create_many(project_id, [valid[index] for index in accepted])
+    for index, task in zip(accepted, created):
+        results[index] = {"index": index, "status": 201, "task": task}
+
+    return [results[index] for index in sorted(results)]
+
+
+def list_tasks(
+    project_id: int,
+    *,
+    page: int,
+    per_page: int,
+    cursor: Optional[Cursor] = None,
+    total: str = TOTAL_EXACT,
+    filters: Optional[Dict[str, Any]] = None,
+    sort: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[list[Task], dict]:
+    """List tasks for a project with pagination, filtering and sorting."""
 
     project_repo = ProjectRepository(db.session)
     task_repo = TaskRepository(db.session)
 
     try:
-        project_repo.get_by_id(project_id)
+        project_repo.get_by_id(project_id, profile="reference")
     except NoResultFound as exc:
         raise NotFoundError(f"Project with ID {project_id} does not exist.") from exc
 
-    items, meta = task_repo.list_by_project(project_id, page=page, per_page=per_page)
+    items, meta = task_repo.list_by_project(
+        project_id,
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        total=total,
+        filters=filters,
+        sort=sort,
+        profile="list",
+        fields=fields,
+    )
     return list(items), meta
 
 
+def task_list_stamp(project_id: int) -> Optional[Tuple[int, Optional[datetime]]]:
+    """Return the change stamp of a project's task listing, ``None`` if missing."""
+
+    return TaskRepository(db.session).project_change_stamp(project_id)
+
+
+def export_tasks(
+    project_id: int,
+    *,
+    filters: Optional[Dict[str, Any]] = None,
+    after_id: Optional[int] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Return a row iterator over a project's tasks for streaming exports.
+
+    The project is checked eagerly so a missing one is a 404 rather than an
+    error halfway through a streamed body.
+    """
+
+    try:
+        ProjectRepository(db.session).get_by_id(project_id, profile="reference")
+    except NoResultFound as exc:
+        raise NotFoundError(f"Project with ID {project_id} does not exist.") from exc
+
+    return TaskRepository(db.session).iter_by_project(
+        project_id,
+        filters=filters,
+        after_id=after_id,
+        batch_size=current_app.config["EXPORT_BATCH_SIZE"],
+        fields=fields,
+    )
+
+
+def _ensure_assignees_exist(user_repo: UserRepository, changes: Iterable[Dict]) -> None:
+    """Check every referenced assignee exists with a single ``IN`` query."""
+
+    wanted = {
+        data["assigned_to"] for data in changes if data.get("assigned_to") is not None
+    }
+    missing = wanted - user_repo.existing_ids(wanted)
+    if missing:
+        raise NotFoundError(
+            f"Users with IDs {sorted(missing)} do not exist.",
+            details={"user_ids": sorted(missing)},
+        )
+
+
+def _validate_bulk_changes(payload: Dict, data: Dict) -> None:
+    """Apply the single-task update rules to one bulk change set."""
+
+    ensure_immutable_fields_not_modified(payload, IMMUTABLE_FIELDS)
+    if not data:
+        raise BusinessValidationError("Each change set must modify at least one field.")
+    _ensure_due_date_is_valid(data)
+
+
+def bulk_update_tasks(
+    project_id: int, items: Sequence[Tuple[int, Dict, Dict]]
+) -> List[int]:
+    """Apply per-task change sets as set-based UPDATEs in one transaction.
+
+    ``items`` holds ``(task_id, raw_changes, loaded_changes)`` triples. Tasks
+    sharing an identical change set are updated by a single statement.
+    Returns the updated task ids.
+    """
+
+    project_repo = ProjectRepository(db.session)
+    task_repo = TaskRepository(db.session)
+    user_repo = UserRepository(db.session)
+
+    for _, payload, data in items:
+        _validate_bulk_changes(payload, data)
+    _ensure_assignees_exist(user_repo, (data for _, _, data in items))
+
+    try:
+        project_repo.get_by_id(project_id, profile="reference")
+    except NoResultFound as exc:
+        raise NotFoundError(f"Project with ID {project_id} does not exist.") from exc
+
+    groups: Dict[Tuple, List[int]] = {}
+    for task_id, _, data in items:
+        groups.setdefault(tuple(sorted(data.items())), []).append(task_id)
+
+    try:
+        return task_repo.update_by_ids(
+            project_id, [(dict(changes), ids) for changes, ids in groups.items()]
+        )
+    except NoResultFound as exc:
+        raise NotFoundError(str(exc)) from exc
+
+
+def update_tasks_matching(
+    project_id: int, filters: Dict, payload: Dict, data: Dict
+) -> List[int]:
+    """Apply one change set to every project task matching ``filters``."""
+
+    if not filters:
+        raise BusinessValidationError("A bulk update filter must not be empty.")
+    _validate_bulk_changes(payload, data)
+    _ensure_assignees_exist(UserRepository(db.session), [data])
+
+    project_repo = ProjectRepository(db.session)
+    try:
+        project_repo.get_by_id(project_id, profile="reference")
+    except NoResultFound as exc:
+        raise NotFoundError(f"Project with ID {project_id} does not exist.") from exc
+
+    return TaskRepository(db.session).update_matching(project_id, data, filters)
+
+
 def update_task(project_id: int, task_id: int, payload: Dict, data: Dict) -> Task:
     """Update an existing task ensuring it belongs to the project."""
 
@@ -78,7 +280,9 @@ def update_task(project_id: int, task_id: int, payload: Dict, data: Dict) -> Tas
     user_repo = UserRepository(db.session)
 
     try:
-        task = task_repo.get_by_project_and_id(project_id, task_id)
+        task = task_repo.get_by_project_and_id(
+            project_id, task_id, profile="detail"
+        )
     except NoResultFound as exc:
         raise NotFoundError(
             f"Task with ID {task_id} does not belong to project {project_id}."
@@ -92,4 +296,13 @@ def update_task(project_id: int, task_id: int, payload: Dict, data: Dict) -> Tas
     return task_repo.update(task, data)
 
 
-__all__ = ["create_task", "list_tasks", "update_task"]
+__all__ = [
+    "bulk_update_tasks",
+    "create_task",
+    "create_tasks_batch",
+    "export_tasks",
+    "list_tasks",
+    "task_list_stamp",
+    "update_task",
+    "update_tasks_matching",
+]
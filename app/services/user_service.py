@@ -2,17 +2,42 @@
 
 from __future__ import annotations
 
-from typing import Dict, Tuple
+import csv
+import io
+import json
+from datetime import UTC, datetime
+from itertools import islice
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
-from sqlalchemy.exc import NoResultFound
+from flask import current_app
+from marshmallow import ValidationError
+from sqlalchemy.exc import IntegrityError, NoResultFound
 
+from ..auth import invalidate_principal
 from ..errors import BusinessValidationError, NotFoundError
 from ..extensions import db
+from ..hashing import bulk_password_hasher, hash_password
 from ..models import User
-from ..repositories import UserRepository
+from ..repositories import TOTAL_EXACT, Cursor, RefreshTokenRepository, UserRepository
+from ..schemas import UserSchema
 from .validators import ensure_immutable_fields_not_modified
 
 IMMUTABLE_FIELDS = {"id", "created_at", "updated_at"}
+IMPORT_FORMATS = ("ndjson", "csv")
+CONSTRAINT_MSG = "Row violates a database constraint."
+
+ImportRecord = Tuple[int, Any, Optional[Dict[str, Any]]]
 
 
 def create_user(data: Dict) -> User:
@@ -23,26 +48,46 @@ def create_user(data: Dict) -> User:
         raise BusinessValidationError("Password is required.")
 
     user = User(**data)
-    user.set_password(password)
+    user.password_hash = hash_password(password)
 
     repo = UserRepository(db.session)
     return repo.create(user)
 
 
-def list_users(*, page: int, per_page: int) -> Tuple[list[User], dict]:
+def list_users(
+    *,
+    page: int,
+    per_page: int,
+    cursor: Optional[Cursor] = None,
+    total: str = TOTAL_EXACT,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[list[User], dict]:
     """Return a paginated list of users."""
 
     repo = UserRepository(db.session)
-    items, meta = repo.list(page=page, per_page=per_page)
+    items, meta = repo.list(
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        total=total,
+        profile="list",
+        fields=fields,
+    )
     return list(items), meta
 
 
-def get_user(user_id: int) -> User:
+def user_list_stamp() -> Tuple[int, Optional[datetime]]:
+    """Return the change stamp validating cached user listings."""
+
+    return UserRepository(db.session).change_stamp()
+
+
+def get_user(user_id: int, *, fields: Optional[Sequence[str]] = None) -> User:
     """Fetch a user or raise a 404 error."""
 
     repo = UserRepository(db.session)
     try:
-        return repo.get_by_id(user_id)
+        return repo.get_by_id(user_id, profile="detail", fields=fields)
     except NoResultFound as exc:
         raise NotFoundError("User not found.") from exc
 
@@ -52,7 +97,7 @@ def update_user(user_id: int, payload: Dict, data: Dict) -> User:
 
     repo = UserRepository(db.session)
     try:
-        user = repo.get_by_id(user_id)
+        user = repo.get_by_id(user_id, profile="detail")
     except NoResultFound as exc:
         raise NotFoundError("User not found.") from exc
 
@@ -60,9 +105,13 @@ def update_user(user_id: int, payload: Dict, data: Dict) -> User:
 
     password = data.pop("password", None)
     if password:
-        user.set_password(password)
+        user.password_hash = hash_password(password)
 
-    return repo.update(user, data)
+    updated = repo.update(user, data)
+    if password:
+        RefreshTokenRepository(db.session).revoke_for_user(user_id, datetime.now(UTC))
+    invalidate_principal(user_id)
+    return updated
 
 
 def delete_user(user_id: int) -> None:
@@ -73,12 +122,158 @@ def delete_user(user_id: int) -> None:
         repo.delete(user_id)
     except NoResultFound as exc:
         raise NotFoundError("User not found.") from exc
+    invalidate_principal(user_id)
+
+
+def iter_import_records(stream: IO[bytes], fmt: str) -> Iterator[ImportRecord]:
+    """Parse a UTF-8 NDJSON or CSV byte stream one record at a time.
+
+    Yields ``(row, record, errors)`` with 1-based row numbers; rows that cannot
+    be parsed carry ``errors`` instead of aborting the import. Blank NDJSON
+    lines are skipped.
+    """
+
+    if fmt not in IMPORT_FORMATS:
+        raise BusinessValidationError(
+            f"Import format must be one of {', '.join(IMPORT_FORMATS)}."
+        )
+    if not isinstance(stream, io.BufferedIOBase):
+        stream = io.BufferedReader(stream)
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(text)
+            for row, record in enumerate(reader, start=1):
+                # Empty cells count as missing; surplus cells land under None.
+                yield row, {
+                    key: value
+                    for key, value in record.items()
+                    if key is not None and value not in (None, "")
+                }, None
+            return
+
+        row = 0
+        for line in text:
+            if not line.strip():
+                continue
+            row += 1
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield row, None, {"_schema": [f"Malformed JSON: {exc}."]}
+                continue
+            if not isinstance(record, dict):
+                yield row, None, {"_schema": ["Expected a JSON object."]}
+                continue
+            yield row, record, None
+    except UnicodeDecodeError as exc:
+        raise BusinessValidationError("Import body must be UTF-8 encoded.") from exc
+
+
+def _invalid(row: int, messages: Any) -> Dict[str, Any]:
+    return {"row": row, "status": 400, "error": "validation_error", "messages": messages}
+
+
+def _is_email_conflict(err: IntegrityError) -> bool:
+    return "users.email" in str(getattr(err, "orig", err)).lower()
+
+
+def _duplicate(row: int, email: str) -> Dict[str, Any]:
+    return {
+        "row": row,
+        "status": 409,
+        "error": "conflict",
+        "email": email,
+        "message": "A user with this email already exists.",
+    }
+
+
+def _import_chunk(
+    repo: UserRepository,
+    hash_many,
+    chunk: List[ImportRecord],
+) -> List[Dict[str, Any]]:
+    """Validate, hash and insert one chunk; returns its results in row order."""
+
+    schema = UserSchema()
+    results: Dict[int, Dict[str, Any]] = {}
+    loaded: List[Tuple[int, Dict[str, Any]]] = []
+    for row, record, errors in chunk:
+        if errors is not None:
+            results[row] = _invalid(row, errors)
+            continue
+        try:
+            loaded.append((row, schema.load(record)))
+        except ValidationError as err:
+            results[row] = _invalid(row, err.messages)
+
+    existing = repo.existing_emails(data["email"] for _, data in loaded)
+    accepted: List[Tuple[int, Dict[str, Any]]] = []
+    for row, data in loaded:
+        if data["email"] in existing:
+            results[row] = _duplicate(row, data["email"])
+        else:
+            existing.add(data["email"])
+            accepted.append((row, data))
+
+    hashes = hash_many([data.pop("password") for _, data in accepted])
+    rows = [
+        {**data, "password_hash": password_hash}
+        for (_, data), password_hash in zip(accepted, hashes)
+    ]
+    rejected: Set[str] = set()
+    try:
+        created = repo.create_many(rows)
+    except IntegrityError:
+        # Another writer took an email since the lookup, or a row breaks some
+        # other constraint; settle row by row so only those rows are reported.
+        created = {}
+        for values in rows:
+            try:
+                created.update(repo.create_many([values]))
+            except IntegrityError as exc:
+                if not _is_email_conflict(exc):
+                    rejected.add(values["email"])
+
+    for row, data in accepted:
+        email = data["email"]
+        if email in created:
+            results[row] = {"row": row, "status": 201, "id": created[email], "email": email}
+        elif email in rejected:
+            results[row] = _invalid(row, {"_schema": [CONSTRAINT_MSG]})
+        else:
+            results[row] = _duplicate(row, email)
+    return [results[row] for row in sorted(results)]
+
+
+def import_users(
+    records: Iterable[ImportRecord], *, chunk_size: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """Create users from parsed records, one transaction per chunk.
+
+    Passwords of each chunk are hashed in parallel on the bulk hashing pool.
+    Yields one result per row: ``201`` with the new id, ``400`` for invalid
+    rows and ``409`` for emails that already exist (in the database or
+    earlier in the import); none of these abort the remaining rows.
+    """
+
+    chunk_size = chunk_size or current_app.config["USER_IMPORT_CHUNK_SIZE"]
+    repo = UserRepository(db.session)
+    records = iter(records)
+    with bulk_password_hasher() as hash_many:
+        while chunk := list(islice(records, chunk_size)):
+            yield from _import_chunk(repo, hash_many, chunk)
 
 
 __all__ = [
+    "IMPORT_FORMATS",
     "create_user",
     "delete_user",
     "get_user",
+    "import_users",
+    "iter_import_records",
     "list_users",
     "update_user",
+    "user_list_stamp",
 ]
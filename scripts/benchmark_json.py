@@ -0,0 +1,87 @@
+"""Compare the stdlib and orjson JSON backends on TaskSchema list payloads."""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import timeit
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import create_app, json_provider
+from app.config import TestingConfig
+from app.models import Task, TaskStatus
+from app.schemas import TaskSchema
+
+
+def _payload(rows: int) -> dict:
+    """Return a list-endpoint style payload of ``rows`` dumped tasks."""
+
+    now = datetime.now(UTC)
+    tasks = [
+        Task(
+            id=index,
+            title=f"Task {index}",
+            description="Investigate the regression and write up findings. " * 4,
+            status=TaskStatus.ALL[index % len(TaskStatus.ALL)],
+            due_date=date.today() + timedelta(days=index % 30),
+            project_id=1,
+            assigned_to=index % 7 or None,
+            created_at=now - timedelta(minutes=index),
+            updated_at=now,
+        )
+        for index in range(1, rows + 1)
+    ]
+    return {
+        "data": TaskSchema(many=True).dump(tasks),
+        "meta": {"page": 1, "per_page": rows, "total": rows, "has_next": False},
+    }
+
+
+def _time(app, payload: dict, repeat: int, number: int) -> float:
+    """Return the median milliseconds per ``app.json.response`` call."""
+
+    with app.test_request_context():
+        timings = timeit.repeat(
+            lambda: app.json.response(payload), repeat=repeat, number=number
+        )
+    return statistics.median(timings) / number * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100, help="Tasks per payload.")
+    parser.add_argument("--number", type=int, default=200, help="Calls per sample.")
+    parser.add_argument("--repeat", type=int, default=5, help="Samples per backend.")
+    args = parser.parse_args()
+
+    app = create_app(TestingConfig)
+    with app.app_context():
+        payload = _payload(args.rows)
+
+    results = {}
+    installed = json_provider.orjson
+    try:
+        json_provider.orjson = None
+        results["json"] = _time(app, payload, args.repeat, args.number)
+    finally:
+        json_provider.orjson = installed
+    if installed is not None:
+        results["orjson"] = _time(app, payload, args.repeat, args.number)
+
+    print(f"Serialising {args.rows} TaskSchema rows per response:")
+    for backend, elapsed in results.items():
+        print(f"  {backend:<7} {elapsed:8.3f} ms")
+    if installed is None:
+        print("orjson is not installed; pip install orjson to compare.")
+    else:
+        print(f"  speedup {results['json'] / results['orjson']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
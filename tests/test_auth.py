@@ -4,9 +4,13 @@ from __future__ import annotations
 
 from base64 import b64encode
 
+import pytest
+
 from app.extensions import db
 from app.models import User
 
+from .utils import login_body
+
 
 def test_login_returns_token(client, create_user_record):
     """Valid credentials return a JWT access token."""
@@ -95,3 +99,209 @@ def test_init_admin_is_idempotent(app):
     with app.app_context():
         admins = User.query.filter_by(email=app.config["DEFAULT_ADMIN_EMAIL"]).all()
         assert len(admins) == 1
+
+
+def test_verified_tokens_are_cached(client, employee_headers):
+    """Repeated requests with the same bearer token skip JWT verification."""
+
+    from app.auth import token_cache_stats
+
+    before = token_cache_stats()
+    for _ in range(3):
+        response = client.get("/users", headers=employee_headers)
+        assert response.status_code == 200
+
+    after = token_cache_stats()
+    assert after["misses"] - before["misses"] <= 1
+    assert after["hits"] - before["hits"] >= 2
+
+
+def test_token_cache_is_dropped_when_secret_rotates(app, client, employee_headers):
+    """Tokens signed with a rotated-out key are rejected even if cached."""
+
+    assert client.get("/users", headers=employee_headers).status_code == 200
+
+    app.config["JWT_SECRET_KEY"] = "rotated-jwt-secret-key-with-enough-bytes"
+    response = client.get("/users", headers=employee_headers)
+    assert response.status_code == 401
+    assert response.get_json()["error"] == "unauthorized"
+
+
+def test_login_returns_503_when_hash_pool_is_saturated(app, client, create_user_record):
+    """A saturated hashing pool fails fast with Retry-After instead of queueing."""
+
+    import threading
+
+    from app.hashing import PasswordHasher
+
+    hasher = PasswordHasher(executor="thread", max_workers=1, max_queue=0, retry_after=7)
+    app.extensions["password_hasher"] = hasher
+    user = create_user_record(
+        name="Busy Manager", email="busy@example.com", role="manager"
+    )
+
+    started, gate = threading.Event(), threading.Event()
+
+    def _block(timeout):
+        started.set()
+        return gate.wait(timeout)
+
+    blocker = threading.Thread(target=hasher.run, args=(_block, 5))
+    blocker.start()
+    try:
+        assert started.wait(5)
+        basic_token = b64encode(f"{user.email}:Password123!".encode()).decode()
+        response = client.post(
+            "/auth/login", headers={"Authorization": f"Basic {basic_token}"}
+        )
+    finally:
+        gate.set()
+        blocker.join()
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+    assert response.get_json()["error"] == "service_unavailable"
+    assert hasher.stats()["rejected"] == 1
+
+
+def test_timed_out_hash_keeps_its_slot_until_it_finishes():
+    """A hash that outlives its timeout still counts against the pool bound."""
+
+    import threading
+
+    from app.errors import ServiceUnavailableError
+    from app.hashing import PasswordHasher
+
+    hasher = PasswordHasher(executor="thread", max_workers=1, max_queue=0, timeout=0.05)
+    gate = threading.Event()
+    try:
+        with pytest.raises(ServiceUnavailableError):
+            hasher.run(gate.wait, 5)
+        assert hasher.stats()["in_flight"] == 1
+
+        with pytest.raises(ServiceUnavailableError):
+            hasher.run(lambda: None)
+        assert hasher.stats()["rejected"] == 1
+    finally:
+        gate.set()
+        hasher.shutdown()
+    assert hasher.stats()["in_flight"] == 0
+
+
+def test_login_backoff_blocks_account_before_hashing(app, client, create_user_record):
+    """Repeated failures for one email are rejected without verifying the password."""
+
+    from app.hashing import get_password_hasher
+    from app.login_backoff import get_login_backoff
+
+    app.config["LOGIN_RATE_LIMIT"] = "100 per minute"
+    user = create_user_record(
+        name="Target Manager", email="target@example.com", role="manager"
+    )
+
+    wrong = b64encode(f"{user.email}:WrongPass123!".encode()).decode()
+    for _ in range(app.config["LOGIN_BACKOFF_THRESHOLD"]):
+        response = client.post("/auth/login", headers={"Authorization": f"Basic {wrong}"})
+        assert response.status_code == 401
+
+    hashes_before = get_password_hasher().stats()["completed"]
+    correct = b64encode(f"{user.email.upper()}:Password123!".encode()).decode()
+    response = client.post("/auth/login", headers={"Authorization": f"Basic {correct}"})
+
+    assert response.status_code == 429
+    assert response.get_json()["error"] == "rate_limit_exceeded"
+    assert int(response.headers["Retry-After"]) >= 1
+    assert get_password_hasher().stats()["completed"] == hashes_before
+    assert get_login_backoff().stats()["blocked"] == 1
+
+
+def test_refresh_token_issues_new_access_token(client, create_user_record):
+    """A refresh token can be exchanged for a working access token."""
+
+    user = create_user_record(name="Rita Refresh", email="rita@example.com", role="employee")
+    body = login_body(client, user.email, "Password123!")
+    assert body["refresh_token"]
+    assert body["expires_in"] == client.application.config["JWT_ACCESS_TOKEN_EXPIRES"]
+
+    response = client.post("/auth/refresh", json={"refresh_token": body["refresh_token"]})
+    assert response.status_code == 200
+    access_token = response.get_json()["access_token"]
+
+    users_response = client.get("/users", headers={"Authorization": f"Bearer {access_token}"})
+    assert users_response.status_code == 200
+
+
+def test_revoked_refresh_token_is_rejected(client, create_user_record):
+    """Revoked or unknown refresh tokens cannot be exchanged."""
+
+    user = create_user_record(name="Rex Revoke", email="rex@example.com", role="employee")
+    refresh_token = login_body(client, user.email, "Password123!")["refresh_token"]
+
+    assert client.post("/auth/revoke", json={"refresh_token": refresh_token}).status_code == 200
+
+    response = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 401
+    assert client.post("/auth/refresh", json={}).status_code == 401
+
+
+def test_password_change_revokes_refresh_tokens(client, manager_headers, create_user_record):
+    """Changing a password invalidates previously issued refresh tokens."""
+
+    user = create_user_record(name="Pat Password", email="pat@example.com", role="employee")
+    refresh_token = login_body(client, user.email, "Password123!")["refresh_token"]
+
+    response = client.put(
+        f"/users/{user.id}",
+        json={"password": "BrandNewPass123!"},
+        headers=manager_headers,
+    )
+    assert response.status_code == 200
+
+    response = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 401
+
+
+def test_calibrate_password_hash_writes_env_file(app, tmp_path):
+    """The calibration command records the selected method in the env file."""
+
+    env_file = tmp_path / ".env"
+    env_file.write_text("SECRET_KEY=keep-me\nPASSWORD_HASH_METHOD=old\n")
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(
+        args=[
+            "calibrate-password-hash",
+            "--algorithm",
+            "pbkdf2",
+            "--target-ms",
+            "5",
+            "--samples",
+            "1",
+            "--env-file",
+            str(env_file),
+        ]
+    )
+    assert result.exit_code == 0, result.output
+
+    lines = env_file.read_text().splitlines()
+    assert "SECRET_KEY=keep-me" in lines
+    methods = [line for line in lines if line.startswith("PASSWORD_HASH_METHOD=")]
+    assert len(methods) == 1
+    assert methods[0].startswith("PASSWORD_HASH_METHOD=pbkdf2:sha256:")
+
+
+def test_login_rehashes_outdated_password_hash(app, client, create_user_record):
+    """Successful logins upgrade hashes created with outdated parameters."""
+
+    app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1000"
+    user = create_user_record(name="Old Hash", email="old.hash@example.com", role="employee")
+
+    app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:2000"
+    app.extensions.pop("password_hasher", None)
+    basic_token = b64encode(f"{user.email}:Password123!".encode()).decode()
+    response = client.post("/auth/login", headers={"Authorization": f"Basic {basic_token}"})
+    assert response.status_code == 200
+
+    refreshed = db.session.get(User, user.id)
+    assert refreshed.password_hash.startswith("pbkdf2:sha256:2000$")
+    assert refreshed.check_password("Password123!")
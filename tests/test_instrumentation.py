@@ -0,0 +1,54 @@
+"""Tests for per-request SQL instrumentation."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.instrumentation import QueryBudgetExceeded
+
+from .utils import create_project
+
+
+def test_server_timing_reports_sql_statements(client, employee_headers):
+    """Instrumented responses carry a Server-Timing entry for the database."""
+
+    response = client.get("/projects", headers=employee_headers)
+    assert response.status_code == 200
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("db;dur=")
+    assert "statements" in timing
+
+
+def test_query_budget_raises_under_testing(app, client, manager_headers):
+    """Exceeding an endpoint's budget raises instead of only logging."""
+
+    create_project(client, manager_headers)
+    app.config["SQL_QUERY_BUDGETS"] = {"api.list_projects": 0}
+
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/projects", headers=manager_headers)
+
+
+def test_query_budget_logs_when_not_raising(app, client, manager_headers, caplog):
+    """Outside testing, budget overruns are logged as warnings."""
+
+    app.config["SQL_QUERY_BUDGETS"] = {"api.list_projects": 0}
+    app.config["SQL_QUERY_BUDGET_RAISE"] = False
+
+    response = client.get("/projects", headers=manager_headers)
+    assert response.status_code == 200
+    assert "SQL query budget exceeded" in caplog.text
+
+
+def test_failed_statements_do_not_leak_start_times(app):
+    """Statements that raise leave no timing entry on the pooled connection."""
+
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    from app.extensions import db
+
+    with db.engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM no_such_table"))
+        assert connection.info.get("sql_instrumentation_started") == []
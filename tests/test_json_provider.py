@@ -0,0 +1,75 @@
+"""Tests for the application JSON provider."""
+
+from __future__ import annotations
+
+import json
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+import pytest
+
+from app import json_provider
+from app.json_provider import APIJSONProvider
+
+PAYLOAD = {
+    "b": 1,
+    "a": {"when": datetime(2024, 5, 17, 9, 30, tzinfo=UTC), "day": date(2024, 5, 17)},
+    "price": Decimal("9.90"),
+    "name": "Zoë",
+}
+EXPECTED = {
+    "b": 1,
+    "a": {"when": "2024-05-17T09:30:00+00:00", "day": "2024-05-17"},
+    "price": "9.90",
+    "name": "Zoë",
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    """Run a test against both encoders."""
+
+    if request.param == "json":
+        monkeypatch.setattr(json_provider, "orjson", None)
+    elif json_provider.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+def test_app_uses_api_provider(app):
+    """create_app installs the provider."""
+
+    assert isinstance(app.json, APIJSONProvider)
+
+
+def test_backends_produce_identical_documents(app, backend):
+    """Both encoders emit ISO dates, string decimals and unescaped UTF-8."""
+
+    provider = APIJSONProvider(app)
+    assert provider.backend == backend
+    text = provider.dumps(PAYLOAD)
+    assert json.loads(text) == EXPECTED
+    assert "Zoë" in text
+
+    with app.test_request_context():
+        response = provider.response(PAYLOAD)
+    assert response.mimetype == "application/json"
+    assert response.get_data(as_text=True).endswith("}\n")
+    assert json.loads(response.get_data()) == EXPECTED
+
+
+def test_key_order_follows_json_sort_keys(app, backend):
+    """Keys keep insertion order unless JSON_SORT_KEYS is enabled."""
+
+    assert list(json.loads(APIJSONProvider(app).dumps(PAYLOAD))) == list(PAYLOAD)
+
+    app.config["JSON_SORT_KEYS"] = True
+    text = APIJSONProvider(app).dumps(PAYLOAD)
+    assert text.index('"a"') < text.index('"b"') < text.index('"name"')
+
+
+def test_values_orjson_rejects_fall_back_to_stdlib(app, backend):
+    """Integers beyond 64 bits are still serialised."""
+
+    provider = APIJSONProvider(app)
+    assert provider.loads(provider.dumps({"big": 2**70})) == {"big": 2**70}
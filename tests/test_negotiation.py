@@ -0,0 +1,99 @@
+"""Tests for JSON/MessagePack content negotiation."""
+
+from __future__ import annotations
+
+import pytest
+
+from app import negotiation
+
+from .utils import create_project
+
+MSGPACK = "application/msgpack"
+
+
+def _msgpack_headers(headers, **extra):
+    return {**headers, "Accept": MSGPACK, **extra}
+
+
+def test_json_remains_the_default(client, manager_headers, employee_headers):
+    """Without an explicit Accept header responses are JSON and vary on Accept."""
+
+    create_project(client, manager_headers)
+    response = client.get("/projects", headers=employee_headers)
+    assert response.mimetype == "application/json"
+    assert "Accept" in response.headers["Vary"]
+
+
+def test_msgpack_responses_and_errors(client, manager_headers, employee_headers):
+    """Accept: application/msgpack switches list and error bodies to MessagePack."""
+
+    msgpack = pytest.importorskip("msgpack")
+    project = create_project(client, manager_headers, name="Packed")
+
+    response = client.get("/projects", headers=_msgpack_headers(employee_headers))
+    assert response.mimetype == MSGPACK
+    body = msgpack.unpackb(response.get_data())
+    assert body["data"][0]["name"] == "Packed"
+    assert body["data"][0]["created_at"] == project["created_at"]
+
+    missing = client.get("/projects/9999", headers=_msgpack_headers(employee_headers))
+    assert missing.status_code == 404
+    assert msgpack.unpackb(missing.get_data())["error"] == "not_found"
+
+
+def test_msgpack_request_body(client, manager_headers):
+    """Write routes accept MessagePack bodies."""
+
+    msgpack = pytest.importorskip("msgpack")
+    response = client.post(
+        "/projects",
+        data=msgpack.packb({"name": "From msgpack"}),
+        headers={**manager_headers, "Content-Type": MSGPACK},
+    )
+    assert response.status_code == 201
+    assert response.get_json()["data"]["name"] == "From msgpack"
+
+    malformed = client.post(
+        "/projects",
+        data=b"\xc1",
+        headers={**manager_headers, "Content-Type": MSGPACK},
+    )
+    assert malformed.status_code == 400
+
+
+def test_msgpack_export_stream(client, manager_headers, employee_headers):
+    """Exports can stream a sequence of MessagePack maps."""
+
+    msgpack = pytest.importorskip("msgpack")
+    for i in range(3):
+        create_project(client, manager_headers, name=f"Streamed {i}")
+
+    response = client.get(
+        "/projects/export?fields=id,name", headers=_msgpack_headers(employee_headers)
+    )
+    assert response.mimetype == MSGPACK
+    unpacker = msgpack.Unpacker()
+    unpacker.feed(response.get_data())
+    assert [row["name"] for row in unpacker] == [f"Streamed {i}" for i in range(3)]
+
+
+def test_without_msgpack_installed(
+    client, manager_headers, employee_headers, monkeypatch
+):
+    """Missing msgpack falls back to JSON and rejects MessagePack bodies."""
+
+    monkeypatch.setattr(negotiation, "msgpack", None)
+
+    response = client.get("/projects", headers=_msgpack_headers(employee_headers))
+    assert response.mimetype == "application/json"
+
+    response = client.post(
+        "/projects",
+        data=b"\x81\xa4name\xa1x",
+        headers={**manager_headers, "Content-Type": MSGPACK},
+    )
+    assert response.status_code == 415
+    assert response.get_json()["error"] == "unsupported_media_type"
+
+    response = client.get("/projects/export?format=msgpack", headers=employee_headers)
+    assert response.status_code == 422
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import csv
+import io
 import json
 
 from app.models import Task
+from app.repositories import Cursor, encode_cursor
 
-from .utils import create_project, create_task
+from .utils import create_project, create_task, sql_statements
 
 
 def test_manager_can_create_project(client, manager_headers):
@@ -130,3 +133,188 @@ def test_list_projects_rejects_invalid_page(client, manager_headers, employee_he
     response = client.get("/projects?page=0", headers=employee_headers)
     assert response.status_code == 422
     assert response.get_json()["error"] == "business_validation_error"
+
+
+def test_list_projects_keyset_pagination(client, manager_headers, employee_headers):
+    """Cursors walk the listing forwards and backwards without offsets."""
+
+    for i in range(5):
+        create_project(client, manager_headers, name=f"Keyset {i}")
+
+    first = client.get("/projects?per_page=2", headers=employee_headers)
+    first_body = first.get_json()
+    assert [p["name"] for p in first_body["data"]] == ["Keyset 0", "Keyset 1"]
+    assert 'rel="next"' in first.headers["Link"]
+    cursor = first_body["meta"]["next_cursor"]
+
+    names = [p["name"] for p in first_body["data"]]
+    while cursor:
+        response = client.get(
+            f"/projects?per_page=2&cursor={cursor}", headers=employee_headers
+        )
+        assert response.status_code == 200
+        body = response.get_json()
+        assert "total" not in body["meta"]
+        names.extend(p["name"] for p in body["data"])
+        last_body = body
+        cursor = body["meta"]["next_cursor"]
+
+    assert names == [f"Keyset {i}" for i in range(5)]
+    assert last_body["meta"]["has_next"] is False
+
+    back = client.get(
+        f"/projects?per_page=2&cursor={last_body['meta']['prev_cursor']}",
+        headers=employee_headers,
+    )
+    assert [p["name"] for p in back.get_json()["data"]] == ["Keyset 2", "Keyset 3"]
+    assert 'rel="prev"' in back.headers["Link"]
+
+
+def test_list_projects_rejects_invalid_cursor(client, employee_headers):
+    """Tampered cursors are rejected with a business validation error."""
+
+    response = client.get("/projects?cursor=not-a-cursor", headers=employee_headers)
+    assert response.status_code == 422
+    assert response.get_json()["error"] == "business_validation_error"
+
+
+def test_list_projects_total_none_skips_count(
+    client, manager_headers, employee_headers
+):
+    """total=none omits the count and still reports whether more pages exist."""
+
+    for i in range(3):
+        create_project(client, manager_headers, name=f"Uncounted {i}")
+
+    client.get("/projects", headers=employee_headers)
+    exact = client.get("/projects?per_page=2&total=exact", headers=employee_headers)
+    response = client.get("/projects?per_page=2&total=none", headers=employee_headers)
+    assert response.status_code == 200
+    meta = response.get_json()["meta"]
+    assert "total" not in meta and "pages" not in meta
+    assert meta["has_next"] is True
+    assert sql_statements(response) == sql_statements(exact) - 1
+
+    last = client.get(
+        "/projects?per_page=2&page=2&total=none", headers=employee_headers
+    ).get_json()["meta"]
+    assert last["has_next"] is False and last["has_prev"] is True
+
+
+def test_list_projects_total_estimate_is_cached_until_write(
+    client, manager_headers, employee_headers
+):
+    """total=estimate reuses a cached count that writes invalidate."""
+
+    create_project(client, manager_headers, name="Estimated 0")
+    client.get("/projects", headers=employee_headers)
+
+    first = client.get("/projects?total=estimate", headers=employee_headers)
+    assert first.get_json()["meta"]["total"] == 1
+    assert first.get_json()["meta"]["total_estimated"] is True
+
+    cached = client.get("/projects?total=estimate", headers=employee_headers)
+    assert cached.get_json()["meta"]["total"] == 1
+    assert sql_statements(cached) == sql_statements(first) - 1
+
+    create_project(client, manager_headers, name="Estimated 1")
+    fresh = client.get("/projects?total=estimate", headers=employee_headers)
+    assert fresh.get_json()["meta"]["total"] == 2
+
+
+def test_list_projects_rejects_unknown_total_mode(client, employee_headers):
+    """Unsupported total modes are rejected."""
+
+    response = client.get("/projects?total=approximate", headers=employee_headers)
+    assert response.status_code == 422
+
+
+def test_list_projects_rejects_cursor_with_custom_sort(client, employee_headers):
+    """Cursors only follow the default id ordering."""
+
+    cursor = encode_cursor(Cursor((1,)))
+    response = client.get(
+        f"/projects?cursor={cursor}&sort=-name", headers=employee_headers
+    )
+    assert response.status_code == 422
+
+
+def test_export_projects_csv(client, manager_headers, employee_headers):
+    """Project exports honour Accept: text/csv and list filters."""
+
+    for i in range(3):
+        create_project(client, manager_headers, name=f"Exported {i}")
+
+    headers = {**employee_headers, "Accept": "text/csv"}
+    response = client.get("/projects/export", headers=headers)
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    assert 'filename="projects.csv"' in response.headers["Content-Disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row["name"] for row in rows] == [f"Exported {i}" for i in range(3)]
+    assert rows[0]["task_count"] == "0"
+
+    response = client.get("/projects/export?format=ndjson&created_by=0", headers=headers)
+    assert response.mimetype == "application/x-ndjson"
+    assert response.get_data(as_text=True) == ""
+
+
+def test_get_project_sparse_fieldset(client, manager_headers, employee_headers):
+    """Unknown or write-only field names are rejected."""
+
+    project = create_project(client, manager_headers)
+    response = client.get(
+        f"/projects/{project['id']}?fields=id,secret", headers=employee_headers
+    )
+    assert response.status_code == 422
+    assert "secret" in response.get_json()["message"]
+
+    response = client.get(
+        f"/projects/{project['id']}?fields=name", headers=employee_headers
+    )
+    assert response.get_json()["data"] == {"name": project["name"]}
+
+
+def test_list_projects_conditional_get(client, manager_headers, employee_headers):
+    """Unchanged listings are answered with 304 from the change stamp alone."""
+
+    project = create_project(client, manager_headers)
+    first = client.get("/projects", headers=employee_headers)
+    etag = first.headers["ETag"]
+
+    conditional = {**employee_headers, "If-None-Match": etag}
+    cached = client.get("/projects", headers=conditional)
+    assert cached.status_code == 304
+    assert cached.get_data() == b""
+    assert cached.headers["ETag"] == etag
+    assert sql_statements(cached) == 1
+
+    other_page = client.get("/projects?per_page=5", headers=conditional)
+    assert other_page.status_code == 200
+    assert other_page.headers["ETag"] != etag
+
+    client.put(
+        f"/projects/{project['id']}",
+        data=json.dumps({"name": "Renamed"}),
+        headers=manager_headers,
+    )
+    changed = client.get("/projects", headers=conditional)
+    assert changed.status_code == 200
+    assert changed.get_json()["data"][0]["name"] == "Renamed"
+
+
+def test_list_projects_revalidates_after_delete(
+    client, manager_headers, employee_headers
+):
+    """Deletes invalidate listings even for clients sending If-Modified-Since."""
+
+    first = create_project(client, manager_headers, name="A")
+    create_project(client, manager_headers, name="B")
+    listed = client.get("/projects", headers=employee_headers)
+    assert "Last-Modified" not in listed.headers
+
+    client.delete(f"/projects/{first['id']}", headers=manager_headers)
+    since = {**employee_headers, "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    response = client.get("/projects", headers=since)
+    assert response.status_code == 200
+    assert [p["name"] for p in response.get_json()["data"]] == ["B"]
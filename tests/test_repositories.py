@@ -2,13 +2,23 @@
 
 from __future__ import annotations
 
+from datetime import UTC, datetime, timedelta
 from uuid import uuid4
 
 import pytest
+from sqlalchemy import ForeignKey, create_engine, event, func, select, update
 from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
 
 from app.extensions import db
-from app.repositories import UserRepository
+from app.models import Project, RefreshToken, Task, User
+from app.repositories import (
+    BaseRepository,
+    ProjectRepository,
+    TaskRepository,
+    UserRepository,
+    get_identity_cache,
+)
 from app.services import create_user as create_user_service, list_users as list_users_service
 
 
@@ -60,3 +70,284 @@ def test_user_service_integration_uses_repository(app):
     users, meta = list_users_service(page=1, per_page=5)
     assert any(user.id == created.id for user in users)
     assert meta["total"] >= 1
+
+
+def test_relationships_load_only_through_named_profiles(app):
+    """Relationships raise unless the repository call requests a profile for them."""
+
+    from sqlalchemy.exc import InvalidRequestError
+
+    from app.models import Project, Task
+    from app.repositories import ProjectRepository, TaskRepository
+
+    owner = UserRepository(db.session).create(
+        {
+            "name": "Profile Owner",
+            "email": f"profile-{uuid4().hex}@example.com",
+            "role": "manager",
+            "password_hash": "hashed-password",
+        }
+    )
+    project = ProjectRepository(db.session).create(
+        Project(name="Profiled", created_by=owner.id)
+    )
+    project_id = project.id
+    TaskRepository(db.session).create(Task(title="Profiled task", project_id=project_id))
+    db.session.expunge_all()
+
+    project_repo = ProjectRepository(db.session)
+    plain = project_repo.get_by_id(project_id, profile="detail")
+    with pytest.raises(InvalidRequestError):
+        plain.tasks  # noqa: B018 - attribute access triggers the raise loader
+    db.session.expunge_all()
+
+    loaded = project_repo.get_by_id(project_id, profile="with_tasks")
+    assert [task.title for task in loaded.tasks] == ["Profiled task"]
+
+    tasks, _ = TaskRepository(db.session).list_by_project(
+        project_id, page=1, per_page=10, profile="with_assignee"
+    )
+    assert tasks[0].assignee is None
+
+    with pytest.raises(ValueError):
+        project_repo.get_by_id(project_id, profile="unknown")
+
+
+def _user(email: str) -> User:
+    return UserRepository(db.session).create(
+        {"name": "Owner", "email": email, "role": "manager", "password_hash": "x"}
+    )
+
+
+def test_user_delete_detaches_dependents(app):
+    """Deleting a user nulls references and removes their refresh tokens."""
+
+    user = _user("owner@example.com")
+    project = ProjectRepository(db.session).create(
+        {"name": "Kept", "created_by": user.id}
+    )
+    task = TaskRepository(db.session).create(
+        {"title": "Kept task", "project_id": project.id, "assigned_to": user.id}
+    )
+    db.session.add(
+        RefreshToken(
+            user_id=user.id,
+            token_hash=uuid4().hex,
+            expires_at=datetime.now(UTC) + timedelta(days=1),
+        )
+    )
+    db.session.commit()
+    project_id, task_id, user_id = project.id, task.id, user.id
+
+    UserRepository(db.session).delete(user_id)
+
+    assert db.session.get(Project, project_id).created_by is None
+    assert db.session.get(Task, task_id).assigned_to is None
+    assert db.session.scalar(select(func.count()).select_from(RefreshToken)) == 0
+
+
+def test_project_delete_cascades_in_chunks(app):
+    """Large cascades commit chunk by chunk and remove every task."""
+
+    app.config["DELETE_CHUNK_SIZE"] = 2
+    user = _user("chunks@example.com")
+    projects = ProjectRepository(db.session)
+    project = projects.create({"name": "Big", "created_by": user.id})
+    other = projects.create({"name": "Other", "created_by": user.id})
+    tasks = TaskRepository(db.session)
+    tasks.create_many(project.id, [{"title": f"T{i}"} for i in range(5)])
+    tasks.create_many(other.id, [{"title": "Survivor"}])
+    project_id = project.id
+
+    commits = []
+
+    def _count_commit(session):
+        commits.append(session)
+
+    event.listen(db.session, "after_commit", _count_commit)
+    try:
+        projects.delete(project_id)
+    finally:
+        event.remove(db.session, "after_commit", _count_commit)
+
+    assert len(commits) == 3
+    remaining = db.session.execute(select(Task.title)).scalars().all()
+    assert remaining == ["Survivor"]
+    with pytest.raises(NoResultFound):
+        projects.delete(project_id)
+
+
+class _TreeBase(DeclarativeBase):
+    pass
+
+
+class _Folder(_TreeBase):
+    __tablename__ = "folders"
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+
+class _Document(_TreeBase):
+    __tablename__ = "documents"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    folder_id: Mapped[int] = mapped_column(ForeignKey("folders.id", ondelete="CASCADE"))
+
+
+class _Comment(_TreeBase):
+    __tablename__ = "comments"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    document_id: Mapped[int] = mapped_column(
+        ForeignKey("documents.id", ondelete="CASCADE")
+    )
+
+
+class _Mention(_TreeBase):
+    __tablename__ = "mentions"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    comment_id: Mapped[int | None] = mapped_column(
+        ForeignKey("comments.id", ondelete="SET NULL")
+    )
+
+
+def test_delete_rules_recurse_through_cascades(app):
+    """Cascaded children have their own rules applied before they are removed."""
+
+    app.config["DELETE_CHUNK_SIZE"] = 2
+    engine = create_engine("sqlite://")
+    _TreeBase.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([_Folder(id=1), _Folder(id=2)])
+        session.add_all(
+            [_Document(id=i, folder_id=1 if i <= 3 else 2) for i in range(1, 5)]
+        )
+        session.add_all([_Comment(id=i, document_id=1 + i % 4) for i in range(1, 9)])
+        session.add_all([_Mention(id=i, comment_id=i) for i in range(1, 9)])
+        session.commit()
+
+        class FolderRepository(BaseRepository[_Folder]):
+            model = _Folder
+            default_ordering = (_Folder.id,)
+
+        FolderRepository(session).delete(1)
+
+        assert session.scalars(select(_Document.id)).all() == [4]
+        assert session.scalars(select(_Comment.id).order_by(_Comment.id)).all() == [3, 7]
+        assert session.execute(
+            select(_Mention.id, _Mention.comment_id).order_by(_Mention.id)
+        ).all() == [(i, i if i in (3, 7) else None) for i in range(1, 9)]
+
+
+def _statements_during(action):
+    """Run ``action`` and return its result with the SQL statements it issued."""
+
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        result = action()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+    return result, statements
+
+
+def test_identity_cache_rehydrates_without_select(app):
+    """Cached rows come back attached and SELECT-free until they are written."""
+
+    app.config["IDENTITY_CACHE_SIZE"] = 64
+    user = _user("cached@example.com")
+    projects = ProjectRepository(db.session)
+    project_id = projects.create({"name": "Cached", "created_by": user.id}).id
+    db.session.expunge_all()
+
+    projects.get_by_id(project_id, profile="reference")
+    db.session.expunge_all()
+    project, statements = _statements_during(lambda: projects.get_by_id(project_id))
+    assert statements == []
+    assert project in db.session and project.name == "Cached"
+
+    projects.update(project, {"name": "Renamed"})
+    db.session.expunge_all()
+    assert projects.get_by_id(project_id).name == "Renamed"
+
+    # Counter updates are set-based statements, which drop the whole table.
+    TaskRepository(db.session).create({"title": "Counted", "project_id": project_id})
+    db.session.expunge_all()
+    assert projects.get_by_id(project_id).task_count == 1
+
+
+def test_identity_cache_skips_uncommitted_rows(app):
+    """Rows changed in the open transaction are never snapshotted."""
+
+    app.config["IDENTITY_CACHE_SIZE"] = 64
+    users = UserRepository(db.session)
+    user_id = _user("pending@example.com").id
+    db.session.expunge_all()
+
+    user = db.session.get(User, user_id)
+    user.name = "Uncommitted"
+    db.session.flush()
+    db.session.expunge_all()
+    assert users.get_by_id(user_id).name == "Uncommitted"
+
+    db.session.rollback()
+    assert users.get_by_id(user_id).name == "Owner"
+
+
+def test_identity_cache_skips_rows_loaded_before_a_write(app, monkeypatch):
+    """Rows written between the SELECT and the snapshot are not cached stale."""
+
+    app.config["IDENTITY_CACHE_SIZE"] = 64
+    users = UserRepository(db.session)
+    user_id = _user("racing@example.com").id
+    db.session.expunge_all()
+    load = db.session.get
+
+    def _load_then_write(*args, **kwargs):
+        entity = load(*args, **kwargs)
+        with db.engine.begin() as connection:
+            connection.execute(
+                update(User).where(User.id == user_id).values(name="Written")
+            )
+        get_identity_cache().discard("users", (user_id,))
+        return entity
+
+    monkeypatch.setattr(db.session, "get", _load_then_write)
+    assert users.get_by_id(user_id).name == "Owner"
+    monkeypatch.undo()
+
+    db.session.rollback()
+    db.session.expunge_all()
+    assert users.get_by_id(user_id).name == "Written"
+
+
+def test_task_delete_uncounts_the_committed_status(app):
+    """Deleting reads the live status, not a snapshot another worker made stale."""
+
+    app.config["IDENTITY_CACHE_SIZE"] = 64
+    user = _user("stale@example.com")
+    project_id = ProjectRepository(db.session).create(
+        {"name": "Counted", "created_by": user.id}
+    ).id
+    tasks = TaskRepository(db.session)
+    task_id = tasks.create({"title": "Stale", "project_id": project_id}).id
+    db.session.expunge_all()
+    tasks.get_by_id(task_id)
+    db.session.expunge_all()
+
+    # Another worker finishes the task; this process's snapshot is not told.
+    with db.engine.begin() as connection:
+        connection.execute(update(Task).where(Task.id == task_id).values(status="done"))
+        connection.execute(
+            update(Project)
+            .where(Project.id == project_id)
+            .values(todo_count=0, done_count=1)
+        )
+    db.session.rollback()
+
+    tasks.delete(task_id)
+
+    project = db.session.get(Project, project_id)
+    db.session.refresh(project)
+    assert (project.task_count, project.todo_count, project.done_count) == (0, 0, 0)
@@ -0,0 +1,113 @@
+"""Tests for the versioned GET response cache."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.response_cache import CachedResponse, SQLiteResponseCache, get_response_cache
+
+from .utils import create_project, create_task, sql_statements
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cached_app(request, app, tmp_path):
+    """Enable the response cache with each backend."""
+
+    app.config["RESPONSE_CACHE_BACKEND"] = request.param
+    app.config["RESPONSE_CACHE_PATH"] = str(tmp_path / "responses.db")
+    return app
+
+
+def test_repeated_reads_are_served_from_cache(
+    cached_app, client, manager_headers, employee_headers
+):
+    """Identical requests skip the page query; argument order does not matter."""
+
+    create_project(client, manager_headers, name="Cached")
+
+    first = client.get("/projects?page=1&per_page=5", headers=employee_headers)
+    second = client.get("/projects?per_page=5&page=1", headers=employee_headers)
+    assert second.get_json() == first.get_json()
+    assert second.headers["Link"] == first.headers["Link"]
+    assert sql_statements(second) < sql_statements(first)
+
+    client.get("/projects?page=1&per_page=5", headers=manager_headers)
+    with cached_app.app_context():
+        assert get_response_cache().stats()["hits"] == 1
+
+
+def test_commits_invalidate_cached_responses(
+    cached_app, client, manager_headers, employee_headers
+):
+    """API writes and set-based bulk updates bump the versions of their tables."""
+
+    project = create_project(client, manager_headers, name="Before")
+    task = create_task(client, manager_headers, project["id"])
+    tasks_url = f"/projects/{project['id']}/tasks"
+    client.get(f"/projects/{project['id']}", headers=employee_headers)
+    client.get(tasks_url, headers=employee_headers)
+
+    client.put(
+        f"/projects/{project['id']}",
+        data=json.dumps({"name": "After"}),
+        headers=manager_headers,
+    )
+    detail = client.get(f"/projects/{project['id']}", headers=employee_headers)
+    assert detail.get_json()["data"]["name"] == "After"
+
+    client.patch(
+        tasks_url,
+        data=json.dumps({"filter": {"status": "todo"}, "changes": {"status": "done"}}),
+        headers=manager_headers,
+    )
+    listed = client.get(tasks_url, headers=employee_headers).get_json()["data"]
+    assert [(t["id"], t["status"]) for t in listed] == [(task["id"], "done")]
+
+
+def test_cached_body_is_never_paired_with_a_newer_etag(
+    cached_app, client, manager_headers, employee_headers, monkeypatch
+):
+    """With conditional GET on, a missed version bump cannot replay a stale page."""
+
+    assert cached_app.config["CONDITIONAL_GET_ENABLED"]
+    create_project(client, manager_headers, name="First")
+    stale = client.get("/projects", headers=employee_headers)
+
+    # Another worker's write: the data changes but this cache is never bumped.
+    with cached_app.app_context():
+        monkeypatch.setattr(get_response_cache(), "bump", lambda tables: None)
+    create_project(client, manager_headers, name="Second")
+
+    fresh = client.get(
+        "/projects", headers={**employee_headers, "If-None-Match": stale.headers["ETag"]}
+    )
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != stale.headers["ETag"]
+    assert {p["name"] for p in fresh.get_json()["data"]} == {"First", "Second"}
+
+    revalidated = client.get(
+        "/projects", headers={**employee_headers, "If-None-Match": fresh.headers["ETag"]}
+    )
+    assert revalidated.status_code == 304
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    """Entries and versions written by one worker are visible to another."""
+
+    path = tmp_path / "shared.db"
+    first = SQLiteResponseCache(path, maxsize=2, ttl=None)
+    second = SQLiteResponseCache(path, maxsize=2, ttl=None)
+
+    response = CachedResponse(200, "application/json", (("Link", "<x>"),), b"{}")
+    first.set("a", response)
+    assert second.get("a") == response
+
+    first.bump(["projects"])
+    assert second.versions(["projects", "tasks"]) == (1, 0)
+
+    first.set("b", response)
+    first.set("c", response)
+    assert second.get("a") is None
+    assert second.stats()["size"] == 2
@@ -0,0 +1,123 @@
+"""Tests for the search endpoint."""
+
+from __future__ import annotations
+
+import json
+
+from sqlalchemy import text
+
+from app.cache import app_cache
+from app.extensions import db
+from app.repositories import Cursor, encode_cursor
+
+from .utils import create_project, create_task
+
+
+def _seed(client, manager_headers):
+    project = create_project(
+        client, manager_headers, name="Apollo launch", description="Rocket plans."
+    )
+    create_task(
+        client,
+        manager_headers,
+        project["id"],
+        title="Check fuel",
+        description="Verify the apollo rocket fuel levels.",
+    )
+    create_task(client, manager_headers, project["id"], title="Unrelated chore")
+    return project
+
+
+def test_search_ranks_title_matches_first(client, manager_headers, employee_headers):
+    """bm25 ranking favours title hits and returns highlighted snippets."""
+
+    project = _seed(client, manager_headers)
+
+    response = client.get("/search?q=apollo", headers=employee_headers)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["meta"]["backend"] == "fts5"
+    assert [(hit["type"], hit["id"]) for hit in body["data"]][0] == (
+        "project",
+        project["id"],
+    )
+    assert len(body["data"]) == 2
+    assert "[apollo]" in body["data"][1]["snippet"]
+
+
+def test_search_index_follows_updates(client, manager_headers, employee_headers):
+    """Triggers keep the index in step with edits and deletes."""
+
+    project = _seed(client, manager_headers)
+    client.put(
+        f"/projects/{project['id']}",
+        data=json.dumps({"name": "Gemini launch"}),
+        headers=manager_headers,
+    )
+    hits = client.get("/search?q=gemini", headers=employee_headers).get_json()["data"]
+    assert [hit["type"] for hit in hits] == ["project"]
+
+    client.delete(f"/projects/{project['id']}", headers=manager_headers)
+    assert client.get("/search?q=fuel", headers=employee_headers).get_json()["data"] == []
+
+
+def test_search_keyset_pagination(client, manager_headers, employee_headers):
+    """Cursors walk through ranked results without repeats."""
+
+    project = create_project(client, manager_headers)
+    for i in range(5):
+        create_task(client, manager_headers, project["id"], title=f"Widget {i}")
+
+    seen = []
+    url = "/search?q=widget&per_page=2"
+    while url:
+        body = client.get(url, headers=employee_headers).get_json()
+        seen.extend(hit["id"] for hit in body["data"])
+        cursor = body["meta"]["next_cursor"]
+        url = f"/search?q=widget&per_page=2&cursor={cursor}" if cursor else None
+
+    assert sorted(seen) == sorted(set(seen)) and len(seen) == 5
+
+
+def test_search_falls_back_to_like(app, client, manager_headers, employee_headers):
+    """Without the FTS table, search degrades to substring matching."""
+
+    _seed(client, manager_headers)
+    app_cache("search_backend", lambda: "like")
+
+    body = client.get("/search?q=fuel", headers=employee_headers).get_json()
+    assert body["meta"]["backend"] == "like"
+    assert [hit["title"] for hit in body["data"]] == ["Check fuel"]
+
+
+def test_search_requires_terms(client, employee_headers):
+    """Queries without any word characters are rejected."""
+
+    response = client.get('/search?q="*', headers=employee_headers)
+    assert response.status_code == 422
+
+
+def test_rebuild_search_index_command(app, client, manager_headers, employee_headers):
+    """flask rebuild-search-index repopulates the index from the base tables."""
+
+    _seed(client, manager_headers)
+    db.session.execute(text("DELETE FROM search_index"))
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["rebuild-search-index"])
+    assert result.exit_code == 0
+    assert "Indexed 3" in result.output
+    assert client.get("/search?q=chore", headers=employee_headers).get_json()["data"]
+
+
+def test_search_rejects_cursors_from_other_listings(
+    client, manager_headers, employee_headers
+):
+    """A valid id cursor from /projects is not a search position."""
+
+    _seed(client, manager_headers)
+    cursor = encode_cursor(Cursor((5,)))
+
+    response = client.get(f"/search?q=Alpha&cursor={cursor}", headers=employee_headers)
+    assert response.status_code == 422
+    assert response.get_json()["message"] == "Invalid pagination cursor."
@@ -0,0 +1,169 @@
+"""Parity tests for the compiled schema serializers."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from marshmallow import Schema, fields, post_dump
+
+from app.models import Project, Task, User
+from app.schemas import (
+    BaseSchema,
+    ProjectSchema,
+    SearchResultSchema,
+    TaskSchema,
+    UserSchema,
+)
+from app.schemas.compiler import compile_schema
+
+CREATED = datetime(2024, 5, 17, 9, 30, 15, 123456, tzinfo=UTC)
+UPDATED_NAIVE = datetime(2024, 5, 18, 23, 59, 59)
+
+
+def _marshmallow(schema: Schema, obj, many: bool = False):
+    return Schema.dump(schema, obj, many=many)
+
+
+def _task(**overrides) -> Task:
+    values = {
+        "id": 7,
+        "title": "Write report",
+        "description": None,
+        "status": "in_progress",
+        "due_date": date(2030, 1, 2),
+        "project_id": 3,
+        "assigned_to": None,
+        "created_at": CREATED,
+        "updated_at": UPDATED_NAIVE,
+    }
+    values.update(overrides)
+    return Task(**values)
+
+
+OBJECTS = [
+    (TaskSchema, _task()),
+    (TaskSchema, _task(description="Ünïcode ✓", assigned_to=4, due_date=None)),
+    (
+        TaskSchema,
+        {"id": 1, "title": "Row", "status": "done", "project_id": 2},
+    ),
+    (
+        ProjectSchema,
+        Project(
+            id=3,
+            name="Apollo",
+            description="",
+            created_by=None,
+            task_count=2,
+            todo_count=1,
+            in_progress_count=1,
+            done_count=0,
+            canceled_count=0,
+            created_at=CREATED.astimezone(timezone(timedelta(hours=5, minutes=30))),
+            updated_at=CREATED,
+        ),
+    ),
+    (
+        UserSchema,
+        User(
+            id=9,
+            name="Ada",
+            email="ada@example.com",
+            role="manager",
+            password_hash="secret",
+            created_at=CREATED,
+            updated_at=None,
+        ),
+    ),
+    (
+        SearchResultSchema,
+        SimpleNamespace(
+            kind="task", ref_id=5, project_id=1, title="T", snippet="[x]", rank=-1.5
+        ),
+    ),
+]
+
+
+@pytest.mark.parametrize("schema_class,obj", OBJECTS)
+def test_compiled_output_matches_marshmallow(app, schema_class, obj):
+    """Compiled serializers produce exactly marshmallow's output."""
+
+    schema = schema_class()
+    serializer = compile_schema(schema)
+    assert serializer is not None
+    expected = _marshmallow(schema, obj)
+    result = serializer(obj)
+    assert result == expected
+    assert list(result) == list(expected)
+
+
+@pytest.mark.parametrize("only", [("id",), ("title", "status"), ("updated_at", "id")])
+def test_compiled_output_matches_with_sparse_fieldsets(app, only):
+    """only= restricted schemas stay in parity, including key order."""
+
+    schema = TaskSchema(only=only, many=True)
+    objects = [_task(), _task(id=8, updated_at=None)]
+    result = schema.dump(objects)
+    expected = _marshmallow(schema, objects, many=True)
+    assert result == expected
+    assert [list(item) for item in result] == [list(item) for item in expected]
+
+
+def test_equal_datetimes_with_different_offsets_format_separately(app):
+    """The datetime cache never returns another offset's rendering."""
+
+    schema = TaskSchema(only=("created_at",))
+    shifted = CREATED.astimezone(timezone(timedelta(hours=-3)))
+    assert shifted == CREATED
+    assert schema.dump(_task())["created_at"] != schema.dump(
+        _task(created_at=shifted)
+    )["created_at"]
+    assert schema.dump(_task(created_at=shifted)) == _marshmallow(
+        schema, _task(created_at=shifted)
+    )
+
+
+def test_unsupported_schemas_fall_back_to_marshmallow(app):
+    """Schemas with hooks or unsupported fields are not compiled."""
+
+    class Hooked(BaseSchema):
+        name = fields.Str()
+
+        @post_dump
+        def shout(self, data, **kwargs):
+            return {key: value.upper() for key, value in data.items()}
+
+    class WithMethod(BaseSchema):
+        label = fields.Method("get_label")
+
+        def get_label(self, obj):
+            return "label"
+
+    assert compile_schema(Hooked()) is None
+    assert compile_schema(WithMethod()) is None
+    assert Hooked().dump({"name": "ada"}) == {"name": "ADA"}
+    assert WithMethod().dump({}) == {"label": "label"}
+
+
+def test_fast_serializers_can_be_disabled(app, monkeypatch):
+    """FAST_SERIALIZERS_ENABLED=false routes dumps through marshmallow."""
+
+    calls = []
+    original = Schema.dump
+
+    def _spy(self, obj, *, many=None):
+        calls.append(obj)
+        return original(self, obj, many=many)
+
+    monkeypatch.setattr(Schema, "dump", _spy)
+    schema = TaskSchema()
+    task = _task()
+
+    schema.dump(task)
+    assert calls == []
+
+    app.config["FAST_SERIALIZERS_ENABLED"] = False
+    schema.dump(task)
+    assert calls == [task]
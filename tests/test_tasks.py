@@ -5,6 +5,12 @@ from __future__ import annotations
 import json
 from datetime import date, timedelta
 
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import Project
+from app.repositories import TaskRepository
+
 from .utils import create_project, create_task
 
 
@@ -127,3 +133,405 @@ def test_update_task_rejects_immutable_fields(client, manager_headers):
     assert response.status_code == 422
     body = response.get_json()
     assert body["error"] == "business_validation_error"
+
+
+def test_task_writes_maintain_project_counters(client, manager_headers):
+    """Creating and updating tasks keeps the project's counters in step."""
+
+    project = create_project(client, manager_headers)
+    first = create_task(client, manager_headers, project["id"], title="One")
+    create_task(client, manager_headers, project["id"], title="Two", status="done")
+
+    client.put(
+        f"/projects/{project['id']}/tasks/{first['id']}",
+        data=json.dumps({"status": "in_progress"}),
+        headers=manager_headers,
+    )
+
+    data = client.get(f"/projects/{project['id']}", headers=manager_headers).get_json()[
+        "data"
+    ]
+    assert data["task_count"] == 2
+    assert data["todo_count"] == 0
+    assert data["in_progress_count"] == 1
+    assert data["done_count"] == 1
+    assert data["canceled_count"] == 0
+
+    tasks = client.get(
+        f"/projects/{project['id']}/tasks?total=estimate", headers=manager_headers
+    )
+    assert tasks.get_json()["meta"]["total"] == 2
+
+
+def test_recount_tasks_command_repairs_counters(app, client, manager_headers):
+    """flask recount-tasks rebuilds drifted counters in one pass."""
+
+    project = create_project(client, manager_headers)
+    create_task(client, manager_headers, project["id"], status="canceled")
+
+    with app.app_context():
+        db.session.get(Project, project["id"]).task_count = 7
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["recount-tasks"])
+    assert result.exit_code == 0
+    assert "1 project(s)" in result.output
+
+    with app.app_context():
+        repaired = db.session.get(Project, project["id"])
+        assert (repaired.task_count, repaired.canceled_count) == (1, 1)
+
+
+def test_list_tasks_filters_and_sorts(client, manager_headers, employee_headers):
+    """Task listings filter by status and due date and honour sort."""
+
+    project = create_project(client, manager_headers)
+    today = date.today()
+    for offset, status in ((3, "todo"), (1, "done"), (2, "done")):
+        create_task(
+            client,
+            manager_headers,
+            project["id"],
+            title=f"Due +{offset}",
+            status=status,
+            due_date=(today + timedelta(days=offset)).isoformat(),
+        )
+
+    response = client.get(
+        f"/projects/{project['id']}/tasks?status=done&sort=-due_date",
+        headers=employee_headers,
+    )
+    assert response.status_code == 200
+    assert [t["title"] for t in response.get_json()["data"]] == ["Due +2", "Due +1"]
+
+    before = (today + timedelta(days=3)).isoformat()
+    response = client.get(
+        f"/projects/{project['id']}/tasks?due_before={before}&sort=due_date",
+        headers=employee_headers,
+    )
+    assert [t["title"] for t in response.get_json()["data"]] == ["Due +1", "Due +2"]
+
+
+def test_list_tasks_rejects_unknown_sort(client, manager_headers, employee_headers):
+    """Sorting is limited to an allow-list of indexed fields."""
+
+    project = create_project(client, manager_headers)
+    response = client.get(
+        f"/projects/{project['id']}/tasks?sort=title", headers=employee_headers
+    )
+    assert response.status_code == 400
+    assert "sort" in response.get_json()["messages"]
+
+
+def test_batch_create_tasks(client, manager_headers):
+    """A batch inserts every valid task in one transaction and updates counters."""
+
+    project = create_project(client, manager_headers)
+    items = [
+        {"title": f"Step {i}", "status": "done" if i % 2 else "todo"} for i in range(6)
+    ]
+
+    response = client.post(
+        f"/projects/{project['id']}/tasks/batch",
+        data=json.dumps(items),
+        headers=manager_headers,
+    )
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body["meta"] == {"created": 6, "failed": 0}
+    assert [item["data"]["title"] for item in body["data"]] == [
+        f"Step {i}" for i in range(6)
+    ]
+
+    data = client.get(f"/projects/{project['id']}", headers=manager_headers).get_json()[
+        "data"
+    ]
+    assert (data["task_count"], data["todo_count"], data["done_count"]) == (6, 3, 3)
+
+
+def test_batch_create_tasks_reports_item_errors(
+    client, manager_headers, create_user_record
+):
+    """Invalid items are reported per index while valid ones are created."""
+
+    assignee = create_user_record(
+        name="Assignee", email="assignee@example.com", role="employee"
+    )
+    project = create_project(client, manager_headers)
+    items = [
+        {"title": "Fine", "assigned_to": assignee.id},
+        {"title": ""},
+        {"title": "Ghost owner", "assigned_to": 9999},
+    ]
+
+    response = client.post(
+        f"/projects/{project['id']}/tasks/batch",
+        data=json.dumps({"tasks": items}),
+        headers=manager_headers,
+    )
+    assert response.status_code == 207
+    results = response.get_json()["data"]
+    assert [result["status"] for result in results] == [201, 400, 404]
+    assert "title" in results[1]["messages"]
+    assert response.get_json()["meta"] == {"created": 1, "failed": 2}
+
+
+def test_batch_create_tasks_enforces_max_size(app, client, manager_headers):
+    """Oversized batches are rejected before any work is done."""
+
+    project = create_project(client, manager_headers)
+    app.config["TASK_BATCH_MAX_SIZE"] = 2
+    response = client.post(
+        f"/projects/{project['id']}/tasks/batch",
+        data=json.dumps([{"title": str(i)} for i in range(3)]),
+        headers=manager_headers,
+    )
+    assert response.status_code == 422
+
+
+def test_batch_rate_limit_cost_scales_with_size(app, client, manager_headers):
+    """A batch consumes one rate-limit unit per TASK_BATCH_COST_UNIT items."""
+
+    project = create_project(client, manager_headers)
+    app.config["SENSITIVE_RATE_LIMIT"] = "3 per minute"
+    app.config["TASK_BATCH_COST_UNIT"] = 2
+    url = f"/projects/{project['id']}/tasks/batch"
+
+    first = client.post(
+        url,
+        data=json.dumps([{"title": f"T{i}"} for i in range(5)]),
+        headers=manager_headers,
+    )
+    assert first.status_code == 201
+
+    second = client.post(
+        url, data=json.dumps([{"title": "One more"}]), headers=manager_headers
+    )
+    assert second.status_code == 429
+
+
+def test_rejected_batch_shape_costs_one_unit(app, client, manager_headers):
+    """Bodies the endpoint rejects are not charged by their item count."""
+
+    project = create_project(client, manager_headers)
+    app.config["SENSITIVE_RATE_LIMIT"] = "3 per minute"
+    app.config["TASK_BATCH_COST_UNIT"] = 2
+    url = f"/projects/{project['id']}/tasks/batch"
+
+    rejected = client.post(
+        url,
+        data=json.dumps({"items": [{"title": f"T{i}"} for i in range(5)]}),
+        headers=manager_headers,
+    )
+    assert rejected.status_code == 422
+
+    accepted = client.post(
+        url,
+        data=json.dumps({"tasks": [{"title": f"T{i}"} for i in range(4)]}),
+        headers=manager_headers,
+    )
+    assert accepted.status_code == 201
+
+
+def _patch_tasks(client, headers, project_id, body):
+    return client.patch(
+        f"/projects/{project_id}/tasks", data=json.dumps(body), headers=headers
+    )
+
+
+def test_bulk_update_tasks_by_id(client, manager_headers):
+    """Per-task change sets are applied together and counters follow."""
+
+    project = create_project(client, manager_headers)
+    tasks = [
+        create_task(client, manager_headers, project["id"], title=f"Bulk {i}")
+        for i in range(3)
+    ]
+
+    response = _patch_tasks(
+        client,
+        manager_headers,
+        project["id"],
+        {
+            "items": [
+                {"id": tasks[0]["id"], "changes": {"status": "done"}},
+                {"id": tasks[1]["id"], "changes": {"status": "done"}},
+                {"id": tasks[2]["id"], "changes": {"title": "Renamed"}},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    assert response.get_json()["meta"]["updated"] == 3
+
+    listed = client.get(
+        f"/projects/{project['id']}/tasks", headers=manager_headers
+    ).get_json()["data"]
+    assert [t["status"] for t in listed] == ["done", "done", "todo"]
+    assert listed[2]["title"] == "Renamed"
+    assert listed[0]["updated_at"] > tasks[0]["updated_at"]
+
+    data = client.get(f"/projects/{project['id']}", headers=manager_headers).get_json()[
+        "data"
+    ]
+    assert (data["todo_count"], data["done_count"]) == (1, 2)
+
+
+def test_bulk_update_tasks_by_filter(client, manager_headers):
+    """A filter plus one change set updates every matching task."""
+
+    project = create_project(client, manager_headers)
+    for status in ("todo", "todo", "in_progress"):
+        create_task(client, manager_headers, project["id"], status=status)
+
+    response = _patch_tasks(
+        client,
+        manager_headers,
+        project["id"],
+        {"filter": {"status": "todo"}, "changes": {"status": "canceled"}},
+    )
+    assert response.get_json()["meta"]["updated"] == 2
+
+    data = client.get(f"/projects/{project['id']}", headers=manager_headers).get_json()[
+        "data"
+    ]
+    assert (data["canceled_count"], data["in_progress_count"]) == (2, 1)
+
+
+def test_bulk_update_tasks_is_all_or_nothing(client, manager_headers):
+    """Foreign task ids abort the whole update; bad changes are rejected."""
+
+    project = create_project(client, manager_headers)
+    other = create_project(client, manager_headers, name="Other")
+    mine = create_task(client, manager_headers, project["id"])
+    theirs = create_task(client, manager_headers, other["id"])
+
+    response = _patch_tasks(
+        client,
+        manager_headers,
+        project["id"],
+        {
+            "items": [
+                {"id": mine["id"], "changes": {"status": "done"}},
+                {"id": theirs["id"], "changes": {"status": "done"}},
+            ]
+        },
+    )
+    assert response.status_code == 404
+    listed = client.get(
+        f"/projects/{project['id']}/tasks", headers=manager_headers
+    ).get_json()["data"]
+    assert listed[0]["status"] == "todo"
+
+    invalid = _patch_tasks(
+        client,
+        manager_headers,
+        project["id"],
+        {"items": [{"id": mine["id"], "changes": {"status": "archived"}}]},
+    )
+    assert invalid.status_code == 400
+    assert "status" in invalid.get_json()["messages"]["0"]
+
+    immutable = _patch_tasks(
+        client,
+        manager_headers,
+        project["id"],
+        {"filter": {"status": "todo"}, "changes": {"project_id": other["id"]}},
+    )
+    assert immutable.status_code == 422
+
+
+def test_export_tasks_streams_ndjson_and_resumes(
+    app, client, manager_headers, employee_headers
+):
+    """Task exports stream NDJSON in id order and resume after an id."""
+
+    app.config["EXPORT_BATCH_SIZE"] = 2
+    project = create_project(client, manager_headers)
+    items = [
+        {"title": f"Export {i}", "status": "done" if i % 2 else "todo"}
+        for i in range(5)
+    ]
+    client.post(
+        f"/projects/{project['id']}/tasks/batch",
+        data=json.dumps(items),
+        headers=manager_headers,
+    )
+
+    response = client.get(
+        f"/projects/{project['id']}/tasks/export", headers=employee_headers
+    )
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert response.is_streamed
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row["title"] for row in rows] == [f"Export {i}" for i in range(5)]
+
+    resumed = client.get(
+        f"/projects/{project['id']}/tasks/export?after_id={rows[1]['id']}&status=todo",
+        headers=employee_headers,
+    )
+    lines = resumed.get_data(as_text=True).splitlines()
+    assert [json.loads(line)["title"] for line in lines] == ["Export 2", "Export 4"]
+
+
+def test_export_tasks_unknown_project(client, employee_headers):
+    """Exporting tasks of a missing project is a 404 before streaming starts."""
+
+    response = client.get("/projects/9999/tasks/export", headers=employee_headers)
+    assert response.status_code == 404
+
+
+def test_list_tasks_sparse_fieldset_prunes_columns(
+    client, manager_headers, employee_headers
+):
+    """?fields= limits both the payload and the columns selected."""
+
+    project = create_project(client, manager_headers)
+    create_task(client, manager_headers, project["id"])
+
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with client.application.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        response = client.get(
+            f"/projects/{project['id']}/tasks?fields=id,title,status",
+            headers=employee_headers,
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert response.status_code == 200
+    assert set(response.get_json()["data"][0]) == {"id", "title", "status"}
+    task_selects = [s for s in statements if s.startswith("SELECT tasks.id")]
+    assert task_selects and "tasks.description" not in task_selects[0]
+
+
+
+def test_list_tasks_conditional_get_sees_deletes(
+    app, client, manager_headers, employee_headers
+):
+    """Deleting a task changes the listing's ETag; missing projects stay 404."""
+
+    project = create_project(client, manager_headers)
+    task = create_task(client, manager_headers, project["id"], title="Doomed")
+    create_task(client, manager_headers, project["id"], title="Kept")
+    url = f"/projects/{project['id']}/tasks"
+
+    etag = client.get(url, headers=employee_headers).headers["ETag"]
+    conditional = {**employee_headers, "If-None-Match": etag}
+    assert client.get(url, headers=conditional).status_code == 304
+
+    with app.app_context():
+        TaskRepository(db.session).delete(task["id"])
+    response = client.get(url, headers=conditional)
+    assert response.status_code == 200
+    assert [item["title"] for item in response.get_json()["data"]] == ["Kept"]
+
+    missing = client.get("/projects/9999/tasks", headers=conditional)
+    assert missing.status_code == 404
+    assert "ETag" not in missing.headers
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import json
 
-from .utils import create_user
+from app.hashing import BulkPasswordHasher, get_bulk_password_hasher
+
+from .utils import create_user, login
 
 
 def test_manager_can_create_user(client, manager_headers):
@@ -154,3 +156,187 @@ def test_update_user_rejects_immutable_fields(client, manager_headers):
     assert response.status_code == 422
     body = response.get_json()
     assert body["error"] == "business_validation_error"
+
+
+def test_role_change_takes_effect_for_cached_principal(client, manager_headers):
+    """Promoting or demoting a user invalidates their cached principal."""
+
+    password = "Password123!"
+    created = create_user(client, manager_headers, role="employee", password=password)
+    headers = login(client, created["email"], password)
+
+    project_payload = json.dumps({"name": "Promoted Project"})
+    assert client.post("/projects", data=project_payload, headers=headers).status_code == 403
+
+    response = client.put(
+        f"/users/{created['id']}",
+        data=json.dumps({"role": "manager"}),
+        headers=manager_headers,
+    )
+    assert response.status_code == 200
+    assert client.post("/projects", data=project_payload, headers=headers).status_code == 201
+
+    client.put(
+        f"/users/{created['id']}",
+        data=json.dumps({"role": "employee"}),
+        headers=manager_headers,
+    )
+    assert client.post("/projects", data=project_payload, headers=headers).status_code == 403
+
+
+def test_deleted_user_token_is_rejected(client, manager_headers):
+    """A token for a deleted user stops working even after being cached."""
+
+    password = "Password123!"
+    created = create_user(client, manager_headers, password=password)
+    headers = login(client, created["email"], password)
+    assert client.get("/users", headers=headers).status_code == 200
+
+    client.delete(f"/users/{created['id']}", headers=manager_headers)
+    response = client.get("/users", headers=headers)
+    assert response.status_code == 401
+
+
+def _import_row(email: str, **overrides) -> dict:
+    return {
+        "name": "Imported User",
+        "email": email,
+        "role": "employee",
+        "password": "Password123!",
+        **overrides,
+    }
+
+
+def test_import_users_ndjson_reports_each_row(client, manager_headers):
+    """NDJSON imports create valid rows and report invalid and duplicate ones."""
+
+    create_user(client, manager_headers, email="taken@example.com")
+    lines = [
+        json.dumps(_import_row("new1@example.com")),
+        "",
+        "{not json",
+        json.dumps(_import_row("taken@example.com")),
+        json.dumps(_import_row("bad@example.com", role="owner")),
+        json.dumps(_import_row("new1@example.com")),
+        json.dumps(_import_row("new2@example.com")),
+    ]
+    headers = {**manager_headers, "Content-Type": "application/x-ndjson"}
+    response = client.post(
+        "/users/import", data="\n".join(lines), headers=headers
+    )
+    assert response.status_code == 207
+    body = response.get_json()
+    assert body["meta"] == {"created": 2, "duplicates": 2, "invalid": 2}
+    assert [(r["row"], r["status"]) for r in body["data"]] == [
+        (1, 201),
+        (2, 400),
+        (3, 409),
+        (4, 400),
+        (5, 409),
+        (6, 201),
+    ]
+    assert "role" in body["data"][3]["messages"]
+
+    created_id = body["data"][0]["id"]
+    user = client.get(f"/users/{created_id}", headers=manager_headers).get_json()
+    assert user["data"]["email"] == "new1@example.com"
+    login(client, "new2@example.com", "Password123!")
+
+
+def test_import_users_csv_in_chunks(app, client, manager_headers):
+    """CSV bodies are imported across several chunked transactions."""
+
+    app.config["USER_IMPORT_CHUNK_SIZE"] = 2
+    rows = ["name,email,role,password"] + [
+        f"User {i},csv{i}@example.com,employee,Password123!" for i in range(5)
+    ]
+    headers = {**manager_headers, "Content-Type": "text/csv"}
+    response = client.post("/users/import", data="\r\n".join(rows), headers=headers)
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body["meta"] == {"created": 5, "duplicates": 0, "invalid": 0}
+    assert [r["email"] for r in body["data"]] == [f"csv{i}@example.com" for i in range(5)]
+
+
+def test_import_reports_other_constraint_failures_as_invalid(
+    client, manager_headers, monkeypatch
+):
+    """Only email conflicts are duplicates; other integrity errors are invalid rows."""
+
+    hash_many = BulkPasswordHasher.hash_many
+    monkeypatch.setattr(
+        BulkPasswordHasher,
+        "hash_many",
+        lambda self, passwords: [
+            None if password == "Unhashable123!" else password_hash
+            for password, password_hash in zip(passwords, hash_many(self, passwords))
+        ],
+    )
+    body = "\n".join(
+        [
+            json.dumps(_import_row("kept@example.com")),
+            json.dumps(_import_row("nohash@example.com", password="Unhashable123!")),
+        ]
+    )
+    response = client.post("/users/import", data=body, headers=manager_headers)
+    assert response.status_code == 207
+    results = response.get_json()["data"]
+    assert [r["status"] for r in results] == [201, 400]
+    assert response.get_json()["meta"] == {"created": 1, "duplicates": 0, "invalid": 1}
+
+    users = client.get("/users?per_page=50", headers=manager_headers).get_json()["data"]
+    assert "nohash@example.com" not in {user["email"] for user in users}
+
+
+def test_imports_share_one_hash_pool(app, client, manager_headers):
+    """Every import hashes on the same lazily created pool."""
+
+    pools = []
+    for email in ("pool1@example.com", "pool2@example.com"):
+        response = client.post(
+            "/users/import", data=json.dumps(_import_row(email)), headers=manager_headers
+        )
+        assert response.status_code == 201
+        with app.app_context():
+            pools.append(get_bulk_password_hasher()._executor)
+    assert pools[0] is not None and pools[0] is pools[1]
+
+
+def test_concurrent_import_beyond_limit_returns_503(app, client, manager_headers):
+    """Imports past USER_IMPORT_MAX_CONCURRENT fail fast with Retry-After."""
+
+    app.config["USER_IMPORT_RETRY_AFTER"] = 9
+    with app.app_context():
+        running = get_bulk_password_hasher().job()
+    with running:
+        response = client.post(
+            "/users/import",
+            data=json.dumps(_import_row("busy@example.com")),
+            headers=manager_headers,
+        )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "9"
+
+    response = client.post(
+        "/users/import",
+        data=json.dumps(_import_row("busy@example.com")),
+        headers=manager_headers,
+    )
+    assert response.status_code == 201
+
+
+def test_import_users_cli(app, tmp_path):
+    """flask import-users reads a file and prints a per-row report."""
+
+    path = tmp_path / "users.ndjson"
+    path.write_text(
+        "\n".join(
+            json.dumps(_import_row(email))
+            for email in ("cli1@example.com", "cli1@example.com")
+        )
+    )
+    result = app.test_cli_runner().invoke(args=["import-users", str(path)])
+    assert result.exit_code == 0, result.output
+    assert "row 1: created cli1@example.com" in result.output
+    assert "row 2: duplicate cli1@example.com" in result.output
+    assert "Imported 1 user(s); 1 duplicate(s), 0 invalid row(s)." in result.output
@@ -3,10 +3,32 @@
 from __future__ import annotations
 
 import json
+from base64 import b64encode
 from typing import Any, Dict
 from uuid import uuid4
 
 
+def login_body(client, email: str, password: str) -> Dict[str, Any]:
+    """Log in via Basic auth and return the token response body."""
+
+    basic_token = b64encode(f"{email}:{password}".encode()).decode()
+    response = client.post(
+        "/auth/login",
+        headers={"Authorization": f"Basic {basic_token}"},
+    )
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def login(client, email: str, password: str) -> Dict[str, str]:
+    """Log in via Basic auth and return bearer headers."""
+
+    return {
+        "Authorization": f"Bearer {login_body(client, email, password)['access_token']}",
+        "Content-Type": "application/json",
+    }
+
+
 def create_user(client, manager_headers, **overrides) -> Dict[str, Any]:
     """Create a user through the API."""
 
@@ -57,3 +79,9 @@ def create_task(
     )
     assert response.status_code == 201, response.get_json()
     return response.get_json()["data"]
+
+
+def sql_statements(response) -> int:
+    """Return the SQL statement count reported in the Server-Timing header."""
+
+    return int(response.headers["Server-Timing"].split('desc="')[1].split()[0])